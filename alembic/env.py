@@ -13,6 +13,9 @@ sys.path.append(str(Path(__file__).parent.parent))
 from app.models.user import User
 from app.models.article import Article
 from app.models.feed import Feed
+from app.models.feed_source import FeedSource
+from app.models.websub_subscription import WebSubSubscription
+from app.models.refresh_job import RefreshJob
 from app.models.feed_history import FeedHistory
 from app.models.feed_preference import FeedPreference
 from app.db.base_class import Base
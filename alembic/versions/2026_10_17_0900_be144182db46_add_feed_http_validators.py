@@ -0,0 +1,28 @@
+"""add feed http validators
+
+Revision ID: be144182db46
+Revises: 86eaf1c243cd
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'be144182db46'
+down_revision: Union[str, None] = '86eaf1c243cd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feeds', sa.Column('etag', sa.String(length=255), nullable=True))
+    op.add_column('feeds', sa.Column('last_modified', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('feeds', 'last_modified')
+    op.drop_column('feeds', 'etag')
@@ -0,0 +1,32 @@
+"""add feed poll schedule
+
+Revision ID: 4d2a91c07e35
+Revises: be144182db46
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d2a91c07e35'
+down_revision: Union[str, None] = 'be144182db46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feeds', sa.Column('next_fetch_at', sa.DateTime(), nullable=True))
+    op.add_column('feeds', sa.Column('unchanged_count', sa.Integer(), nullable=True, server_default='0'))
+    op.add_column('feeds', sa.Column('avg_publish_interval', sa.Float(), nullable=True))
+    op.create_index(op.f('ix_feeds_next_fetch_at'), 'feeds', ['next_fetch_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_feeds_next_fetch_at'), table_name='feeds')
+    op.drop_column('feeds', 'avg_publish_interval')
+    op.drop_column('feeds', 'unchanged_count')
+    op.drop_column('feeds', 'next_fetch_at')
@@ -0,0 +1,34 @@
+"""add article feed identity
+
+Revision ID: 7f3b0c5e8a12
+Revises: 4d2a91c07e35
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3b0c5e8a12'
+down_revision: Union[str, None] = '4d2a91c07e35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('articles', sa.Column('feed_id', sa.Integer(), nullable=True))
+    op.add_column('articles', sa.Column('guid', sa.String(length=512), nullable=True))
+    op.create_foreign_key('fk_articles_feed_id', 'articles', 'feeds', ['feed_id'], ['id'], ondelete='SET NULL')
+    op.create_index(op.f('ix_articles_feed_id'), 'articles', ['feed_id'], unique=False)
+    op.create_unique_constraint('uq_articles_feed_guid', 'articles', ['feed_id', 'guid'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_articles_feed_guid', 'articles', type_='unique')
+    op.drop_index(op.f('ix_articles_feed_id'), table_name='articles')
+    op.drop_constraint('fk_articles_feed_id', 'articles', type_='foreignkey')
+    op.drop_column('articles', 'guid')
+    op.drop_column('articles', 'feed_id')
@@ -0,0 +1,38 @@
+"""add article fingerprints
+
+Revision ID: c41e9a7d2b65
+Revises: 7f3b0c5e8a12
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e9a7d2b65'
+down_revision: Union[str, None] = '7f3b0c5e8a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('articles', sa.Column('canonical_url', sa.String(length=512), nullable=True))
+    op.add_column('articles', sa.Column('fingerprint', sa.String(length=40), nullable=True))
+    op.add_column('articles', sa.Column('duplicate_of_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_articles_duplicate_of_id', 'articles', 'articles', ['duplicate_of_id'], ['id'], ondelete='SET NULL')
+    op.create_index(op.f('ix_articles_canonical_url'), 'articles', ['canonical_url'], unique=False)
+    op.create_index(op.f('ix_articles_fingerprint'), 'articles', ['fingerprint'], unique=False)
+    op.create_index(op.f('ix_articles_duplicate_of_id'), 'articles', ['duplicate_of_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_articles_duplicate_of_id'), table_name='articles')
+    op.drop_index(op.f('ix_articles_fingerprint'), table_name='articles')
+    op.drop_index(op.f('ix_articles_canonical_url'), table_name='articles')
+    op.drop_constraint('fk_articles_duplicate_of_id', 'articles', type_='foreignkey')
+    op.drop_column('articles', 'duplicate_of_id')
+    op.drop_column('articles', 'fingerprint')
+    op.drop_column('articles', 'canonical_url')
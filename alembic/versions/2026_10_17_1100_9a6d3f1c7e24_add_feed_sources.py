@@ -0,0 +1,162 @@
+"""add feed sources
+
+Revision ID: 9a6d3f1c7e24
+Revises: c41e9a7d2b65
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.fingerprint import normalize_feed_url
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a6d3f1c7e24'
+down_revision: Union[str, None] = 'c41e9a7d2b65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FETCH_STATE = ['last_fetched', 'etag', 'last_modified', 'next_fetch_at', 'unchanged_count', 'avg_publish_interval']
+
+feed_sources = sa.table(
+    'feed_sources',
+    sa.column('id', sa.Integer), sa.column('url', sa.String), sa.column('feed_type', sa.String),
+    sa.column('last_fetched', sa.DateTime), sa.column('etag', sa.String), sa.column('last_modified', sa.String),
+    sa.column('next_fetch_at', sa.DateTime), sa.column('unchanged_count', sa.Integer),
+    sa.column('avg_publish_interval', sa.Float), sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime),
+)
+feeds = sa.table(
+    'feeds',
+    sa.column('id', sa.Integer), sa.column('url', sa.String), sa.column('feed_type', sa.String),
+    sa.column('source_id', sa.Integer), sa.column('last_fetched', sa.DateTime), sa.column('etag', sa.String),
+    sa.column('last_modified', sa.String), sa.column('next_fetch_at', sa.DateTime),
+    sa.column('unchanged_count', sa.Integer), sa.column('avg_publish_interval', sa.Float),
+)
+articles = sa.table(
+    'articles',
+    sa.column('id', sa.Integer), sa.column('feed_id', sa.Integer), sa.column('feed_source_id', sa.Integer),
+    sa.column('guid', sa.String), sa.column('duplicate_of_id', sa.Integer),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'feed_sources',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('url', sa.String(length=512), nullable=False),
+        sa.Column('feed_type', sa.String(length=50), nullable=False),
+        sa.Column('last_fetched', sa.DateTime(), nullable=True),
+        sa.Column('etag', sa.String(length=255), nullable=True),
+        sa.Column('last_modified', sa.String(length=64), nullable=True),
+        sa.Column('next_fetch_at', sa.DateTime(), nullable=True),
+        sa.Column('unchanged_count', sa.Integer(), nullable=True),
+        sa.Column('avg_publish_interval', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_feed_sources_id'), 'feed_sources', ['id'], unique=False)
+    op.create_index(op.f('ix_feed_sources_url'), 'feed_sources', ['url'], unique=True)
+    op.create_index(op.f('ix_feed_sources_next_fetch_at'), 'feed_sources', ['next_fetch_at'], unique=False)
+
+    op.add_column('feeds', sa.Column('source_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_feeds_source_id', 'feeds', 'feed_sources', ['source_id'], ['id'])
+    op.create_index(op.f('ix_feeds_source_id'), 'feeds', ['source_id'], unique=False)
+
+    # One source per normalized URL, carrying the fetch state of its most recently fetched feed
+    bind = op.get_bind()
+    groups = {}
+    for row in bind.execute(sa.select(feeds)).mappings():
+        groups.setdefault(normalize_feed_url(row['url']), []).append(row)
+
+    now = datetime.utcnow()
+    for url, rows in groups.items():
+        latest = max(rows, key=lambda row: row['last_fetched'] or datetime.min)
+        source_id = bind.execute(
+            feed_sources.insert()
+            .values(url=url, feed_type=latest['feed_type'], created_at=now, updated_at=now,
+                    **{column: latest[column] for column in FETCH_STATE})
+            .returning(feed_sources.c.id)
+        ).scalar()
+        bind.execute(
+            feeds.update().where(feeds.c.id.in_([row['id'] for row in rows])).values(source_id=source_id)
+        )
+
+    op.add_column('articles', sa.Column('feed_source_id', sa.Integer(), nullable=True))
+    bind.execute(
+        articles.update()
+        .where(articles.c.feed_id.isnot(None))
+        .values(feed_source_id=sa.select(feeds.c.source_id).where(feeds.c.id == articles.c.feed_id).scalar_subquery())
+    )
+
+    # Subscribers of the same URL each stored their own copy; keep the first and link the rest to it
+    collisions = bind.execute(
+        sa.select(articles.c.feed_source_id, articles.c.guid, sa.func.min(articles.c.id))
+        .where(articles.c.feed_source_id.isnot(None), articles.c.guid.isnot(None))
+        .group_by(articles.c.feed_source_id, articles.c.guid)
+        .having(sa.func.count() > 1)
+    ).all()
+    for source_id, guid, keep_id in collisions:
+        bind.execute(
+            articles.update()
+            .where(articles.c.feed_source_id == source_id, articles.c.guid == guid, articles.c.id != keep_id)
+            .values(guid=None, duplicate_of_id=keep_id)
+        )
+
+    op.drop_constraint('uq_articles_feed_guid', 'articles', type_='unique')
+    op.drop_index(op.f('ix_articles_feed_id'), table_name='articles')
+    op.drop_constraint('fk_articles_feed_id', 'articles', type_='foreignkey')
+    op.drop_column('articles', 'feed_id')
+    op.create_foreign_key('fk_articles_feed_source_id', 'articles', 'feed_sources', ['feed_source_id'], ['id'], ondelete='SET NULL')
+    op.create_index(op.f('ix_articles_feed_source_id'), 'articles', ['feed_source_id'], unique=False)
+    op.create_unique_constraint('uq_articles_source_guid', 'articles', ['feed_source_id', 'guid'])
+
+    op.drop_index(op.f('ix_feeds_next_fetch_at'), table_name='feeds')
+    for column in FETCH_STATE[1:]:
+        op.drop_column('feeds', column)
+
+
+def downgrade() -> None:
+    op.add_column('feeds', sa.Column('etag', sa.String(length=255), nullable=True))
+    op.add_column('feeds', sa.Column('last_modified', sa.String(length=64), nullable=True))
+    op.add_column('feeds', sa.Column('next_fetch_at', sa.DateTime(), nullable=True))
+    op.add_column('feeds', sa.Column('unchanged_count', sa.Integer(), nullable=True))
+    op.add_column('feeds', sa.Column('avg_publish_interval', sa.Float(), nullable=True))
+    op.create_index(op.f('ix_feeds_next_fetch_at'), 'feeds', ['next_fetch_at'], unique=False)
+
+    bind = op.get_bind()
+    bind.execute(
+        feeds.update()
+        .where(feeds.c.source_id.isnot(None))
+        .values(**{
+            column: sa.select(feed_sources.c[column]).where(feed_sources.c.id == feeds.c.source_id).scalar_subquery()
+            for column in FETCH_STATE[1:]
+        })
+    )
+
+    # Articles go back to the first feed that subscribed to their source
+    op.add_column('articles', sa.Column('feed_id', sa.Integer(), nullable=True))
+    bind.execute(
+        articles.update()
+        .where(articles.c.feed_source_id.isnot(None))
+        .values(feed_id=sa.select(sa.func.min(feeds.c.id)).where(feeds.c.source_id == articles.c.feed_source_id).scalar_subquery())
+    )
+    op.drop_constraint('uq_articles_source_guid', 'articles', type_='unique')
+    op.drop_index(op.f('ix_articles_feed_source_id'), table_name='articles')
+    op.drop_constraint('fk_articles_feed_source_id', 'articles', type_='foreignkey')
+    op.drop_column('articles', 'feed_source_id')
+    op.create_foreign_key('fk_articles_feed_id', 'articles', 'feeds', ['feed_id'], ['id'], ondelete='SET NULL')
+    op.create_index(op.f('ix_articles_feed_id'), 'articles', ['feed_id'], unique=False)
+    op.create_unique_constraint('uq_articles_feed_guid', 'articles', ['feed_id', 'guid'])
+
+    op.drop_index(op.f('ix_feeds_source_id'), table_name='feeds')
+    op.drop_constraint('fk_feeds_source_id', 'feeds', type_='foreignkey')
+    op.drop_column('feeds', 'source_id')
+    op.drop_index(op.f('ix_feed_sources_next_fetch_at'), table_name='feed_sources')
+    op.drop_index(op.f('ix_feed_sources_url'), table_name='feed_sources')
+    op.drop_index(op.f('ix_feed_sources_id'), table_name='feed_sources')
+    op.drop_table('feed_sources')
@@ -0,0 +1,32 @@
+"""add feed source circuit breaker
+
+Revision ID: e58b2d4a9f16
+Revises: 9a6d3f1c7e24
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e58b2d4a9f16'
+down_revision: Union[str, None] = '9a6d3f1c7e24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feed_sources', sa.Column('consecutive_failures', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('feed_sources', sa.Column('last_error', sa.String(length=255), nullable=True))
+    op.add_column('feed_sources', sa.Column('last_success_at', sa.DateTime(), nullable=True))
+    # Sources that have fetched before count as healthy from their last fetch
+    op.execute("UPDATE feed_sources SET last_success_at = last_fetched")
+
+
+def downgrade() -> None:
+    op.drop_column('feed_sources', 'last_success_at')
+    op.drop_column('feed_sources', 'last_error')
+    op.drop_column('feed_sources', 'consecutive_failures')
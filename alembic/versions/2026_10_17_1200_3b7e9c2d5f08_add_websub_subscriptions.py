@@ -0,0 +1,48 @@
+"""add websub subscriptions
+
+Revision ID: 3b7e9c2d5f08
+Revises: e58b2d4a9f16
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e9c2d5f08'
+down_revision: Union[str, None] = 'e58b2d4a9f16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'websub_subscriptions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('feed_source_id', sa.Integer(), nullable=False),
+        sa.Column('hub_url', sa.String(length=512), nullable=False),
+        sa.Column('topic_url', sa.String(length=512), nullable=False),
+        sa.Column('secret', sa.String(length=64), nullable=False),
+        sa.Column('state', sa.String(length=20), nullable=False),
+        sa.Column('lease_seconds', sa.Integer(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.Column('last_push_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['feed_source_id'], ['feed_sources.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_websub_subscriptions_id'), 'websub_subscriptions', ['id'], unique=False)
+    op.create_index(op.f('ix_websub_subscriptions_feed_source_id'), 'websub_subscriptions', ['feed_source_id'], unique=True)
+    op.create_index(op.f('ix_websub_subscriptions_expires_at'), 'websub_subscriptions', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_websub_subscriptions_expires_at'), table_name='websub_subscriptions')
+    op.drop_index(op.f('ix_websub_subscriptions_feed_source_id'), table_name='websub_subscriptions')
+    op.drop_index(op.f('ix_websub_subscriptions_id'), table_name='websub_subscriptions')
+    op.drop_table('websub_subscriptions')
@@ -0,0 +1,26 @@
+"""add feed source content hash
+
+Revision ID: 6c1d8e4b2a97
+Revises: 3b7e9c2d5f08
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1d8e4b2a97'
+down_revision: Union[str, None] = '3b7e9c2d5f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feed_sources', sa.Column('content_hash', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('feed_sources', 'content_hash')
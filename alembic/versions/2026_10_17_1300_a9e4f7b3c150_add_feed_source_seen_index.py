@@ -0,0 +1,28 @@
+"""add feed source seen index
+
+Revision ID: a9e4f7b3c150
+Revises: 6c1d8e4b2a97
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e4f7b3c150'
+down_revision: Union[str, None] = '6c1d8e4b2a97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('feed_sources', sa.Column('seen_entries', sa.JSON(), nullable=True))
+    op.add_column('feed_sources', sa.Column('high_water_mark', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('feed_sources', 'high_water_mark')
+    op.drop_column('feed_sources', 'seen_entries')
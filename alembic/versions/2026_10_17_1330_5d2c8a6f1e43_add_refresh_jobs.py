@@ -0,0 +1,46 @@
+"""add refresh jobs
+
+Revision ID: 5d2c8a6f1e43
+Revises: a9e4f7b3c150
+Create Date: 2026-10-17 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2c8a6f1e43'
+down_revision: Union[str, None] = 'a9e4f7b3c150'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'refresh_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('feed_source_id', sa.Integer(), nullable=False),
+        sa.Column('run_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['feed_source_id'], ['feed_sources.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_refresh_jobs_id'), 'refresh_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_refresh_jobs_feed_source_id'), 'refresh_jobs', ['feed_source_id'], unique=True)
+    op.create_index(op.f('ix_refresh_jobs_run_at'), 'refresh_jobs', ['run_at'], unique=False)
+    op.create_index(op.f('ix_refresh_jobs_locked_until'), 'refresh_jobs', ['locked_until'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_refresh_jobs_locked_until'), table_name='refresh_jobs')
+    op.drop_index(op.f('ix_refresh_jobs_run_at'), table_name='refresh_jobs')
+    op.drop_index(op.f('ix_refresh_jobs_feed_source_id'), table_name='refresh_jobs')
+    op.drop_index(op.f('ix_refresh_jobs_id'), table_name='refresh_jobs')
+    op.drop_table('refresh_jobs')
@@ -0,0 +1,26 @@
+"""add refresh job priority
+
+Revision ID: 8b1f4e7c3d29
+Revises: 5d2c8a6f1e43
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1f4e7c3d29'
+down_revision: Union[str, None] = '5d2c8a6f1e43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_jobs', sa.Column('priority', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('refresh_jobs', 'priority')
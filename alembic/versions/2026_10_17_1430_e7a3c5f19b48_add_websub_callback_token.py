@@ -0,0 +1,50 @@
+"""add websub callback token
+
+Revision ID: e7a3c5f19b48
+Revises: 8b1f4e7c3d29
+Create Date: 2026-10-17 14:30:00.000000
+
+"""
+import secrets
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c5f19b48'
+down_revision: Union[str, None] = '8b1f4e7c3d29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+websub_subscriptions = sa.table(
+    'websub_subscriptions',
+    sa.column('id', sa.Integer), sa.column('callback_token', sa.String), sa.column('state', sa.String),
+)
+
+
+def upgrade() -> None:
+    op.add_column('websub_subscriptions', sa.Column('callback_token', sa.String(length=64), nullable=True))
+    op.add_column('websub_subscriptions', sa.Column('pending_mode', sa.String(length=20), nullable=True))
+
+    # Hubs know the old id-based callbacks, which stop working; mark them failed so the next poll resubscribes
+    bind = op.get_bind()
+    for (subscription_id,) in bind.execute(sa.select(websub_subscriptions.c.id)).all():
+        bind.execute(
+            websub_subscriptions.update()
+            .where(websub_subscriptions.c.id == subscription_id)
+            .values(callback_token=secrets.token_urlsafe(32), state='failed')
+        )
+
+    with op.batch_alter_table('websub_subscriptions') as batch_op:
+        batch_op.alter_column('callback_token', existing_type=sa.String(length=64), nullable=False)
+    op.create_index(
+        op.f('ix_websub_subscriptions_callback_token'), 'websub_subscriptions', ['callback_token'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_websub_subscriptions_callback_token'), table_name='websub_subscriptions')
+    op.drop_column('websub_subscriptions', 'pending_mode')
+    op.drop_column('websub_subscriptions', 'callback_token')
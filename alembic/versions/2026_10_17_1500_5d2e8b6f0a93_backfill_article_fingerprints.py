@@ -0,0 +1,61 @@
+"""backfill article fingerprints
+
+Revision ID: 5d2e8b6f0a93
+Revises: e7a3c5f19b48
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.fingerprint import canonicalize_url, content_fingerprint
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8b6f0a93'
+down_revision: Union[str, None] = 'e7a3c5f19b48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+articles = sa.table(
+    'articles',
+    sa.column('id', sa.Integer), sa.column('url', sa.String), sa.column('title', sa.String),
+    sa.column('canonical_url', sa.String), sa.column('fingerprint', sa.String),
+)
+
+
+def upgrade() -> None:
+    # c41e9a7d2b65 added the columns empty; articles stored before it never matched a later copy
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(articles.c.id, articles.c.url, articles.c.title)
+            .where(
+                articles.c.id > last_id,
+                sa.or_(articles.c.canonical_url.is_(None), articles.c.fingerprint.is_(None)),
+            )
+            .order_by(articles.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            articles.update()
+            .where(articles.c.id == sa.bindparam('article_id'))
+            .values(canonical_url=sa.bindparam('canonical'), fingerprint=sa.bindparam('title_fingerprint')),
+            [
+                {'article_id': article_id, 'canonical': canonicalize_url(url), 'title_fingerprint': content_fingerprint(title)}
+                for article_id, url, title in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    # The values are derived from url and title; nothing to undo
+    pass
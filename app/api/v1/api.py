@@ -1,7 +1,7 @@
 # app/api/v1/api.py
 
 from fastapi import APIRouter
-from app.api.v1.endpoints import feed_history, auth, articles, feed, admin, subscriptions
+from app.api.v1.endpoints import feed_history, auth, articles, feed, admin, subscriptions, websub, opml
 
 api_router = APIRouter()
 
@@ -9,6 +9,8 @@ api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(articles.router, prefix="/articles", tags=["articles"])
 api_router.include_router(feed.router, prefix="/feed", tags=["feed"])
+api_router.include_router(opml.router, prefix="/feed", tags=["feed"])
 api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
 api_router.include_router(subscriptions.router, prefix="/subscriptions", tags=["subscriptions"])
 api_router.include_router(feed_history.router, prefix="/feed-history", tags=["feed-history"])
+api_router.include_router(websub.router, prefix="/websub", tags=["websub"])
@@ -7,6 +7,10 @@ from app.schemas.user import User
 from app.schemas.article import Article
 from app.db.session import get_db
 from app.core.deps import get_current_admin_user
+from app.core.feed_fetcher import feed_fetcher
+from app.core.background_tasks import background_task_manager
+from app.core.http_client import http_client
+from app.core.host_limiter import host_limiter
 
 router = APIRouter()
 
@@ -64,4 +68,61 @@ def delete_user(
         )
     
     user.remove(db, id=user_id)
-    return {"message": "User deleted successfully"}
\ No newline at end of file
+    return {"message": "User deleted successfully"}
+
+@router.get("/feeds/fetch-stats")
+def read_feed_fetch_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Conditional GET counters (304s, bytes downloaded and saved) for this worker.
+    Only accessible by admin users.
+    """
+    return feed_fetcher.get_stats()
+
+@router.get("/feeds/refresh-stats")
+def read_feed_refresh_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Throughput and latency of the last background refresh cycle on this worker,
+    the last scheduling tick if this worker leads, and the shared job queue.
+    Only accessible by admin users.
+    """
+    return {
+        "last_cycle": background_task_manager.last_cycle_stats,
+        "last_schedule": background_task_manager.last_schedule_stats,
+        "queue": background_task_manager.get_queue_stats(),
+        "single_flight": background_task_manager.refresh_flight.get_stats(),
+        "sources": background_task_manager.sources.get_stats()
+    }
+
+@router.get("/http-client/stats")
+def read_http_client_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Request and connection-pool usage of the shared HTTP client on this worker.
+    Only accessible by admin users.
+    """
+    return http_client.get_stats()
+
+@router.get("/http-client/hosts")
+def read_host_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Per-host request, wait and throttling counters for feed fetches on this worker.
+    Only accessible by admin users.
+    """
+    return host_limiter.get_stats()
+
+@router.get("/background/leader")
+def read_background_leader(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Which worker schedules feed refreshes, and how old its lease is.
+    Only accessible by admin users.
+    """
+    return background_task_manager.elector.status()
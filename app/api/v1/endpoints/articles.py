@@ -1,12 +1,12 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud.article import article
 from app.schemas.article import Article, ArticleCreate, ArticleUpdate
 from app.models.user import User
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.core.deps import get_current_user
-from app.core.versioning import version_config, APIVersion, VersionedResponse
+from app.core.versioning import version_config, VersionedResponse
 from app.core.error_handler import ErrorDetail
 from fastapi.responses import Response
 from app.core.feed_generator import RSSFeedGenerator
@@ -25,13 +25,14 @@ class ArticleResponse(VersionedResponse):
 
 @router.get("", response_model=ArticleResponse)
 async def read_articles(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
+    collapse_duplicates: bool = False,
     current_user: User = Depends(get_current_user),
     api_version: str = Depends(version_config.verify_version)
 ):
-    cache_key = f"articles:{current_user.id}:{skip}:{limit}"
+    cache_key = f"articles:{current_user.id}:{skip}:{limit}:{int(collapse_duplicates)}"
     cached_data = cache.get_cache(cache_key)
     if cached_data:
         return ArticleResponse(**cached_data)
@@ -43,17 +44,15 @@ async def read_articles(
     - 1.0: Base implementation
     - 1.1: Added pagination metadata
     - 2.0: Added filtering and sorting
+
+    collapse_duplicates returns one article per story when the same story
+    was stored from several feeds or sources.
     """
     try:
         logger.info(f"Getting articles with skip={skip} and limit={limit}")
         
-        # Version-specific logic
-        if api_version >= APIVersion.V2:
-            # V2: Include filtering and sorting
-            articles = article.get_multi_filtered(db, skip=skip, limit=limit)
-        else:
-            # V1: Basic pagination
-            articles = article.get_multi(db, skip=skip, limit=limit)
+        # Every version pages the same way; the versions differ only in the response envelope
+        articles = await article.get_multi_async(db, skip=skip, limit=limit, collapse_duplicates=collapse_duplicates)
         
         total_count = len(articles)
         logger.info(f"Found {total_count} articles")
@@ -80,7 +79,7 @@ async def read_articles(
 @router.post("", response_model=Article)
 async def create_article(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     article_in: ArticleCreate,
     current_user: User = Depends(get_current_user),
     api_version: str = Depends(version_config.verify_version)
@@ -88,7 +87,7 @@ async def create_article(
     """Create new article. This endpoint requires authentication."""
     try:
         logger.info(f"Creating article with title: {article_in.title}")
-        article_obj = article.create(db, obj_in=article_in)
+        article_obj = await article.create_async(db, obj_in=article_in)
         logger.info(f"Successfully created article with id: {article_obj.id}")
         return article_obj
     except Exception as e:
@@ -105,7 +104,7 @@ async def create_article(
 @router.put("/{article_id}", response_model=Article)
 async def update_article(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     article_id: int,
     article_in: ArticleUpdate,
     current_user: User = Depends(get_current_user),
@@ -113,7 +112,7 @@ async def update_article(
 ):
     """Update article. This endpoint requires authentication."""
     try:
-        article_obj = article.get(db, id=article_id)
+        article_obj = await article.get_async(db, id=article_id)
         if not article_obj:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -123,7 +122,7 @@ async def update_article(
                     details={"id": article_id} if version_config.is_supported(api_version) else None
                 ).dict()
             )
-        article_obj = article.update(db, db_obj=article_obj, obj_in=article_in)
+        article_obj = await article.update_async(db, db_obj=article_obj, obj_in=article_in)
         return article_obj
     except HTTPException:
         raise
@@ -141,14 +140,14 @@ async def update_article(
 @router.delete("/{article_id}")
 async def delete_article(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     article_id: int,
     current_user: User = Depends(get_current_user),
     api_version: str = Depends(version_config.verify_version)
 ):
     """Delete article. This endpoint requires authentication."""
     try:
-        article_obj = article.get(db, id=article_id)
+        article_obj = await article.get_async(db, id=article_id)
         if not article_obj:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -158,7 +157,7 @@ async def delete_article(
                     details={"id": article_id} if version_config.is_supported(api_version) else None
                 ).dict()
             )
-        article.remove(db, id=article_id)
+        await article.remove_async(db, id=article_id)
         return {"message": "Article deleted successfully"}
     except HTTPException:
         raise
@@ -175,11 +174,11 @@ async def delete_article(
     
 @router.get("/feed.rss")
 async def get_rss_feed(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = 50
 ):
     """Generate RSS feed of latest articles."""
-    articles = article.get_multi(db, limit=limit)
+    articles = await article.get_multi_async(db, limit=limit)
     
     feed_gen = RSSFeedGenerator()
     feed_gen.add_articles(articles)
@@ -191,11 +190,11 @@ async def get_rss_feed(
 
 @router.get("/feed.atom")
 async def get_atom_feed(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = 50
 ):
     """Generate Atom feed of latest articles."""
-    articles = article.get_multi(db, limit=limit)
+    articles = await article.get_multi_async(db, limit=limit)
     
     feed_gen = RSSFeedGenerator()
     feed_gen.add_articles(articles)
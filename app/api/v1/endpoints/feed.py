@@ -1,16 +1,22 @@
 # app\api\v1\endpoints
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 
 
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.core.deps import get_current_user
 from app.core.feed_validator import feed_validator
+from app.core.background_tasks import background_task_manager
+from app.crud.feed_source import feed_source as feed_source_crud
 from app.models.user import User
 from app.models.feed import Feed
-from app.schemas.feed import FeedCreate, FeedUpdate, Feed as FeedSchema
+from app.schemas.feed import FeedCreate, FeedDiscoveryRequest, FeedUpdate, Feed as FeedSchema
+from app.core.config import settings
 from app.core.redis_cache import cache
 import logging
 
@@ -23,10 +29,15 @@ async def create_feed(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Create a new feed with validation."""
+    """
+    Create a new feed with validation.
+
+    Reuses a recent validation of the same URL, and stores the entries that
+    fetch parsed as a new source's first articles instead of fetching again.
+    """
     async with feed_validator as validator:
         # Validate the feed URL
-        is_valid, validation_result = await validator.validate_feed(feed_in.url)
+        is_valid, validation_result = await validator.validate_feed(str(feed_in.url))
         
         if not is_valid:
             raise HTTPException(
@@ -37,20 +48,30 @@ async def create_feed(
                 }
             )
         
-        # Create feed with validated metadata
-        feed = Feed(
-            name=feed_in.name or validation_result["metadata"]["title"],
-            url=feed_in.url,
-            feed_type=validation_result["format"],
-            category=feed_in.category,
-            user_id=current_user.id,
-            last_fetched=datetime.utcnow(),
-            extra_data=validation_result["metadata"]
-        )
-        
         try:
+            # Subscribers to the same URL share one source, so it is fetched once
+            source = feed_source_crud.get_or_create(
+                db, url=str(feed_in.url), feed_type=validation_result["format"]
+            )
+
+            # Create feed with validated metadata
+            feed = Feed(
+                name=feed_in.name or validation_result["metadata"]["title"],
+                url=str(feed_in.url),
+                feed_type=validation_result["format"],
+                category=feed_in.category,
+                user_id=current_user.id,
+                source_id=source.id,
+                last_fetched=source.last_fetched,
+                extra_data=validation_result["metadata"]
+            )
             db.add(feed)
             db.commit()
+
+            entries = validator.cache.take_entries(str(feed_in.url))
+            if entries and source.last_fetched is None:
+                background_task_manager.seed_source(source, entries)
+                db.expire_all()
             db.refresh(feed)
             return feed
         except Exception as e:
@@ -66,29 +87,29 @@ async def get_feeds(
     skip: int = 0,
     limit: int = 100,
     category: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get user's feeds with optional category filter."""
-    query = db.query(Feed).filter(Feed.user_id == current_user.id)
+    query = select(Feed).where(Feed.user_id == current_user.id)
     
     if category:
-        query = query.filter(Feed.category == category)
+        query = query.where(Feed.category == category)
     
-    feeds = query.offset(skip).limit(limit).all()
-    return feeds
+    feeds = await db.scalars(query.offset(skip).limit(limit))
+    return feeds.all()
 
 @router.get("/feeds/{feed_id}", response_model=FeedSchema)
 async def get_feed(
     feed_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific feed."""
-    feed = db.query(Feed).filter(
+    feed = await db.scalar(select(Feed).where(
         Feed.id == feed_id,
         Feed.user_id == current_user.id
-    ).first()
+    ))
     
     if not feed:
         raise HTTPException(
@@ -117,9 +138,9 @@ async def update_feed(
         )
 
     # If URL is being updated, validate the new URL
-    if feed_in.url and feed_in.url != feed.url:
+    if feed_in.url and str(feed_in.url) != feed.url:
         async with feed_validator as validator:
-            is_valid, validation_result = await validator.validate_feed(feed_in.url)
+            is_valid, validation_result = await validator.validate_feed(str(feed_in.url))
             
             if not is_valid:
                 raise HTTPException(
@@ -130,9 +151,12 @@ async def update_feed(
                     }
                 )
             
-            feed.url = feed_in.url
+            feed.url = str(feed_in.url)
             feed.feed_type = validation_result["format"]
             feed.extra_data = validation_result["metadata"]
+            feed.source_id = feed_source_crud.get_or_create(
+                db, url=feed.url, feed_type=feed.feed_type
+            ).id
 
     # Update other fields
     if feed_in.name:
@@ -230,6 +254,35 @@ async def discover_feed(
             detail="Error discovering feed"
         )
 
+@router.post("/feeds/discover/bulk")
+async def discover_feeds(
+    discovery_in: FeedDiscoveryRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Discover the feed URL of each of a list of websites."""
+    if len(discovery_in.urls) > settings.FEED_DISCOVERY_BULK_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.FEED_DISCOVERY_BULK_MAX} websites per request"
+        )
+
+    try:
+        async with feed_validator as validator:
+            found = await validator.discover_feed_urls(discovery_in.urls)
+        return {
+            "results": [
+                {"website_url": website_url, "feed_url": feed_url}
+                for website_url, feed_url in found.items()
+            ],
+            "found": sum(1 for feed_url in found.values() if feed_url)
+        }
+    except Exception as e:
+        logger.error(f"Error discovering feeds: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error discovering feeds"
+        )
+
 @router.post("/feeds/validate")
 async def validate_feed_url(
     url: str,
@@ -267,7 +320,13 @@ async def refresh_feed(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Manually refresh a feed."""
+    """
+    Manually refresh a feed.
+
+    Jumps the refresh queue and shares the fetch with anyone else refreshing
+    the same URL, including the background workers. Answers 202 if the fetch
+    is still running when the wait runs out; it stays queued first in line.
+    """
     feed = db.query(Feed).filter(
         Feed.id == feed_id,
         Feed.user_id == current_user.id
@@ -280,34 +339,37 @@ async def refresh_feed(
         )
 
     try:
-        async with feed_validator as validator:
-            is_valid, validation_result = await validator.validate_feed(feed.url)
-            
-            if not is_valid:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail={
-                        "message": "Feed has become invalid",
-                        "validation_errors": validation_result
-                    }
-                )
-            
-            # Update feed metadata
-            feed.last_fetched = datetime.utcnow()
-            feed.extra_data = validation_result["metadata"]
-            
+        if feed.source_id is None:
+            feed.source_id = feed_source_crud.get_or_create(db, url=feed.url, feed_type=feed.feed_type).id
             db.commit()
-            db.refresh(feed)
-            
-            # Clear cache for this feed
-            cache.delete_cache(f"feed_{feed_id}")
-            
-            return {
-                "message": "Feed refreshed successfully",
-                "metadata": validation_result["metadata"],
-                "stats": validation_result["stats"]
-            }
-            
+
+        counts = await background_task_manager.refresh_now(feed.source_id)
+        if counts is None:
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={"message": "Feed refresh queued"}
+            )
+
+        # The fetch wrote through its own sessions
+        db.expire_all()
+        if counts.get("errors"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "message": "Feed could not be refreshed",
+                    "error": feed.source.last_error
+                }
+            )
+
+        # Clear cache for this feed
+        cache.delete_cache(f"feed_{feed_id}")
+
+        return {
+            "message": "Feed refreshed successfully",
+            "metadata": feed.extra_data,
+            "stats": counts
+        }
+
     except HTTPException:
         raise
     except Exception as e:
@@ -320,12 +382,12 @@ async def refresh_feed(
 
 @router.get("/feeds/stats")
 async def get_feed_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get statistics about user's feeds."""
     try:
-        feeds = db.query(Feed).filter(Feed.user_id == current_user.id).all()
+        feeds = (await db.scalars(select(Feed).where(Feed.user_id == current_user.id))).all()
         
         total_feeds = len(feeds)
         feeds_by_category = {}
@@ -0,0 +1,187 @@
+# app/api/v1/endpoints/opml.py
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple
+import asyncio
+import json
+import logging
+
+from app.db.session import get_db
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.core.background_tasks import background_task_manager
+from app.core.feed_validator import feed_validator
+from app.core.fingerprint import normalize_feed_url
+from app.core.opml import OPMLError, iter_opml, parse_opml
+from app.crud.feed_source import feed_source as feed_source_crud
+from app.models.feed import Feed
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Width of Feed.url; longer outline URLs could never be stored
+MAX_FEED_URL_LENGTH = 512
+
+# Streaming bodies outlive the request's dependencies, so they open their own sessions
+
+def _ndjson(line: Dict[str, Any]) -> str:
+    return json.dumps(line) + "\n"
+
+def _subscribe_all(user_id: int, accepted: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+    """Insert a Feed for every accepted outline in one transaction, then seed sources new to the app."""
+    if not accepted:
+        return 0
+    db = next(get_db())
+    try:
+        sources = feed_source_crud.get_or_create_many(
+            db, feed_types={outline["url"]: result["format"] for outline, result in accepted}
+        )
+        feeds = []
+        for outline, result in accepted:
+            source = sources[normalize_feed_url(outline["url"])]
+            feeds.append(Feed(
+                name=(outline["title"] or result["metadata"].get("title") or outline["url"])[:100],
+                url=outline["url"],
+                feed_type=result["format"],
+                category=(outline["category"] or "")[:50] or None,
+                user_id=user_id,
+                source_id=source.id,
+                last_fetched=source.last_fetched,
+                extra_data=result["metadata"]
+            ))
+        db.add_all(feeds)
+        db.commit()
+
+        for source in sources.values():
+            entries = feed_validator.cache.take_entries(source.url)
+            if entries and source.last_fetched is None:
+                background_task_manager.seed_source(source, entries)
+        return len(feeds)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error importing feeds for user {user_id}: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+async def _import_progress(
+    user_id: int,
+    total: int,
+    outlines: List[Dict[str, Any]]
+) -> AsyncIterator[str]:
+    yield _ndjson({"total": total, "already_subscribed": total - len(outlines)})
+
+    too_long = [outline for outline in outlines if len(outline["url"]) > MAX_FEED_URL_LENGTH]
+    for outline in too_long:
+        yield _ndjson({
+            "url": outline["url"],
+            "valid": False,
+            "error": f"URL is longer than {MAX_FEED_URL_LENGTH} characters"
+        })
+    candidates = [outline for outline in outlines if len(outline["url"]) <= MAX_FEED_URL_LENGTH]
+
+    semaphore = asyncio.Semaphore(settings.FEED_IMPORT_CONCURRENCY)
+
+    async def validate(outline: Dict[str, Any]):
+        async with semaphore:
+            return outline, await feed_validator.validate_feed(outline["url"])
+
+    checks = [asyncio.ensure_future(validate(outline)) for outline in candidates]
+    accepted: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    try:
+        for check in asyncio.as_completed(checks):
+            outline, (is_valid, result) = await check
+            if is_valid:
+                accepted.append((outline, result))
+            yield _ndjson({
+                "url": outline["url"],
+                "valid": is_valid,
+                "error": None if is_valid else result.get("error")
+            })
+    finally:
+        # The client may hang up mid-import; stop validating for nobody
+        for check in checks:
+            check.cancel()
+        await asyncio.gather(*checks, return_exceptions=True)
+
+    summary = {"done": True, "imported": 0, "invalid": len(outlines) - len(accepted)}
+    try:
+        # One blocking write; keep it off the event loop the other imports stream on
+        summary["imported"] = await run_in_threadpool(_subscribe_all, user_id, accepted)
+    except Exception:
+        summary["error"] = "Error saving imported feeds"
+    yield _ndjson(summary)
+
+@router.post("/feeds/import/opml")
+async def import_opml(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Subscribe to every feed in an OPML file.
+
+    Feeds are validated FEED_IMPORT_CONCURRENCY at a time. The response is
+    NDJSON: a header line, one line per feed as its validation finishes, and
+    a summary once all valid feeds are inserted in a single write.
+    """
+    data = await file.read(settings.FEED_MAX_BYTES + 1)
+    if len(data) > settings.FEED_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="OPML file is too large"
+        )
+    try:
+        outlines = parse_opml(data)
+    except OPMLError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if len(outlines) > settings.FEED_IMPORT_MAX_FEEDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.FEED_IMPORT_MAX_FEEDS} feeds per import"
+        )
+
+    db = next(get_db())
+    try:
+        subscribed = {
+            normalize_feed_url(url)
+            for (url,) in db.query(Feed.url).filter(Feed.user_id == current_user.id)
+        }
+    finally:
+        db.close()
+    fresh = [outline for outline in outlines if normalize_feed_url(outline["url"]) not in subscribed]
+
+    return StreamingResponse(
+        _import_progress(current_user.id, len(outlines), fresh),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/feeds/export/opml")
+def export_opml(
+    current_user: User = Depends(get_current_user)
+):
+    """Download the user's subscriptions as OPML, streamed as it is read."""
+    user_id = current_user.id
+
+    def feeds() -> Iterator[Feed]:
+        db = next(get_db())
+        try:
+            yield from (
+                db.query(Feed)
+                .filter(Feed.user_id == user_id)
+                .order_by(Feed.category, Feed.name)
+                .yield_per(200)
+            )
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        iter_opml(feeds()),
+        media_type="text/x-opml",
+        headers={"Content-Disposition": 'attachment; filename="subscriptions.opml"'}
+    )
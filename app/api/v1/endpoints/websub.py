@@ -0,0 +1,89 @@
+# app/api/v1/endpoints/websub.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+from typing import AsyncIterator, Optional
+from datetime import datetime
+import logging
+
+from app.db.session import get_db
+from app.core.config import settings
+from app.core.background_tasks import background_task_manager
+from app.core.feed_fetcher import FeedStream
+from app.core.parse_executor import feed_headers
+from app.core.seen_index import SeenIndex
+from app.core.websub import websub_manager
+from app.models.websub_subscription import WebSubSubscription
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+async def _single_chunk(body: bytes) -> AsyncIterator[bytes]:
+    yield body
+
+def _subscription(db: Session, callback_token: str) -> Optional[WebSubSubscription]:
+    return db.query(WebSubSubscription).filter(WebSubSubscription.callback_token == callback_token).first()
+
+@router.get("/callback/{callback_token}", response_class=PlainTextResponse)
+def verify_subscription(
+    callback_token: str,
+    mode: str = Query(..., alias="hub.mode"),
+    topic: str = Query(..., alias="hub.topic"),
+    challenge: Optional[str] = Query(None, alias="hub.challenge"),
+    lease_seconds: Optional[int] = Query(None, alias="hub.lease_seconds"),
+    db: Session = Depends(get_db)
+):
+    """Hub verification of intent: echo the challenge for subscriptions we asked for."""
+    subscription = _subscription(db, callback_token)
+    if not subscription or not websub_manager.verify(db, subscription, mode, topic, lease_seconds):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown subscription"
+        )
+    return challenge or ""
+
+@router.post("/callback/{callback_token}", status_code=status.HTTP_202_ACCEPTED)
+async def receive_push(
+    callback_token: str,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Ingest feed content pushed by the hub into the article pipeline."""
+    subscription = _subscription(db, callback_token)
+    if not subscription or subscription.state != "active":
+        # 410 tells the hub to stop delivering to this callback
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Subscription is not active"
+        )
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > settings.FEED_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Pushed content is too large"
+            )
+
+    # The spec asks for a 2xx on a bad signature, so a forger learns nothing; the content is dropped
+    if not websub_manager.verify_signature(subscription, bytes(body), request.headers.get("X-Hub-Signature")):
+        logger.warning(f"Ignoring WebSub push with a bad signature for subscription {subscription.id}")
+        return {"status": "ignored"}
+
+    source = subscription.feed_source
+    stream = FeedStream(
+        background_task_manager.feed_fetcher, source.url, 200, _single_chunk(bytes(body)),
+        response_headers=feed_headers(request, location=subscription.topic_url)
+    )
+    index = SeenIndex.for_source(source)
+    counts, _ = await background_task_manager.ingest_stream(source, stream, index)
+
+    if index.changed:
+        source.seen_entries = index.entries
+        source.high_water_mark = index.high_water_mark
+    subscription.last_push_at = datetime.utcnow()
+    db.commit()
+    websub_manager.stats["pushes"] += 1
+    return {"status": "accepted", **counts}
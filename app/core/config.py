@@ -71,6 +71,67 @@ class Settings(BaseSettings):
     API_RATE_LIMIT: int = 100
     API_RATE_LIMIT_WINDOW: int = 60
 
+    HTTP_POOL_LIMIT: int = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "8"))
+    HTTP_DNS_CACHE_TTL: int = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+    HTTP_KEEPALIVE_TIMEOUT: int = int(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+    HTTP_CONNECT_TIMEOUT: int = int(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+    HTTP_READ_TIMEOUT: int = int(os.getenv("HTTP_READ_TIMEOUT", "20"))
+    HTTP_TOTAL_TIMEOUT: int = int(os.getenv("HTTP_TOTAL_TIMEOUT", "30"))
+
+    FEED_REFRESH_WORKERS: int = int(os.getenv("FEED_REFRESH_WORKERS", "20"))
+    FEED_FETCH_TIMEOUT: int = int(os.getenv("FEED_FETCH_TIMEOUT", "30"))
+    FEED_SCHEDULER_TICK: int = int(os.getenv("FEED_SCHEDULER_TICK", "60"))
+    FEED_MIN_POLL_INTERVAL: int = int(os.getenv("FEED_MIN_POLL_INTERVAL", "300"))
+    FEED_MAX_POLL_INTERVAL: int = int(os.getenv("FEED_MAX_POLL_INTERVAL", "86400"))
+    FEED_DEFAULT_POLL_INTERVAL: int = int(os.getenv("FEED_DEFAULT_POLL_INTERVAL", "900"))
+    FEED_POLL_JITTER: float = float(os.getenv("FEED_POLL_JITTER", "0.1"))
+    FEED_PARSE_EXECUTOR: str = os.getenv("FEED_PARSE_EXECUTOR", "process")  # 'process' or 'thread'
+    FEED_PARSE_WORKERS: int = int(os.getenv("FEED_PARSE_WORKERS", "2"))
+    FEED_PARSE_TIMEOUT: int = int(os.getenv("FEED_PARSE_TIMEOUT", "20"))
+    FEED_MAX_BYTES: int = int(os.getenv("FEED_MAX_BYTES", str(10 * 1024 * 1024)))
+    FEED_MAX_ENTRIES: int = int(os.getenv("FEED_MAX_ENTRIES", "500"))
+    FEED_STREAM_CHUNK_SIZE: int = int(os.getenv("FEED_STREAM_CHUNK_SIZE", "65536"))
+    FEED_INGEST_BATCH_SIZE: int = int(os.getenv("FEED_INGEST_BATCH_SIZE", "100"))
+    FEED_SEEN_INDEX_SIZE: int = int(os.getenv("FEED_SEEN_INDEX_SIZE", "500"))  # Entries remembered per feed source
+    FEED_CIRCUIT_THRESHOLD: int = int(os.getenv("FEED_CIRCUIT_THRESHOLD", "5"))  # Consecutive failures
+    FEED_CIRCUIT_OPEN_INTERVAL: int = int(os.getenv("FEED_CIRCUIT_OPEN_INTERVAL", "21600"))
+    FEED_DEAD_AFTER_DAYS: int = int(os.getenv("FEED_DEAD_AFTER_DAYS", "14"))
+    FEED_DISCOVERY_TIMEOUT: int = int(os.getenv("FEED_DISCOVERY_TIMEOUT", "10"))  # Per probe
+    FEED_DISCOVERY_CONCURRENCY: int = int(os.getenv("FEED_DISCOVERY_CONCURRENCY", "10"))  # Sites probed at once in bulk
+    FEED_DISCOVERY_BULK_MAX: int = int(os.getenv("FEED_DISCOVERY_BULK_MAX", "50"))
+    FEED_VALIDATION_CACHE_TTL: int = int(os.getenv("FEED_VALIDATION_CACHE_TTL", "300"))
+    FEED_VALIDATION_NEGATIVE_TTL: int = int(os.getenv("FEED_VALIDATION_NEGATIVE_TTL", "60"))  # For invalid feeds
+    FEED_IMPORT_CONCURRENCY: int = int(os.getenv("FEED_IMPORT_CONCURRENCY", "10"))  # OPML feeds validated at once
+    FEED_IMPORT_MAX_FEEDS: int = int(os.getenv("FEED_IMPORT_MAX_FEEDS", "1000"))
+    HOST_RATE_LIMIT: float = float(os.getenv("HOST_RATE_LIMIT", "2.0"))  # Requests per second per host
+    HOST_BURST: int = int(os.getenv("HOST_BURST", "5"))
+    HOST_MAX_CONCURRENCY: int = int(os.getenv("HOST_MAX_CONCURRENCY", "4"))
+    HOST_MAX_WAIT: float = float(os.getenv("HOST_MAX_WAIT", "10"))
+    HOST_DEFAULT_RETRY_AFTER: int = int(os.getenv("HOST_DEFAULT_RETRY_AFTER", "300"))
+    HOST_MAX_RETRY_AFTER: int = int(os.getenv("HOST_MAX_RETRY_AFTER", "21600"))
+    LEADER_LEASE_TTL: int = int(os.getenv("LEADER_LEASE_TTL", "30"))
+    REFRESH_QUEUE_VISIBILITY_TIMEOUT: int = int(os.getenv("REFRESH_QUEUE_VISIBILITY_TIMEOUT", "120"))  # Seconds a claim hides a job
+    REFRESH_QUEUE_MAX_ATTEMPTS: int = int(os.getenv("REFRESH_QUEUE_MAX_ATTEMPTS", "5"))
+    REFRESH_QUEUE_RETRY_DELAY: int = int(os.getenv("REFRESH_QUEUE_RETRY_DELAY", "60"))  # Doubled on each retry
+    REFRESH_QUEUE_POLL_INTERVAL: int = int(os.getenv("REFRESH_QUEUE_POLL_INTERVAL", "5"))  # Idle wait between claims
+    WEBSUB_CALLBACK_BASE_URL: Optional[str] = os.getenv("WEBSUB_CALLBACK_BASE_URL")  # Public URL of this API; unset disables WebSub
+    WEBSUB_LEASE_SECONDS: int = int(os.getenv("WEBSUB_LEASE_SECONDS", "864000"))
+    WEBSUB_RENEW_MARGIN: int = int(os.getenv("WEBSUB_RENEW_MARGIN", "86400"))
+    WEBSUB_FALLBACK_POLL_INTERVAL: int = int(os.getenv("WEBSUB_FALLBACK_POLL_INTERVAL", "86400"))
+    NEWS_SOURCES: str = os.getenv("NEWS_SOURCES", "")  # Comma-separated source plugins to ingest, e.g. "rss,newsapi"
+    NEWS_SOURCES_INTERVAL: int = int(os.getenv("NEWS_SOURCES_INTERVAL", "900"))
+    NEWSAPI_KEY: Optional[str] = os.getenv("NEWSAPI_KEY")
+    REUTERS_API_KEY: Optional[str] = os.getenv("REUTERS_API_KEY")
+    NEWSAPI_DAILY_QUOTA: int = int(os.getenv("NEWSAPI_DAILY_QUOTA", "100"))  # Requests per UTC day
+    NEWSAPI_QUERIES: str = os.getenv("NEWSAPI_QUERIES", "technology")  # Comma-separated
+    NEWSAPI_PAGE_SIZE: int = int(os.getenv("NEWSAPI_PAGE_SIZE", "100"))
+    NEWSAPI_MAX_PAGES: int = int(os.getenv("NEWSAPI_MAX_PAGES", "5"))  # Per query per run
+    REUTERS_DAILY_QUOTA: int = int(os.getenv("REUTERS_DAILY_QUOTA", "500"))
+    REUTERS_QUERIES: str = os.getenv("REUTERS_QUERIES", "")  # Empty reads the unfiltered latest news
+    REUTERS_PAGE_SIZE: int = int(os.getenv("REUTERS_PAGE_SIZE", "50"))
+    REUTERS_MAX_PAGES: int = int(os.getenv("REUTERS_MAX_PAGES", "5"))
+
     class Config:
         env_file = ".env"
         case_sensitive = True
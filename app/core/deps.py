@@ -2,16 +2,16 @@ from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.user import User
 from app.crud.user import user
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-def get_current_user(
-    db: Session = Depends(get_db),
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
     credentials_exception = HTTPException(
@@ -29,7 +29,7 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
         
-    user_obj = user.get(db, id=int(user_id))
+    user_obj = await user.get_async(db, id=int(user_id))
     if user_obj is None:
         raise credentials_exception
     return user_obj
@@ -1,65 +1,357 @@
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
+from contextlib import asynccontextmanager
 import aiohttp
-import feedparser
+import hashlib
+from feedparser.datetimes import _parse_date as parse_feed_date
+from feedparser.sanitizer import _sanitize_html
 import logging
 from datetime import datetime
+from app.core.config import settings
+from app.core.feed_stream import IncrementalFeedParser, FeedStreamError
+from app.core.host_limiter import host_limiter
+from app.core.http_client import http_client
+from app.core.parse_executor import feed_headers, parse_executor
 
 logger = logging.getLogger(__name__)
 
+def sanitize_html(value: str) -> str:
+    """Strip scripts, event handlers and unsafe tags the way feedparser does; its output passes unchanged."""
+    return _sanitize_html(value, "utf-8", "text/html") if value else value
+
+class FeedFetchError(Exception):
+    """The feed answered with a status we cannot use."""
+    pass
+
+class FetchResult:
+    """Outcome of a single conditional feed fetch."""
+
+    def __init__(
+        self,
+        status: int,
+        entries: Optional[List[Dict[str, Any]]] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_length: int = 0
+    ):
+        self.status = status
+        self.entries = entries or []
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_length = content_length
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+class FeedStream:
+    """
+    An open feed response whose entries are parsed while the body downloads.
+
+    Only valid inside FeedFetcher.stream(); leaving the block releases the
+    connection, so a consumer that stops iterating never reads the rest of
+    the body. Reaching max_entries is different: parsing stops, but the rest
+    of the body (up to FEED_MAX_BYTES) is still read so content_hash covers it.
+
+    Given the hash of the previous body, nothing is parsed incrementally: the
+    whole body is downloaded and hashed first, and an identical body yields
+    no entries at all, since many servers ignore conditional GET and resend
+    the same feed with a 200. A changed body is then parsed from memory.
+    """
+
+    def __init__(
+        self,
+        fetcher: "FeedFetcher",
+        url: str,
+        status: int,
+        chunks: AsyncIterator[bytes],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        response_headers: Optional[Dict[str, str]] = None,
+        previous_hash: Optional[str] = None
+    ):
+        self.fetcher = fetcher
+        self.url = url
+        self.status = status
+        self.etag = etag
+        self.last_modified = last_modified
+        self.bytes_read = 0
+        self.truncated = False
+        self.previous_hash = previous_hash
+        # Hash of the body (its first FEED_MAX_BYTES when truncated), known once it has been read
+        self.content_hash: Optional[str] = None
+        self.unchanged = False
+        # Feed-level links, known once entries() has run: the WebSub hub and the feed's own URL
+        self.hub_url: Optional[str] = None
+        self.self_url: Optional[str] = None
+        self._chunks = chunks
+        self._response_headers = response_headers
+        self._hasher = hashlib.blake2b(digest_size=16)
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+    async def entries(self, max_entries: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield standardized entries as they finish downloading, up to max_entries."""
+        if self.not_modified:
+            return
+        max_entries = max_entries or settings.FEED_MAX_ENTRIES
+        parser = IncrementalFeedParser()
+        # Kept so malformed XML can fall back to feedparser; bounded by FEED_MAX_BYTES
+        body = bytearray()
+        yielded = set()
+        count = 0
+
+        chunks = self._download(body)
+        if self.previous_hash:
+            async for _ in chunks:
+                pass
+            if self.content_hash == self.previous_hash:
+                self.unchanged = True
+                self.fetcher.stats["unchanged"] += 1
+                self.fetcher._body_sizes[self.url] = self.bytes_read
+                return
+            chunks = self._replay(body)
+
+        try:
+            async for chunk in chunks:
+                for raw in parser.feed(chunk):
+                    entry = self.fetcher._standardize(raw, parser.feed_title)
+                    yielded.add(entry["guid"] or entry["url"])
+                    count += 1
+                    yield entry
+                    if count >= max_entries:
+                        # Parsing stops here, but the next refresh needs the whole body's hash
+                        async for _ in chunks:
+                            pass
+                        return
+            if not self.truncated:
+                for raw in parser.close():
+                    entry = self.fetcher._standardize(raw, parser.feed_title)
+                    yielded.add(entry["guid"] or entry["url"])
+                    count += 1
+                    yield entry
+                    if count >= max_entries:
+                        return
+            return
+        except FeedStreamError as e:
+            logger.info(f"Feed {self.url} is not well-formed XML, falling back to feedparser: {str(e)}")
+        finally:
+            self.fetcher._body_sizes[self.url] = self.bytes_read
+            self.hub_url = parser.links.get("hub")
+            self.self_url = parser.links.get("self")
+
+        # Lenient fallback: finish the download and hand the whole body to feedparser
+        async for _ in chunks:
+            pass
+        self.fetcher._body_sizes[self.url] = self.bytes_read
+        feed = await parse_executor.parse(bytes(body), self._response_headers)
+        links = {link.get("rel"): link.get("href") for link in feed["feed"].get("links", [])}
+        self.hub_url = self.hub_url or links.get("hub")
+        self.self_url = self.self_url or links.get("self")
+        for entry in self.fetcher.parse_entries(feed):
+            if (entry["guid"] or entry["url"]) in yielded:
+                continue
+            count += 1
+            yield entry
+            if count >= max_entries:
+                return
+
+    async def batches(self, size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Group streamed entries into lists of at most size, for bulk ingestion."""
+        size = size or settings.FEED_INGEST_BATCH_SIZE
+        batch = []
+        async for entry in self.entries():
+            batch.append(entry)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def _download(self, body: bytearray) -> AsyncIterator[bytes]:
+        """Accepted chunks as they arrive, hashed along the way."""
+        async for chunk in self._chunks:
+            if not self._accept(chunk, body):
+                # Hash exactly the first FEED_MAX_BYTES, so a truncated feed hashes alike whatever the chunking
+                self._hasher.update(chunk[:settings.FEED_MAX_BYTES - self.bytes_read])
+                break
+            self._hasher.update(chunk)
+            yield chunk
+        self.content_hash = self._hasher.hexdigest()
+
+    async def _replay(self, body: bytearray) -> AsyncIterator[bytes]:
+        """Chunks of an already downloaded body, for parsing after the hash check."""
+        size = settings.FEED_STREAM_CHUNK_SIZE
+        for start in range(0, len(body), size):
+            yield bytes(body[start:start + size])
+
+    def _accept(self, chunk: bytes, body: bytearray) -> bool:
+        """Count a downloaded chunk, refusing it once the feed exceeds FEED_MAX_BYTES."""
+        if self.bytes_read + len(chunk) > settings.FEED_MAX_BYTES:
+            if not self.truncated:
+                logger.warning(f"Feed {self.url} exceeds {settings.FEED_MAX_BYTES} bytes, keeping the entries read so far")
+                self.fetcher.stats["truncated"] += 1
+            self.truncated = True
+            return False
+        self.bytes_read += len(chunk)
+        self.fetcher.stats["bytes_downloaded"] += len(chunk)
+        body.extend(chunk)
+        return True
+
 class FeedFetcher:
     def __init__(self):
         self.session = None
+        self.host_limiter = host_limiter
+        # Size of the last full body seen per URL, used to estimate what a 304 saved
+        self._body_sizes: Dict[str, int] = {}
+        self.stats = {
+            "requests": 0,
+            "not_modified": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+            "truncated": 0,
+            "unchanged": 0
+        }
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # The shared HTTP client outlives individual fetchers
+        pass
 
     async def fetch(self, url: str) -> Optional[List[Dict[str, Any]]]:
         """Fetch and parse feed content."""
+        result = await self.fetch_conditional(url)
+        if result is None or result.not_modified:
+            return None
+        return result.entries
+
+    async def fetch_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Optional[FetchResult]:
+        """Fetch a feed, sending the stored validators so unchanged feeds answer 304."""
         try:
-            if not self.session:
-                async with aiohttp.ClientSession() as session:
-                    return await self._fetch_with_session(session, url)
-            return await self._fetch_with_session(self.session, url)
+            session = self.session or http_client.session
+            return await self._fetch_with_session(session, url, etag, last_modified)
         except Exception as e:
             logger.error(f"Error fetching feed {url}: {str(e)}")
             return None
 
-    async def _fetch_with_session(self, session: aiohttp.ClientSession, url: str) -> Optional[List[Dict[str, Any]]]:
+    @asynccontextmanager
+    async def stream(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> AsyncIterator[FeedStream]:
+        """
+        Open a conditional fetch; content_hash is the previous body's FeedStream.content_hash.
+
+        Raises FeedFetchError for unusable statuses, HostThrottled when the host is
+        rate limited or asked us to back off, and aiohttp errors on network failures.
+        """
+        session = self.session or http_client.session
+        async with self._stream_with_session(session, url, etag, last_modified, content_hash) as stream:
+            yield stream
+
+    @asynccontextmanager
+    async def _stream_with_session(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> AsyncIterator[FeedStream]:
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        async with self.host_limiter.slot(url), session.get(url, headers=headers) as response:
+            self.stats["requests"] += 1
+
+            if response.status in (429, 503):
+                raise self.host_limiter.throttled(url, response.status, response.headers.get("Retry-After"))
+
+            if response.status == 304:
+                self.stats["not_modified"] += 1
+                self.stats["bytes_saved"] += self._body_sizes.get(url, 0)
+                yield FeedStream(
+                    self, url, response.status, response.content.iter_chunked(settings.FEED_STREAM_CHUNK_SIZE),
+                    etag=response.headers.get("ETag", etag),
+                    last_modified=response.headers.get("Last-Modified", last_modified)
+                )
+            elif response.status != 200:
+                raise FeedFetchError(f"HTTP {response.status}")
+            else:
+                yield FeedStream(
+                    self, url, response.status, response.content.iter_chunked(settings.FEED_STREAM_CHUNK_SIZE),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    response_headers=feed_headers(response),
+                    previous_hash=content_hash
+                )
+
+    async def _fetch_with_session(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Optional[FetchResult]:
         """Fetch feed content with provided session."""
         try:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return None
-                content = await response.text()
-                feed = feedparser.parse(content)
-                return self._parse_entries(feed)
+            async with self._stream_with_session(session, url, etag, last_modified) as stream:
+                entries = [entry async for entry in stream.entries()]
+                return FetchResult(
+                    status=stream.status,
+                    entries=entries,
+                    etag=stream.etag,
+                    last_modified=stream.last_modified,
+                    content_length=stream.bytes_read
+                )
         except Exception as e:
             logger.error(f"Error fetching feed {url}: {str(e)}")
             return None
 
-    def _parse_entries(self, feed) -> List[Dict[str, Any]]:
+    def get_stats(self) -> Dict[str, Any]:
+        """Conditional GET counters for this worker."""
+        requests = self.stats["requests"]
+        return {
+            **self.stats,
+            "not_modified_ratio": round(self.stats["not_modified"] / requests, 3) if requests else 0.0,
+            "unchanged_ratio": round(self.stats["unchanged"] / requests, 3) if requests else 0.0
+        }
+
+    def parse_entries(self, feed: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Parse feed entries into standardized format."""
-        entries = []
-        for entry in feed.entries:
-            entries.append({
-                'title': entry.get('title', ''),
-                'content': entry.get('description', ''),
-                'url': entry.get('link', ''),
-                'published_date': self._parse_date(entry.get('published', '')),
-                'author': entry.get('author', ''),
-                'source': feed.feed.get('title', 'Unknown')
-            })
-        return entries
+        return [self._standardize(entry, feed['feed']['title']) for entry in feed['entries']]
+
+    def _standardize(self, entry: Dict[str, Any], source: Optional[str]) -> Dict[str, Any]:
+        """Map a compact or streamed entry onto the fields the app stores."""
+        # Streamed entries bypass feedparser's sanitizer, and both fields end up in innerHTML
+        return {
+            'guid': entry['id'],
+            'title': sanitize_html(entry['title']),
+            'content': sanitize_html(entry['summary']),
+            'url': entry['link'],
+            'published_date': self._parse_date(entry['published']),
+            'author': entry['author'],
+            'source': source or 'Unknown'
+        }
 
     def _parse_date(self, date_str: str) -> datetime:
         """Parse feed date string to datetime."""
         try:
-            return datetime(*feedparser._parse_date(date_str)[:6])
+            return datetime(*parse_feed_date(date_str)[:6])
         except:
             return datetime.utcnow()
 
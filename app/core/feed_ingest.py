@@ -0,0 +1,143 @@
+# app/core/feed_ingest.py
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.fingerprint import canonicalize_url, content_fingerprint
+from app.models.article import Article
+from app.models.feed_source import FeedSource
+
+logger = logging.getLogger(__name__)
+
+def entry_guid(entry: Dict[str, Any]) -> str:
+    """Stable identity for a feed entry: its id, else its link, else a hash of its title and date."""
+    if entry.get("guid"):
+        return entry["guid"][:512]
+    if entry.get("url"):
+        return entry["url"][:512]
+    seed = f"{entry.get('title', '')}|{entry.get('published_date', '')}"
+    return hashlib.sha1(seed.encode("utf-8")).hexdigest()
+
+def _insert_for(db: Session):
+    """Dialect-specific INSERT that supports ON CONFLICT."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Bulk upsert is not supported on {dialect}")
+    return insert
+
+class ArticleIngestor:
+    """Writes fetched feed or source plugin entries into the articles table, one multi-row upsert per batch."""
+
+    def _rows(self, source: FeedSource, entries: Iterable[Dict[str, Any]], now: datetime) -> List[Dict[str, Any]]:
+        api_source = "youtube" if source.feed_type == "youtube" else "rss"
+        rows = {}
+        for entry in entries:
+            guid = entry_guid(entry)
+            title = (entry.get("title") or "")[:255]
+            url = (entry.get("url") or "")[:512]
+            # ON CONFLICT cannot touch the same row twice in one statement
+            rows[guid] = {
+                "feed_source_id": source.id,
+                "guid": guid,
+                "title": title,
+                "content": entry.get("content") or "",
+                "url": url,
+                "canonical_url": canonicalize_url(url),
+                "fingerprint": content_fingerprint(title),
+                "duplicate_of_id": None,
+                "source": (entry.get("source") or "")[:100],
+                "api_source": entry.get("api_source") or api_source,
+                "category": entry.get("category"),
+                "extra_data": entry.get("extra_data"),
+                "author": (entry.get("author") or "")[:100],
+                "published_date": entry.get("published_date") or now,
+                "created_at": now,
+                "updated_at": now,
+            }
+        return list(rows.values())
+
+    def _link_duplicates(self, db: Session, source: FeedSource, rows: List[Dict[str, Any]]) -> None:
+        """Point rows at the earliest existing copy of the same story, using one indexed probe for the batch."""
+        urls = {row["canonical_url"] for row in rows if row["canonical_url"]}
+        fingerprints = {row["fingerprint"] for row in rows if row["fingerprint"]}
+        if not urls and not fingerprints:
+            return
+
+        originals = db.execute(
+            select(Article.id, Article.feed_source_id, Article.guid, Article.canonical_url, Article.fingerprint)
+            .where(
+                or_(Article.canonical_url.in_(urls), Article.fingerprint.in_(fingerprints)),
+                Article.duplicate_of_id.is_(None)
+            )
+            .order_by(Article.id)
+        ).all()
+
+        by_url: Dict[str, Any] = {}
+        by_fingerprint: Dict[str, Any] = {}
+        for original in originals:
+            if original.canonical_url:
+                by_url.setdefault(original.canonical_url, original)
+            if original.fingerprint:
+                by_fingerprint.setdefault(original.fingerprint, original)
+
+        for row in rows:
+            original = by_url.get(row["canonical_url"]) or by_fingerprint.get(row["fingerprint"])
+            # An entry we stored before is its own original, not a copy
+            if original is not None and (original.feed_source_id, original.guid) != (source.id, row["guid"]):
+                row["duplicate_of_id"] = original.id
+
+    def upsert(self, db: Session, source: FeedSource, entries: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insert new entries and refresh changed ones for a feed source.
+
+        Returns inserted/updated/skipped counts, plus how many of the inserted
+        rows duplicate an article already stored. The caller owns the transaction.
+        """
+        now = datetime.utcnow()
+        rows = self._rows(source, entries, now)
+        if not rows:
+            return {"inserted": 0, "updated": 0, "skipped": 0, "duplicates": 0}
+        self._link_duplicates(db, source, rows)
+
+        table = Article.__table__
+        stmt = _insert_for(db)(table).values(rows)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.feed_source_id, table.c.guid],
+            set_={
+                "title": excluded.title,
+                "content": excluded.content,
+                "url": excluded.url,
+                "canonical_url": excluded.canonical_url,
+                "fingerprint": excluded.fingerprint,
+                "author": excluded.author,
+                "published_date": excluded.published_date,
+                "updated_at": excluded.updated_at,
+            },
+            # Unchanged entries are left alone and come back as skipped
+            where=or_(
+                table.c.title != excluded.title,
+                table.c.content != excluded.content,
+                table.c.url != excluded.url,
+            )
+        ).returning(table.c.created_at, table.c.duplicate_of_id)
+
+        # Rows created by this statement carry our timestamp; updated rows keep their original one
+        written = db.execute(stmt).all()
+        created = [row for row in written if row.created_at == now]
+        return {
+            "inserted": len(created),
+            "updated": len(written) - len(created),
+            "skipped": len(rows) - len(written),
+            "duplicates": sum(1 for row in created if row.duplicate_of_id is not None),
+        }
+
+article_ingestor = ArticleIngestor()
@@ -0,0 +1,83 @@
+# app/core/feed_scheduler.py
+import random
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from app.core.config import settings
+
+def estimate_publish_interval(dates: Iterable[Optional[datetime]]) -> Optional[float]:
+    """Estimates the average time between posts in hours."""
+    dates = sorted((d for d in dates if d), reverse=True)
+    if len(dates) < 2:
+        return None
+
+    time_diffs = [
+        (dates[i] - dates[i + 1]).total_seconds() / 3600
+        for i in range(len(dates) - 1)
+    ]
+    return sum(time_diffs) / len(time_diffs)
+
+class FeedScheduler:
+    """Works out when a feed is next due based on its cadence and no-change streak."""
+
+    # Poll several times per average publish gap so new posts are picked up promptly
+    POLLS_PER_PUBLISH_INTERVAL = 4
+    MAX_BACKOFF_STEPS = 6
+
+    def __init__(
+        self,
+        min_interval: Optional[int] = None,
+        max_interval: Optional[int] = None,
+        default_interval: Optional[int] = None,
+        jitter: Optional[float] = None,
+        circuit_threshold: Optional[int] = None,
+        circuit_open_interval: Optional[int] = None
+    ):
+        self.min_interval = min_interval or settings.FEED_MIN_POLL_INTERVAL
+        self.max_interval = max_interval or settings.FEED_MAX_POLL_INTERVAL
+        self.default_interval = default_interval or settings.FEED_DEFAULT_POLL_INTERVAL
+        self.jitter = settings.FEED_POLL_JITTER if jitter is None else jitter
+        self.circuit_threshold = circuit_threshold or settings.FEED_CIRCUIT_THRESHOLD
+        self.circuit_open_interval = circuit_open_interval or settings.FEED_CIRCUIT_OPEN_INTERVAL
+
+    def poll_interval(self, avg_publish_interval: Optional[float], unchanged_count: int = 0) -> float:
+        """Seconds until the next poll, before jitter."""
+        if avg_publish_interval:
+            interval = avg_publish_interval * 3600 / self.POLLS_PER_PUBLISH_INTERVAL
+        else:
+            interval = self.default_interval
+
+        # Each consecutive poll without news doubles the wait
+        interval *= 2 ** min(unchanged_count, self.MAX_BACKOFF_STEPS)
+        return float(min(max(interval, self.min_interval), self.max_interval))
+
+    def next_fetch_at(
+        self,
+        avg_publish_interval: Optional[float],
+        unchanged_count: int = 0,
+        now: Optional[datetime] = None
+    ) -> datetime:
+        """Next due time, jittered so feeds added together drift apart."""
+        return self._jittered(now, self.poll_interval(avg_publish_interval, unchanged_count))
+
+    def circuit_open(self, consecutive_failures: int) -> bool:
+        """Past this many failures in a row a feed is only probed occasionally."""
+        return consecutive_failures >= self.circuit_threshold
+
+    def retry_interval(self, consecutive_failures: int) -> float:
+        """Seconds until a failing feed is retried, doubling with each failure in a row."""
+        if self.circuit_open(consecutive_failures):
+            return float(self.circuit_open_interval)
+        interval = self.min_interval * 2 ** max(consecutive_failures - 1, 0)
+        return float(min(interval, self.circuit_open_interval))
+
+    def retry_at(self, consecutive_failures: int, now: Optional[datetime] = None) -> datetime:
+        return self._jittered(now, self.retry_interval(consecutive_failures))
+
+    def _jittered(self, now: Optional[datetime], interval: float) -> datetime:
+        now = now or datetime.utcnow()
+        if self.jitter:
+            interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return now + timedelta(seconds=interval)
+
+feed_scheduler = FeedScheduler()
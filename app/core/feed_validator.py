@@ -1,19 +1,108 @@
 # app/core/feed_validator.py
+import asyncio
 import aiohttp
 import feedparser
-from typing import Dict, Optional, Tuple
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 import re
-from urllib.parse import urlparse
+from urllib.parse import urljoin, urlparse
 import logging
 from datetime import datetime, timezone
+from app.core.config import settings
+from app.core.feed_fetcher import feed_fetcher
+from app.core.feed_scheduler import estimate_publish_interval
+from app.core.fingerprint import normalize_feed_url
+from app.core.host_limiter import host_limiter
+from app.core.http_client import http_client
+from app.core.parse_executor import feed_headers, parse_executor
+from app.core.redis_cache import cache
 
 logger = logging.getLogger(__name__)
 
+# Media types that are feeds whatever the body says; generic XML types are sniffed instead
+FEED_CONTENT_TYPES = {"application/rss+xml", "application/atom+xml", "application/rdf+xml", "application/x-rss+xml"}
+# Root elements that mark a body as a feed, whatever its Content-Type says
+FEED_ROOT = re.compile(rb"<(rss|feed|rdf:RDF)[\s>]")
+LINK_TAG = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+LINK_ATTR = re.compile(r"""(\w+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+ALTERNATE_TYPES = ("application/rss+xml", "application/atom+xml")
+SNIFF_BYTES = 1024
+
+class ValidationCache:
+    """
+    Recent validation verdicts per normalized feed URL, invalid ones included.
+
+    Verdicts go to Redis so every worker sees them. The entries parsed by the
+    validating fetch stay in this process, for the feed's first articles.
+    """
+
+    def __init__(self, ttl: int, negative_ttl: int, max_local: int = 256):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_local = max_local
+        self._local: "OrderedDict[str, Tuple[float, bool, Dict, Optional[List[Dict[str, Any]]]]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _key(self, url: str) -> str:
+        return f"feed_validation:{normalize_feed_url(url)}"
+
+    def get(self, url: str) -> Optional[Tuple[bool, Dict]]:
+        key = self._key(url)
+        local = self._local.get(key)
+        if local and local[0] > time.time():
+            self.stats["hits"] += 1
+            return local[1], local[2]
+        if cache.client is not None:
+            try:
+                value = cache.client.get(key)
+                if value:
+                    self.stats["hits"] += 1
+                    is_valid, result = json.loads(value)
+                    return is_valid, result
+            except Exception as e:
+                logger.error(f"Error reading cached validation of {url}: {str(e)}")
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, url: str, is_valid: bool, result: Dict, entries: Optional[List[Dict[str, Any]]] = None) -> None:
+        key = self._key(url)
+        ttl = self.ttl if is_valid else self.negative_ttl
+        self._local[key] = (time.time() + ttl, is_valid, result, entries)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local:
+            self._local.popitem(last=False)
+        if cache.client is not None:
+            try:
+                cache.client.setex(key, ttl, json.dumps([is_valid, result], default=str))
+            except Exception as e:
+                logger.error(f"Error caching validation of {url}: {str(e)}")
+
+    def peek_entries(self, url: str) -> Optional[List[Dict[str, Any]]]:
+        """The parsed entries of a recent valid fetch of this URL in this process."""
+        local = self._local.get(self._key(url))
+        if not local or local[0] <= time.time():
+            return None
+        return local[3]
+
+    def take_entries(self, url: str) -> Optional[List[Dict[str, Any]]]:
+        """Like peek_entries, but hands them out once, so only one feed is seeded from them."""
+        entries = self.peek_entries(url)
+        if entries:
+            key = self._key(url)
+            self._local[key] = self._local[key][:3] + (None,)
+        return entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "local": len(self._local)}
+
 class FeedValidator:
     """Validates and analyzes RSS/Atom feeds."""
     
     def __init__(self):
-        self.session = None
+        self.cache = ValidationCache(settings.FEED_VALIDATION_CACHE_TTL, settings.FEED_VALIDATION_NEGATIVE_TTL)
+        self.host_limiter = host_limiter
         self.common_feed_paths = [
             '/feed',
             '/rss',
@@ -27,17 +116,23 @@ class FeedValidator:
             '/index.xml'
         ]
 
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return http_client.session
+
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # The shared HTTP client outlives individual validators
+        pass
 
     async def validate_feed(self, url: str) -> Tuple[bool, Dict]:
         """
         Validates a feed URL and returns validation status and details.
+
+        Verdicts are cached per normalized URL, so validating and then
+        creating a feed fetches it once.
         
         Args:
             url: The URL to validate
@@ -47,45 +142,62 @@ class FeedValidator:
                 - Boolean indicating if feed is valid
                 - Dict with validation details and feed metadata
         """
-        try:
-            # Basic URL validation
-            if not self._is_valid_url(url):
-                return False, {
-                    "error": "Invalid URL format",
-                    "details": "The provided URL is not properly formatted"
-                }
+        # Basic URL validation
+        if not self._is_valid_url(url):
+            return False, {
+                "error": "Invalid URL format",
+                "details": "The provided URL is not properly formatted"
+            }
+
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached
 
+        is_valid, result, entries = await self._validate_uncached(url)
+        self.cache.put(url, is_valid, result, entries)
+        return is_valid, result
+
+    async def _validate_uncached(self, url: str) -> Tuple[bool, Dict, Optional[List[Dict[str, Any]]]]:
+        try:
             # Fetch and validate feed content
-            feed_content = await self._fetch_feed(url)
-            if not feed_content:
+            fetched = await self._fetch_feed(url)
+            if not fetched or not fetched[0]:
                 return False, {
                     "error": "Failed to fetch feed",
                     "details": "Could not retrieve content from the provided URL"
-                }
+                }, None
+
+            feed_content, headers = fetched
+            if len(feed_content) > settings.FEED_MAX_BYTES:
+                return False, {
+                    "error": "Feed too large",
+                    "details": f"Feed is larger than {settings.FEED_MAX_BYTES} bytes"
+                }, None
 
             # Parse and validate feed structure
-            feed = feedparser.parse(feed_content)
+            feed = await parse_executor.parse(feed_content, headers)
             validation_result = self._validate_feed_structure(feed)
             
             if not validation_result["is_valid"]:
-                return False, validation_result
+                return False, validation_result, None
 
             # Extract and validate feed metadata
             metadata = self._extract_feed_metadata(feed)
+            entries = feed_fetcher.parse_entries(feed)
             
             return True, {
                 "is_valid": True,
                 "metadata": metadata,
                 "format": self._detect_feed_format(feed),
-                "stats": self._calculate_feed_stats(feed)
-            }
+                "stats": {**self._calculate_feed_stats(feed), **self._summarize_entries(entries)}
+            }, entries
 
         except Exception as e:
             logger.error(f"Error validating feed {url}: {str(e)}")
             return False, {
                 "error": "Validation error",
                 "details": str(e)
-            }
+            }, None
 
     def _is_valid_url(self, url: str) -> bool:
         """Validates URL format."""
@@ -95,34 +207,41 @@ class FeedValidator:
         except:
             return False
 
-    async def _fetch_feed(self, url: str) -> Optional[str]:
-        """Fetches feed content from URL."""
+    async def _fetch_feed(self, url: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """
+        Fetches raw feed bytes and the headers the parser needs to decode them.
+
+        Goes through the same per-host limits as polling, and reads at most one
+        byte past FEED_MAX_BYTES so an oversized body can be told apart.
+        """
         try:
-            async with self.session.get(url) as response:
+            async with self.host_limiter.slot(url), self.session.get(url) as response:
+                if response.status in (429, 503):
+                    raise self.host_limiter.throttled(url, response.status, response.headers.get("Retry-After"))
                 if response.status == 200:
-                    return await response.text()
+                    return await self._read_head(response, settings.FEED_MAX_BYTES + 1), feed_headers(response)
                 return None
         except Exception as e:
             logger.error(f"Error fetching feed: {str(e)}")
             return None
 
-    def _validate_feed_structure(self, feed) -> Dict:
+    def _validate_feed_structure(self, feed: Dict) -> Dict:
         """Validates the basic structure of the feed."""
-        if feed.bozo:
+        if feed["bozo"]:
             return {
                 "is_valid": False,
                 "error": "Invalid feed format",
-                "details": str(feed.bozo_exception) if feed.bozo_exception else "Unknown parsing error"
+                "details": feed["bozo_exception"] or "Unknown parsing error"
             }
 
-        if not hasattr(feed, 'feed') or not hasattr(feed, 'entries'):
+        if "feed" not in feed or "entries" not in feed:
             return {
                 "is_valid": False,
                 "error": "Invalid feed structure",
                 "details": "Feed is missing required elements"
             }
 
-        if not feed.entries:
+        if not feed["entries"]:
             return {
                 "is_valid": False,
                 "error": "Empty feed",
@@ -131,37 +250,48 @@ class FeedValidator:
 
         return {"is_valid": True}
 
-    def _extract_feed_metadata(self, feed) -> Dict:
+    def _extract_feed_metadata(self, feed: Dict) -> Dict:
         """Extracts metadata from the feed."""
+        channel = feed["feed"]
         return {
-            "title": feed.feed.get("title", ""),
-            "description": feed.feed.get("description", ""),
-            "language": feed.feed.get("language", ""),
-            "last_updated": self._parse_date(feed.feed.get("updated", "")),
-            "author": feed.feed.get("author", ""),
-            "generator": feed.feed.get("generator", ""),
-            "links": [link.get("href", "") for link in feed.feed.get("links", [])],
-            "image": feed.feed.get("image", {}).get("href", "") if "image" in feed.feed else ""
+            "title": channel["title"],
+            "description": channel["description"],
+            "language": channel["language"],
+            "last_updated": self._parse_date(channel["updated"]),
+            "author": channel["author"],
+            "generator": channel["generator"],
+            "links": [link["href"] for link in channel["links"]],
+            "image": channel["image"]
         }
 
-    def _detect_feed_format(self, feed) -> str:
+    def _detect_feed_format(self, feed: Dict) -> str:
         """Detects the feed format (RSS or Atom)."""
-        if feed.version.startswith('atom'):
+        if feed["version"].startswith('atom'):
             return 'atom'
-        elif feed.version.startswith('rss'):
+        elif feed["version"].startswith('rss'):
             return 'rss'
         return 'unknown'
 
-    def _calculate_feed_stats(self, feed) -> Dict:
+    def _calculate_feed_stats(self, feed: Dict) -> Dict:
         """Calculates basic statistics about the feed."""
+        entries = feed["entries"]
         return {
-            "total_entries": len(feed.entries),
-            "average_entry_length": self._calculate_average_entry_length(feed.entries),
+            "total_entries": len(entries),
+            "average_entry_length": self._calculate_average_entry_length(entries),
             "has_images": any(
                 "media_content" in entry or "enclosures" in entry 
-                for entry in feed.entries
+                for entry in entries
             ),
-            "update_frequency": self._estimate_update_frequency(feed.entries)
+            "update_frequency": self._estimate_update_frequency(entries)
+        }
+
+    def _summarize_entries(self, entries: List[Dict[str, Any]]) -> Dict:
+        """What checks on the entries need, kept in the verdict since the entries stay in this process."""
+        if not entries:
+            return {"latest_published": None, "first_entry": None}
+        return {
+            "latest_published": max(entry["published_date"] for entry in entries).isoformat(),
+            "first_entry": {"title": entries[0]["title"], "url": entries[0]["url"]}
         }
 
     def _calculate_average_entry_length(self, entries) -> int:
@@ -169,32 +299,20 @@ class FeedValidator:
         if not entries:
             return 0
         total_length = sum(
-            len(entry.get("description", "")) + len(entry.get("title", ""))
+            len(entry.get("summary", "")) + len(entry.get("title", ""))
             for entry in entries
         )
         return total_length // len(entries)
 
     def _estimate_update_frequency(self, entries) -> Optional[float]:
         """Estimates the average time between posts in hours."""
-        if len(entries) < 2:
-            return None
-
         dates = []
         for entry in entries:
             published = entry.get("published_parsed") or entry.get("updated_parsed")
             if published:
                 dates.append(datetime(*published[:6], tzinfo=timezone.utc))
 
-        if len(dates) < 2:
-            return None
-
-        dates.sort(reverse=True)
-        time_diffs = [
-            (dates[i] - dates[i+1]).total_seconds() / 3600
-            for i in range(len(dates)-1)
-        ]
-        
-        return sum(time_diffs) / len(time_diffs)
+        return estimate_publish_interval(dates)
 
     def _parse_date(self, date_str: str) -> Optional[str]:
         """Parses date string into ISO format."""
@@ -211,42 +329,118 @@ class FeedValidator:
     async def discover_feed_url(self, website_url: str) -> Optional[str]:
         """
         Attempts to discover RSS/Atom feed URL from a website URL.
-        
+
+        The page's own <link rel="alternate"> feed wins. Only when the page
+        names none are the common feed paths probed, all at once within the
+        host's politeness limits; the first to find a feed wins and the rest
+        are cancelled.
+
         Args:
             website_url: The website URL to check for feeds
             
         Returns:
             Discovered feed URL or None if not found
         """
-        try:
-            # Try common feed paths first
-            for path in self.common_feed_paths:
-                parsed = urlparse(website_url)
-                feed_url = f"{parsed.scheme}://{parsed.netloc}{path}"
-                
-                async with self.session.get(feed_url) as response:
-                    if response.status == 200:
-                        content_type = response.headers.get('content-type', '').lower()
-                        if 'xml' in content_type or 'rss' in content_type or 'atom' in content_type:
-                            return feed_url
-
-            # If no common paths work, try to parse the HTML for feed links
-            async with self.session.get(website_url) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    feed_urls = re.findall(r'href=[\'"]?([^\'" >]+)[\'"]? type=["\'](application/rss\+xml|application/atom\+xml)["\']', html)
-                    
-                    if feed_urls:
-                        feed_url = feed_urls[0][0]
-                        if not feed_url.startswith(('http://', 'https://')):
-                            parsed = urlparse(website_url)
-                            feed_url = f"{parsed.scheme}://{parsed.netloc}{feed_url}"
-                        return feed_url
-
+        if not self._is_valid_url(website_url):
             return None
-            
+
+        try:
+            feed_url = await self._scan_page(website_url)
         except Exception as e:
-            logger.error(f"Error discovering feed URL for {website_url}: {str(e)}")
+            logger.debug(f"Feed discovery scan of {website_url} failed: {str(e)}")
+            feed_url = None
+        if feed_url:
+            return feed_url
+
+        parsed = urlparse(website_url)
+        probes = [
+            asyncio.ensure_future(self._probe_feed_url(f"{parsed.scheme}://{parsed.netloc}{path}"))
+            for path in self.common_feed_paths
+        ]
+        try:
+            for probe in asyncio.as_completed(probes):
+                try:
+                    feed_url = await probe
+                except Exception as e:
+                    logger.debug(f"Feed discovery probe for {website_url} failed: {str(e)}")
+                    continue
+                if feed_url:
+                    return feed_url
             return None
+        finally:
+            for probe in probes:
+                probe.cancel()
+            await asyncio.gather(*probes, return_exceptions=True)
+
+    async def discover_feed_urls(self, website_urls: List[str]) -> Dict[str, Optional[str]]:
+        """Discover feeds for many sites, FEED_DISCOVERY_CONCURRENCY at a time."""
+        semaphore = asyncio.Semaphore(settings.FEED_DISCOVERY_CONCURRENCY)
+
+        async def discover(website_url: str) -> Optional[str]:
+            async with semaphore:
+                return await self.discover_feed_url(website_url)
+
+        unique = list(dict.fromkeys(website_urls))
+        results = await asyncio.gather(*(discover(url) for url in unique))
+        return dict(zip(unique, results))
+
+    def _probe_timeout(self) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(total=settings.FEED_DISCOVERY_TIMEOUT)
+
+    def _is_feed_content_type(self, response) -> bool:
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        return content_type in FEED_CONTENT_TYPES
+
+    async def _read_head(self, response, limit: int = SNIFF_BYTES) -> bytes:
+        """The first limit bytes of a body, without downloading the rest when the server ignores Range."""
+        head = bytearray()
+        async for chunk in response.content.iter_chunked(min(limit, settings.FEED_STREAM_CHUNK_SIZE)):
+            head += chunk
+            if len(head) >= limit:
+                break
+        return bytes(head[:limit])
+
+    async def _probe_feed_url(self, feed_url: str) -> Optional[str]:
+        """HEAD a candidate, falling back to a ranged GET when the headers alone are not conclusive."""
+        async with self.host_limiter.slot(feed_url), \
+                self.session.head(feed_url, allow_redirects=True, timeout=self._probe_timeout()) as response:
+            if response.status == 200 and self._is_feed_content_type(response):
+                return feed_url
+            if response.status in (404, 410):
+                return None
+
+        # Servers that reject HEAD or label feeds text/plain or octet-stream: look at the first bytes
+        headers = {"Range": f"bytes=0-{SNIFF_BYTES - 1}"}
+        async with self.host_limiter.slot(feed_url), \
+                self.session.get(feed_url, headers=headers, timeout=self._probe_timeout()) as response:
+            if response.status not in (200, 206):
+                return None
+            if self._is_feed_content_type(response) or FEED_ROOT.search(await self._read_head(response)):
+                return feed_url
+        return None
+
+    async def _scan_page(self, website_url: str) -> Optional[str]:
+        """The page's first <link rel="alternate"> feed, or the URL itself if it already is a feed."""
+        async with self.host_limiter.slot(website_url), \
+                self.session.get(website_url, timeout=self._probe_timeout()) as response:
+            if response.status != 200:
+                return None
+            if self._is_feed_content_type(response):
+                return website_url
+            body = await self._read_head(response, settings.FEED_MAX_BYTES)
+            if FEED_ROOT.search(body[:SNIFF_BYTES]):
+                return website_url
+            try:
+                html = body.decode(getattr(response, "charset", None) or "utf-8", errors="replace")
+            except LookupError:
+                html = body.decode("utf-8", errors="replace")
+
+        for tag in LINK_TAG.findall(html):
+            # Only one of the quoted, single-quoted and bare value groups matches
+            attrs = {name.lower(): "".join(values) for name, *values in LINK_ATTR.findall(tag)}
+            if "alternate" in attrs.get("rel", "").lower().split() and attrs.get("type", "").lower() in ALTERNATE_TYPES:
+                if attrs.get("href"):
+                    return urljoin(str(response.url), attrs["href"])
+        return None
 
 feed_validator = FeedValidator()
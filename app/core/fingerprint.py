@@ -0,0 +1,86 @@
+# app/core/fingerprint.py
+import hashlib
+import re
+import unicodedata
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid",
+    "igshid", "ref", "ref_src", "cmpid", "ncid", "ocid", "guccounter"
+}
+TRACKING_PREFIXES = ("utm_", "_hs", "mkt_")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Titles shorter than this are too generic ("Weekly update") to identify a story
+MIN_FINGERPRINT_WORDS = 4
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """Normalize an article URL so the same story links compare equal across sources."""
+    if not url:
+        return None
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()[:512]
+    if not parts.scheme or not parts.hostname:
+        return url.strip()[:512]
+
+    scheme = parts.scheme.lower()
+    host = parts.hostname.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    # http and https copies of a story are the same story
+    if scheme == "http":
+        scheme = "https"
+
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))[:512]
+
+def normalize_feed_url(url: str) -> str:
+    """
+    Key for a feed subscription, so the same feed added twice maps to one source.
+
+    Only changes that cannot alter what the server returns are applied: case of
+    scheme and host, default ports, surrounding whitespace and the fragment.
+    """
+    url = str(url).strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url[:512]
+    if not parts.scheme or not parts.hostname:
+        return url[:512]
+
+    scheme = parts.scheme.lower()
+    host = parts.hostname.lower()
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else "")
+        host = f"{credentials}@{host}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))[:512]
+
+def content_fingerprint(title: Optional[str]) -> Optional[str]:
+    """Hash of a normalized title, or None when the title is too short to be distinctive."""
+    if not title:
+        return None
+    text = unicodedata.normalize("NFKD", title)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    words = re.findall(r"\w+", text)
+    if len(words) < MIN_FINGERPRINT_WORDS:
+        return None
+    return hashlib.sha1(" ".join(words).encode("utf-8")).hexdigest()
@@ -0,0 +1,151 @@
+# app/core/host_limiter.py
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class HostThrottled(Exception):
+    """Raised instead of fetching when a host asked us to back off or its budget is spent."""
+
+    def __init__(self, host: str, retry_at: datetime, reason: str):
+        super().__init__(f"{host} throttled ({reason}) until {retry_at.isoformat()}")
+        self.host = host
+        self.retry_at = retry_at
+        self.reason = reason
+
+class HostState:
+    """Token bucket, concurrency cap and counters for one host."""
+
+    def __init__(self, burst: int, max_concurrency: int):
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.blocked_until: Optional[datetime] = None
+        self.stats = {
+            "requests": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "throttled_responses": 0,
+            "deferred": 0,
+            "wait_seconds": 0.0
+        }
+
+class HostLimiter:
+    """
+    Per-host politeness for outbound fetches.
+
+    Each host gets a token bucket (rate requests per second, up to burst at
+    once) and a cap on concurrent requests. A 429 or 503 blocks the host
+    until its Retry-After has passed. A fetch that would wait longer than
+    max_wait raises HostThrottled, so the caller can reschedule it without
+    holding a refresh worker.
+    """
+
+    def __init__(
+        self,
+        rate: float = settings.HOST_RATE_LIMIT,
+        burst: int = settings.HOST_BURST,
+        max_concurrency: int = settings.HOST_MAX_CONCURRENCY,
+        max_wait: float = settings.HOST_MAX_WAIT
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_wait = max_wait
+        self.hosts: Dict[str, HostState] = {}
+
+    def _state(self, host: str) -> HostState:
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = HostState(self.burst, self.max_concurrency)
+        return state
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Wait for this URL's host to allow one more request, and hold its concurrency slot."""
+        host = (urlsplit(url).hostname or "").lower()
+        state = self._state(host)
+
+        now = datetime.utcnow()
+        if state.blocked_until and state.blocked_until > now:
+            state.stats["deferred"] += 1
+            raise HostThrottled(host, state.blocked_until, "retry-after")
+
+        # Reserve a token now; a negative balance is the queue ahead of us
+        clock = time.monotonic()
+        state.tokens = min(self.burst, state.tokens + (clock - state.updated) * self.rate)
+        state.updated = clock
+        wait = max(0.0, (1 - state.tokens) / self.rate)
+        if wait > self.max_wait:
+            state.stats["deferred"] += 1
+            raise HostThrottled(host, now + timedelta(seconds=wait), "rate")
+        state.tokens -= 1
+
+        started = time.monotonic()
+        if wait:
+            await asyncio.sleep(wait)
+        async with state.semaphore:
+            state.stats["wait_seconds"] += time.monotonic() - started
+            state.stats["requests"] += 1
+            state.stats["in_flight"] += 1
+            state.stats["peak_in_flight"] = max(state.stats["peak_in_flight"], state.stats["in_flight"])
+            try:
+                yield
+            finally:
+                state.stats["in_flight"] -= 1
+
+    def throttled(self, url: str, status: int, retry_after: Optional[str]) -> HostThrottled:
+        """Record a 429/503 and block the host until Retry-After; returns the error for the caller to raise."""
+        host = (urlsplit(url).hostname or "").lower()
+        state = self._state(host)
+        retry_at = datetime.utcnow() + timedelta(seconds=self._retry_after_seconds(retry_after))
+        state.stats["throttled_responses"] += 1
+        if not state.blocked_until or retry_at > state.blocked_until:
+            logger.warning(f"Host {host} answered {status}; pausing fetches until {retry_at.isoformat()}")
+            state.blocked_until = retry_at
+        return HostThrottled(host, state.blocked_until, str(status))
+
+    def _retry_after_seconds(self, retry_after: Optional[str]) -> float:
+        """Retry-After as delta-seconds or an HTTP date, clamped to a sane range."""
+        seconds = float(settings.HOST_DEFAULT_RETRY_AFTER)
+        if retry_after:
+            try:
+                seconds = float(retry_after)
+            except ValueError:
+                try:
+                    when = parsedate_to_datetime(retry_after)
+                    seconds = (when.replace(tzinfo=None) - datetime.utcnow()).total_seconds()
+                except (TypeError, ValueError):
+                    pass
+        return min(max(seconds, 1.0), settings.HOST_MAX_RETRY_AFTER)
+
+    def get_stats(self, limit: int = 50) -> Dict[str, Any]:
+        """Per-host counters, busiest first by time spent waiting for the host."""
+        now = datetime.utcnow()
+        hosts: List[Dict[str, Any]] = []
+        for host, state in self.hosts.items():
+            blocked = state.blocked_until if state.blocked_until and state.blocked_until > now else None
+            hosts.append({
+                "host": host,
+                **state.stats,
+                "wait_seconds": round(state.stats["wait_seconds"], 2),
+                "blocked_until": blocked.isoformat() if blocked else None
+            })
+        hosts.sort(key=lambda item: (item["wait_seconds"], item["deferred"]), reverse=True)
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_concurrency": self.max_concurrency,
+            "hosts_tracked": len(hosts),
+            "hosts": hosts[:limit]
+        }
+
+host_limiter = HostLimiter()
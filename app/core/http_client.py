@@ -0,0 +1,128 @@
+# app/core/http_client.py
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# aiohttp decodes br only when a Brotli binding is installed, so only advertise it then
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+class HTTPClient:
+    """App-scoped aiohttp session shared by every outbound fetch."""
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {
+            "requests": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "errors": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0
+        }
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.stats["in_flight"])
+
+        async def on_request_end(session, ctx, params):
+            self.stats["in_flight"] -= 1
+
+        async def on_request_exception(session, ctx, params):
+            self.stats["in_flight"] -= 1
+            self.stats["errors"] += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_create_end.append(self._counter("connections_created"))
+        trace.on_connection_reuseconn.append(self._counter("connections_reused"))
+        trace.on_dns_cache_hit.append(self._counter("dns_cache_hits"))
+        trace.on_dns_cache_miss.append(self._counter("dns_cache_misses"))
+        return trace
+
+    def _counter(self, name: str):
+        async def handler(session, ctx, params):
+            self.stats[name] += 1
+        return handler
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=settings.HTTP_TOTAL_TIMEOUT,
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            sock_read=settings.HTTP_READ_TIMEOUT
+        )
+        self._loop = asyncio.get_running_loop()
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={
+                "User-Agent": f"{settings.PROJECT_NAME}/{settings.VERSION}",
+                "Accept-Encoding": ACCEPT_ENCODING
+            },
+            trace_configs=[self._trace_config()]
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The shared session, created on first use if the app has not started it."""
+        if (
+            self._session is None
+            or self._session.closed
+            or self._loop is not asyncio.get_running_loop()
+        ):
+            self._session = self._create_session()
+        return self._session
+
+    async def start(self) -> None:
+        """Open the shared session; called from the app's startup hook."""
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        logger.info("Shared HTTP client started")
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        logger.info("Shared HTTP client closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Request and connection-pool counters for this worker."""
+        stats = dict(self.stats)
+        stats["limit"] = settings.HTTP_POOL_LIMIT
+        stats["limit_per_host"] = settings.HTTP_POOL_LIMIT_PER_HOST
+
+        connector = self._session.connector if self._session is not None else None
+        if connector is not None:
+            # aiohttp does not expose pool occupancy publicly
+            stats["connections_in_use"] = len(getattr(connector, "_acquired", ()))
+            stats["connections_idle"] = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+        return stats
+
+http_client = HTTPClient()
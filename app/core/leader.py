@@ -0,0 +1,180 @@
+# app/core/leader.py
+import logging
+import os
+import socket
+import time
+import uuid
+import zlib
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.redis_cache import cache
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Only the holder may extend or drop the lease
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+class LeaderElector:
+    """
+    Elects one worker per deployment to own a background job.
+
+    Uses a Redis lease (SET NX PX, renewed by the holder) when Redis is
+    available, else a Postgres session advisory lock held on a dedicated
+    connection. Either way a dead leader loses the role on its own: the lease
+    expires, or the database drops the lock with the connection. Without
+    Redis or Postgres (local development) the single process always leads.
+    """
+
+    def __init__(self, name: str, ttl: int = settings.LEADER_LEASE_TTL):
+        self.name = name
+        self.key = f"leader:{name}"
+        self.ttl = ttl
+        self.renew_interval = max(ttl / 3, 1)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self.acquired_at: Optional[float] = None
+        self._lease_value: Optional[str] = None
+        self._lock_connection = None
+
+    @property
+    def backend(self) -> str:
+        if cache.client is not None:
+            return "redis"
+        if engine.dialect.name == "postgresql":
+            return "postgres"
+        return "local"
+
+    def try_acquire(self) -> bool:
+        """Take the role if nobody holds it, or keep it if we already do. Returns whether we lead."""
+        try:
+            held = getattr(self, f"_acquire_{self.backend}")()
+        except Exception as e:
+            logger.error(f"Leader election for {self.name} failed: {str(e)}")
+            held = False
+
+        if held and not self.is_leader:
+            self.acquired_at = time.time()
+            logger.info(f"Worker {self.worker_id} became leader for {self.name} via {self.backend}")
+        elif not held and self.is_leader:
+            logger.warning(f"Worker {self.worker_id} lost leadership for {self.name}")
+            self.acquired_at = None
+        self.is_leader = held
+        return held
+
+    def release(self) -> None:
+        if not self.is_leader:
+            return
+        try:
+            if self._lease_value is not None and cache.client is not None:
+                cache.client.eval(RELEASE_SCRIPT, 1, self.key, self._lease_value)
+            if self._lock_connection is not None:
+                # Drop the connection rather than pooling it, so the session lock goes with it
+                self._lock_connection.invalidate()
+                self._lock_connection.close()
+        except Exception as e:
+            logger.error(f"Error releasing leadership for {self.name}: {str(e)}")
+        finally:
+            self._lease_value = None
+            self._lock_connection = None
+            self.is_leader = False
+            self.acquired_at = None
+            logger.info(f"Worker {self.worker_id} released leadership for {self.name}")
+
+    def _acquire_redis(self) -> bool:
+        ttl_ms = int(self.ttl * 1000)
+        if self._lease_value is not None:
+            if cache.client.eval(RENEW_SCRIPT, 1, self.key, self._lease_value, ttl_ms):
+                return True
+            self._lease_value = None
+
+        # The value records who holds the lease and since when, for the status endpoint
+        value = f"{self.worker_id}|{time.time():.3f}"
+        if cache.client.set(self.key, value, nx=True, px=ttl_ms):
+            self._lease_value = value
+            return True
+        return False
+
+    def _acquire_postgres(self) -> bool:
+        if self._lock_connection is not None:
+            try:
+                self._lock_connection.execute(text("SELECT 1"))
+                return True
+            except Exception:
+                # The connection died, and the database released the lock with it
+                self._lock_connection = None
+
+        connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            connection.execute(text("SELECT set_config('application_name', :name, false)"), {"name": self.worker_id[:63]})
+            locked = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self._advisory_key()}).scalar()
+        except Exception:
+            connection.invalidate()
+            connection.close()
+            raise
+        if not locked:
+            connection.invalidate()
+            connection.close()
+            return False
+        self._lock_connection = connection
+        return True
+
+    def _acquire_local(self) -> bool:
+        return True
+
+    def _advisory_key(self) -> int:
+        return zlib.crc32(self.key.encode("utf-8"))
+
+    def status(self) -> Dict[str, Any]:
+        """Who currently leads, and for how long, as seen from this worker."""
+        status = {
+            "name": self.name,
+            "backend": self.backend,
+            "worker_id": self.worker_id,
+            "is_leader": self.is_leader,
+            "leader": None,
+            "lease_age_seconds": None,
+            "lease_expires_in_seconds": None,
+        }
+        try:
+            if status["backend"] == "redis":
+                value = cache.client.get(self.key)
+                if value:
+                    value = value.decode("utf-8") if isinstance(value, bytes) else value
+                    leader, _, acquired = value.rpartition("|")
+                    status["leader"] = leader
+                    status["lease_age_seconds"] = round(time.time() - float(acquired), 1)
+                    status["lease_expires_in_seconds"] = round(cache.client.pttl(self.key) / 1000, 1)
+            elif status["backend"] == "postgres":
+                with engine.connect() as connection:
+                    row = connection.execute(text(
+                        "SELECT a.application_name, EXTRACT(EPOCH FROM now() - a.backend_start) "
+                        "FROM pg_locks l JOIN pg_stat_activity a ON a.pid = l.pid "
+                        "WHERE l.locktype = 'advisory' AND l.granted "
+                        "AND ((l.classid::bigint << 32) | l.objid::bigint) = :key"
+                    ), {"key": self._advisory_key()}).first()
+                if row:
+                    status["leader"] = row[0]
+                    status["lease_age_seconds"] = round(float(row[1]), 1)
+            elif self.is_leader:
+                status["leader"] = self.worker_id
+        except Exception as e:
+            logger.error(f"Error reading leader status for {self.name}: {str(e)}")
+
+        if status["leader"] == self.worker_id and self.acquired_at and status["lease_age_seconds"] is None:
+            status["lease_age_seconds"] = round(time.time() - self.acquired_at, 1)
+        return status
@@ -0,0 +1,77 @@
+# app/core/opml.py
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, Iterator, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from app.core.fingerprint import normalize_feed_url
+
+class OPMLError(Exception):
+    """The upload is not an OPML document we can read."""
+    pass
+
+def parse_opml(data: bytes) -> List[Dict[str, Optional[str]]]:
+    """
+    The feed outlines of an OPML document, each once, in document order.
+
+    Outlines nest arbitrarily; a feed's category is the text of the nearest
+    enclosing outline that is not a feed itself, or its own category attribute.
+    """
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError as e:
+        raise OPMLError(f"Invalid OPML: {str(e)}")
+    body = root.find("body")
+    if root.tag != "opml" or body is None:
+        raise OPMLError("Invalid OPML: missing <opml> or <body>")
+
+    outlines: List[Dict[str, Optional[str]]] = []
+    seen = set()
+
+    def walk(element: ET.Element, category: Optional[str]) -> None:
+        for outline in element.findall("outline"):
+            url = (outline.get("xmlUrl") or "").strip()
+            title = (outline.get("title") or outline.get("text") or "").strip() or None
+            if not url:
+                walk(outline, title or category)
+                continue
+            key = normalize_feed_url(url)
+            if key in seen:
+                continue
+            seen.add(key)
+            outlines.append({
+                "url": url,
+                "title": title,
+                "html_url": outline.get("htmlUrl"),
+                "category": (outline.get("category") or "").strip().strip("/") or category,
+            })
+
+    walk(body, None)
+    return outlines
+
+def iter_opml(feeds: Iterable, title: str = "Subscriptions") -> Iterator[str]:
+    """
+    Stream an OPML document for feeds ordered by category, one outline per chunk.
+
+    Feeds need name, url and category attributes; feeds sharing a category
+    are nested under one outline for it.
+    """
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<opml version="2.0">\n'
+        f"  <head><title>{escape(title)}</title></head>\n  <body>\n"
+    )
+    current: Optional[str] = None
+    for feed in feeds:
+        if feed.category != current:
+            if current is not None:
+                yield "    </outline>\n"
+            current = feed.category
+            if current is not None:
+                yield f"    <outline text={quoteattr(current)}>\n"
+        indent = "      " if current is not None else "    "
+        yield (
+            f"{indent}<outline type=\"rss\" text={quoteattr(feed.name)} "
+            f"title={quoteattr(feed.name)} xmlUrl={quoteattr(feed.url)}/>\n"
+        )
+    if current is not None:
+        yield "    </outline>\n"
+    yield "  </body>\n</opml>\n"
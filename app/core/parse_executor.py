@@ -0,0 +1,139 @@
+# app/core/parse_executor.py
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Union
+
+import feedparser
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def _plain(items) -> List[Dict[str, Any]]:
+    """Turn a list of FeedParserDicts into plain, picklable dicts."""
+    return [{key: value for key, value in dict(item).items() if isinstance(value, (str, int, float))} for item in items or []]
+
+def _time_tuple(value) -> Optional[List[int]]:
+    return list(value) if value else None
+
+def _compact_entry(entry) -> Dict[str, Any]:
+    """Keep only the entry fields the app reads."""
+    content = entry.get("content") or [{}]
+    compact = {
+        "id": entry.get("id", ""),
+        "title": entry.get("title", ""),
+        "link": entry.get("link", ""),
+        "summary": entry.get("summary", ""),
+        "content": content[0].get("value", ""),
+        "author": entry.get("author", ""),
+        "published": entry.get("published", ""),
+        "published_parsed": _time_tuple(entry.get("published_parsed")),
+        "updated_parsed": _time_tuple(entry.get("updated_parsed")),
+        "tags": [tag.get("term", "") for tag in entry.get("tags", [])],
+    }
+
+    # Media fields are only present when the feed provides them
+    for key in ("media_content", "media_thumbnail", "enclosures"):
+        if entry.get(key):
+            compact[key] = _plain(entry.get(key))
+    if entry.get("yt_videoid"):
+        compact["yt_videoid"] = entry.get("yt_videoid")
+    if entry.get("media_statistics"):
+        compact["media_statistics"] = dict(entry.get("media_statistics"))
+    return compact
+
+def feed_headers(response, location: Optional[str] = None) -> Dict[str, str]:
+    """
+    The response headers feedparser needs alongside raw bytes.
+
+    Content-Type carries the declared charset, which feedparser weighs against
+    the XML declaration itself; Content-Location (the response URL unless
+    location is given) resolves relative links.
+    """
+    headers = {}
+    for name in ("Content-Type", "Content-Language"):
+        value = response.headers.get(name)
+        if value:
+            headers[name.lower()] = value
+    headers["content-location"] = str(location or response.url)
+    return headers
+
+def parse_feed(content: Union[str, bytes], response_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Parse feed content with feedparser and return a compact, picklable dict.
+
+    Pass the body as bytes with feed_headers() rather than decoded text:
+    feedparser detects the encoding itself, so decoding first only costs a
+    second pass and can pick the wrong charset. Runs inside the parse
+    executor, so it must stay a module-level function.
+    """
+    feed = feedparser.parse(content, response_headers=response_headers)
+    channel = feed.get("feed", {})
+
+    return {
+        "bozo": bool(feed.get("bozo")),
+        "bozo_exception": str(feed.get("bozo_exception")) if feed.get("bozo_exception") else None,
+        "version": feed.get("version", ""),
+        "feed": {
+            "title": channel.get("title", ""),
+            "link": channel.get("link", ""),
+            "description": channel.get("description", ""),
+            "language": channel.get("language", ""),
+            "updated": channel.get("updated", ""),
+            "author": channel.get("author", ""),
+            "generator": channel.get("generator", ""),
+            "links": [
+                {"href": link.get("href", ""), "rel": link.get("rel", ""), "type": link.get("type", "")}
+                for link in channel.get("links", [])
+            ],
+            "image": channel.get("image", {}).get("href", "") if "image" in channel else "",
+        },
+        "entries": [_compact_entry(entry) for entry in feed.get("entries", [])],
+    }
+
+class ParseExecutor:
+    """Runs feedparser off the event loop on a shared process or thread pool."""
+
+    def __init__(self, mode: Optional[str] = None, max_workers: Optional[int] = None, timeout: Optional[float] = None):
+        self.mode = mode or settings.FEED_PARSE_EXECUTOR
+        self.max_workers = max_workers or settings.FEED_PARSE_WORKERS
+        self.timeout = timeout or settings.FEED_PARSE_TIMEOUT
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                # Spawned workers never inherit the event loop or open sockets
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="feed-parse"
+                )
+        return self._executor
+
+    async def parse(self, content: Union[str, bytes], response_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Parse feed content off-loop, raising asyncio.TimeoutError if it takes too long."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._get_executor(), parse_feed, content, response_headers),
+                self.timeout
+            )
+        except BrokenProcessPool:
+            logger.error("Feed parse pool died; recreating it")
+            self._executor = None
+            raise
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+parse_executor = ParseExecutor()
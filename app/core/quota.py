@@ -0,0 +1,81 @@
+# app/core/quota.py
+import logging
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.redis_cache import cache
+
+logger = logging.getLogger(__name__)
+
+class QuotaPlanner:
+    """
+    Daily request budget for a paid news API, shared by every worker.
+
+    Requests are counted per UTC day in Redis, or in memory without it.
+    plan() releases the budget in hourly slices and splits what is available
+    round-robin across queries, so one early run cannot spend the whole day.
+    """
+
+    def __init__(self, name: str, daily_quota: int, max_pages_per_query: int):
+        self.name = name
+        self.daily_quota = daily_quota
+        self.max_pages_per_query = max_pages_per_query
+        self._local: Dict[str, int] = {}
+
+    def _key(self, now: datetime) -> str:
+        return f"quota:{self.name}:{now:%Y%m%d}"
+
+    def used(self, now: Optional[datetime] = None) -> int:
+        key = self._key(now or datetime.utcnow())
+        if cache.client is not None:
+            try:
+                return int(cache.client.get(key) or 0)
+            except Exception as e:
+                logger.error(f"Error reading {self.name} quota: {str(e)}")
+        return self._local.get(key, 0)
+
+    def remaining(self, now: Optional[datetime] = None) -> int:
+        return max(0, self.daily_quota - self.used(now))
+
+    def try_spend(self, now: Optional[datetime] = None) -> bool:
+        """Count one request against today's quota, or refuse if it is spent."""
+        key = self._key(now or datetime.utcnow())
+        if cache.client is not None:
+            try:
+                count = cache.client.incr(key)
+                if count == 1:
+                    cache.client.expire(key, 2 * 86400)
+                if count > self.daily_quota:
+                    cache.client.decr(key)
+                    return False
+                return True
+            except Exception as e:
+                logger.error(f"Error spending {self.name} quota: {str(e)}")
+
+        count = self._local.get(key, 0)
+        if count >= self.daily_quota:
+            return False
+        self._local[key] = count + 1
+        return True
+
+    def plan(self, queries: List[str], now: Optional[datetime] = None) -> Dict[str, int]:
+        """Pages each query may request in this run."""
+        now = now or datetime.utcnow()
+        released = math.ceil(self.daily_quota * (now.hour + 1) / 24)
+        available = max(0, released - self.used(now))
+
+        pages = {query: 0 for query in queries}
+        # Every query gets its first page before any query gets a second
+        for i in range(min(available, len(queries) * self.max_pages_per_query)):
+            pages[queries[i % len(queries)]] += 1
+        return pages
+
+    def get_stats(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        used = self.used(now)
+        return {
+            "name": self.name,
+            "daily_quota": self.daily_quota,
+            "used": used,
+            "remaining": max(0, self.daily_quota - used)
+        }
@@ -0,0 +1,118 @@
+# app/core/refresh_engine.py
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+class RefreshEngine:
+    """Drains a queue of due feeds with a fixed pool of concurrent workers."""
+
+    def __init__(self, workers: Optional[int] = None, fetch_timeout: Optional[float] = None):
+        self.workers = workers or settings.FEED_REFRESH_WORKERS
+        self.fetch_timeout = fetch_timeout or settings.FEED_FETCH_TIMEOUT
+
+    async def run_cycle(
+        self,
+        items: Iterable[Any],
+        handler: Callable[[Any], Awaitable[Optional[Dict[str, int]]]],
+        should_stop: Optional[Callable[[], bool]] = None,
+        on_timeout: Optional[Callable[[Any], Optional[Dict[str, int]]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run ``handler`` over every item with at most ``self.workers`` in flight.
+
+        Each call is bounded by ``fetch_timeout`` so one slow feed only ties up
+        a single worker. A handler may return a dict of counters, which are
+        summed into the cycle stats; so may ``on_timeout``, called with the item
+        whose handler was cut off.
+        """
+        items = list(items)
+        pending = iter(items)
+
+        async def next_item() -> Optional[Any]:
+            return next(pending, None)
+
+        return await self.run_queue(
+            next_item, handler, should_stop, on_timeout, workers=min(self.workers, len(items))
+        )
+
+    async def run_queue(
+        self,
+        next_item: Callable[[], Awaitable[Optional[Any]]],
+        handler: Callable[[Any], Awaitable[Optional[Dict[str, int]]]],
+        should_stop: Optional[Callable[[], bool]] = None,
+        on_timeout: Optional[Callable[[Any], Optional[Dict[str, int]]]] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Like run_cycle, but each worker takes its next item from ``next_item``
+        as soon as it is free, until that returns None.
+
+        A slow item holds back only the worker running it; the others keep
+        pulling work instead of waiting for a whole batch to finish.
+        """
+        workers = self.workers if workers is None else workers
+        latencies: List[float] = []
+        counters = {"succeeded": 0, "failed": 0, "timed_out": 0}
+        extra: Dict[str, int] = {}
+        started = time.perf_counter()
+
+        async def worker():
+            while not (should_stop and should_stop()):
+                item = await next_item()
+                if item is None:
+                    return
+
+                item_started = time.perf_counter()
+                result = None
+                try:
+                    result = await asyncio.wait_for(handler(item), self.fetch_timeout)
+                    counters["succeeded"] += 1
+                except asyncio.TimeoutError:
+                    counters["timed_out"] += 1
+                    logger.warning(f"Refresh of {item!r} timed out after {self.fetch_timeout}s")
+                    if on_timeout:
+                        result = on_timeout(item)
+                except Exception as e:
+                    counters["failed"] += 1
+                    logger.error(f"Error refreshing {item!r}: {str(e)}")
+                finally:
+                    latencies.append(time.perf_counter() - item_started)
+
+                if isinstance(result, dict):
+                    for key, value in result.items():
+                        extra[key] = extra.get(key, 0) + value
+
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        duration = time.perf_counter() - started
+        latencies.sort()
+        return {
+            "feeds": len(latencies),
+            "processed": len(latencies),
+            **counters,
+            **extra,
+            "workers": workers,
+            "duration_seconds": round(duration, 3),
+            "feeds_per_second": round(len(latencies) / duration, 2) if duration > 0 else 0.0,
+            "p50_latency_ms": round(_percentile(latencies, 50) * 1000, 1),
+            "p95_latency_ms": round(_percentile(latencies, 95) * 1000, 1),
+        }
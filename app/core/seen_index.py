@@ -0,0 +1,77 @@
+# app/core/seen_index.py
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.feed_ingest import entry_guid
+
+def _digest(value: str) -> str:
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=6).hexdigest()
+
+class SeenIndex:
+    """
+    The entries of one feed source that are already stored, and their content.
+
+    Maps a short hash of each entry's guid to a short hash of the fields the
+    upsert writes, so unchanged entries are dropped before they reach the
+    database. The index keeps the newest `capacity` entries; once it is full,
+    unseen entries older than the high-water mark (the newest published date
+    ingested) are taken to be ones that aged out of the index, not news.
+    """
+
+    def __init__(
+        self,
+        entries: Optional[Dict[str, str]] = None,
+        high_water_mark: Optional[datetime] = None,
+        capacity: int = settings.FEED_SEEN_INDEX_SIZE
+    ):
+        self.entries: Dict[str, str] = dict(entries or {})
+        self.high_water_mark = high_water_mark
+        self.capacity = capacity
+        self.changed = False
+
+    @classmethod
+    def for_source(cls, source) -> "SeenIndex":
+        return cls(source.seen_entries, source.high_water_mark)
+
+    def _key(self, entry: Dict[str, Any]) -> str:
+        return _digest(entry_guid(entry))
+
+    def _content(self, entry: Dict[str, Any]) -> str:
+        return _digest(f"{entry.get('title') or ''}\x1f{entry.get('content') or ''}\x1f{entry.get('url') or ''}")
+
+    def select(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """The entries that are new or changed since they were recorded."""
+        full = len(self.entries) >= self.capacity
+        selected = []
+        for entry in entries:
+            seen = self.entries.get(self._key(entry))
+            if seen == self._content(entry):
+                continue
+            published = entry.get("published_date")
+            if (
+                seen is None and full and self.high_water_mark
+                and published and published < self.high_water_mark
+            ):
+                continue
+            selected.append(entry)
+        return selected
+
+    def record(self, entries: List[Dict[str, Any]]) -> None:
+        """Remember entries that were written, evicting the least recently recorded beyond capacity."""
+        for entry in entries:
+            key = self._key(entry)
+            # Re-inserting moves the key to the newest end
+            self.entries.pop(key, None)
+            self.entries[key] = self._content(entry)
+            published = entry.get("published_date")
+            if published and (self.high_water_mark is None or published > self.high_water_mark):
+                self.high_water_mark = published
+        for key in list(self.entries)[:max(0, len(self.entries) - self.capacity)]:
+            del self.entries[key]
+        self.changed = self.changed or bool(entries)
+
+    def values(self) -> Dict[str, Any]:
+        """Column values to persist on the FeedSource."""
+        return {"seen_entries": self.entries, "high_water_mark": self.high_water_mark}
@@ -0,0 +1,169 @@
+# app/core/single_flight.py
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.leader import RELEASE_SCRIPT
+from app.core.redis_cache import cache
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """
+    Coalesces concurrent runs of the same job into one, across every worker.
+
+    Within a process callers share one future. Across processes the runner
+    holds a Redis lock (SET NX PX) for the key and publishes its result under
+    a short-lived key, which callers in other workers poll for. Without Redis
+    only the in-process coalescing applies.
+    """
+
+    def __init__(self, name: str, lock_ttl: float, result_ttl: int = 60, poll_interval: float = 0.2):
+        self.name = name
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.inflight: Dict[Any, asyncio.Future] = {}
+        # Results of recent runs in this process, for callers that show up just after one finished
+        self.recent: Dict[Any, Tuple[float, Any]] = {}
+        self.stats = {"runs": 0, "shared_local": 0, "shared_remote": 0}
+
+    def _lock_key(self, key: Any) -> str:
+        return f"singleflight:{self.name}:{key}"
+
+    def _result_key(self, key: Any) -> str:
+        return f"singleflight:{self.name}:{key}:result"
+
+    async def run(self, key: Any, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` unless a run for ``key`` is already in flight, and return that run's result instead."""
+        if key in self.inflight:
+            self.stats["shared_local"] += 1
+            return await asyncio.shield(self.inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            result = await self._run(key, fn)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Callers sharing a run that was cut off get no result, not a cancellation of their own
+            future.set_result(None)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting; don't let the loop warn about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            del self.inflight[key]
+
+    async def wait(self, key: Any, since: float, timeout: float) -> Optional[Any]:
+        """The result of the first run for ``key`` finishing after ``since``, or None if none does in time."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if key in self.inflight:
+                try:
+                    return await asyncio.wait_for(asyncio.shield(self.inflight[key]), remaining)
+                except asyncio.TimeoutError:
+                    return None
+            found, result = self._read_result(key, since)
+            if found:
+                return result
+            await asyncio.sleep(min(self.poll_interval, remaining))
+
+    async def _poll(self, key: Any, since: float, timeout: float, while_locked: bool = False) -> Optional[Any]:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            found, result = self._read_result(key, since)
+            if found:
+                return result
+            if while_locked and not self._locked(key):
+                # The holder publishes before it unlocks, so no result now means it failed
+                return self._read_result(key, since)[1]
+            await asyncio.sleep(self.poll_interval)
+        return None
+
+    async def _run(self, key: Any, fn: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.time()
+        token = self._acquire(key)
+        if token is None:
+            # Another worker is running it; share its result rather than repeat the work
+            self.stats["shared_remote"] += 1
+            return await self._poll(key, started, self.lock_ttl, while_locked=True)
+
+        self.stats["runs"] += 1
+        try:
+            result = await fn()
+            self._publish(key, result)
+            return result
+        finally:
+            self._release(key, token)
+
+    def _acquire(self, key: Any) -> Optional[str]:
+        token = uuid.uuid4().hex
+        if cache.client is None:
+            return token
+        try:
+            if cache.client.set(self._lock_key(key), token, nx=True, px=int(self.lock_ttl * 1000)):
+                return token
+            return None
+        except Exception as e:
+            # Without the shared lock we may duplicate work, which beats not doing it
+            logger.error(f"Single-flight lock for {self._lock_key(key)} failed: {str(e)}")
+            return token
+
+    def _locked(self, key: Any) -> bool:
+        try:
+            return bool(cache.client.exists(self._lock_key(key)))
+        except Exception as e:
+            logger.error(f"Error checking single-flight lock {self._lock_key(key)}: {str(e)}")
+            return False
+
+    def _release(self, key: Any, token: str) -> None:
+        if cache.client is None:
+            return
+        try:
+            cache.client.eval(RELEASE_SCRIPT, 1, self._lock_key(key), token)
+        except Exception as e:
+            logger.error(f"Error releasing single-flight lock {self._lock_key(key)}: {str(e)}")
+
+    def _publish(self, key: Any, result: Any) -> None:
+        now = time.time()
+        self.recent = {k: v for k, v in self.recent.items() if now - v[0] < self.result_ttl}
+        self.recent[key] = (now, result)
+        if cache.client is None:
+            return
+        try:
+            cache.client.setex(
+                self._result_key(key), self.result_ttl,
+                json.dumps({"finished_at": now, "result": result}, default=str)
+            )
+        except Exception as e:
+            logger.error(f"Error publishing single-flight result {self._result_key(key)}: {str(e)}")
+
+    def _read_result(self, key: Any, since: float) -> Tuple[bool, Any]:
+        if key in self.recent and self.recent[key][0] >= since:
+            return True, self.recent[key][1]
+        if cache.client is None:
+            return False, None
+        try:
+            value = cache.client.get(self._result_key(key))
+        except Exception as e:
+            logger.error(f"Error reading single-flight result {self._result_key(key)}: {str(e)}")
+            return False, None
+        if not value:
+            return False, None
+        payload = json.loads(value)
+        if payload["finished_at"] < since:
+            return False, None
+        return True, payload["result"]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "in_flight": len(self.inflight)}
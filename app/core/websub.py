@@ -0,0 +1,233 @@
+# app/core/websub.py
+import hmac
+import logging
+import secrets
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.http_client import http_client
+from app.db.session import get_db
+from app.models.feed import Feed
+from app.models.feed_source import FeedSource
+from app.models.websub_subscription import WebSubSubscription
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_METHODS = {"sha1", "sha256", "sha384", "sha512"}
+
+class WebSubManager:
+    """
+    Subscribes hub-enabled feed sources to their WebSub hub.
+
+    The hub verifies intent by calling our callback with a challenge, then
+    POSTs new feed content to it, signed with the subscription's secret.
+    Sources with an active subscription are only polled as a daily safety
+    net. WebSub stays off until WEBSUB_CALLBACK_BASE_URL is set, because the
+    hub must be able to reach the callback.
+    """
+
+    def __init__(
+        self,
+        callback_base_url: Optional[str] = settings.WEBSUB_CALLBACK_BASE_URL,
+        lease_seconds: int = settings.WEBSUB_LEASE_SECONDS,
+        renew_margin: int = settings.WEBSUB_RENEW_MARGIN
+    ):
+        self.callback_base_url = callback_base_url.rstrip("/") if callback_base_url else None
+        self.lease_seconds = lease_seconds
+        self.renew_margin = renew_margin
+        self.session = None
+        self.stats = {
+            "subscribe_requests": 0,
+            "subscribe_failures": 0,
+            "verified": 0,
+            "denied": 0,
+            "pushes": 0,
+            "bad_signatures": 0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.callback_base_url)
+
+    def callback_url(self, callback_token: str) -> str:
+        return f"{self.callback_base_url}/api/v1/websub/callback/{callback_token}"
+
+    def is_active(self, subscription: Optional[WebSubSubscription], now: datetime) -> bool:
+        """Whether the hub currently pushes this source, so polling can back off."""
+        return (
+            subscription is not None
+            and subscription.state == "active"
+            and subscription.expires_at is not None
+            and subscription.expires_at > now
+        )
+
+    async def subscribe(self, source_id: int, hub_url: str, topic_url: str) -> bool:
+        """
+        Ask the hub to push a source, creating or renewing its subscription.
+
+        The hub answers 202 and confirms later through the callback, so a
+        successful request leaves the subscription pending until verify().
+        """
+        if not self.enabled:
+            return False
+
+        db = next(get_db())
+        try:
+            subscription = (
+                db.query(WebSubSubscription)
+                .filter(WebSubSubscription.feed_source_id == source_id)
+                .first()
+            )
+            if subscription is None:
+                subscription = WebSubSubscription(
+                    feed_source_id=source_id,
+                    secret=secrets.token_hex(20),
+                    callback_token=secrets.token_urlsafe(32)
+                )
+                db.add(subscription)
+            subscription.hub_url = hub_url[:512]
+            subscription.topic_url = topic_url[:512]
+            subscription.pending_mode = "subscribe"
+            if subscription.state != "active":
+                subscription.state = "pending"
+            db.commit()
+            subscription_id, secret, callback_token = subscription.id, subscription.secret, subscription.callback_token
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error saving WebSub subscription for feed source {source_id}: {str(e)}")
+            return False
+        finally:
+            db.close()
+
+        self.stats["subscribe_requests"] += 1
+        error = None
+        try:
+            session = self.session or http_client.session
+            async with session.post(hub_url, data={
+                "hub.callback": self.callback_url(callback_token),
+                "hub.mode": "subscribe",
+                "hub.topic": topic_url,
+                "hub.secret": secret,
+                "hub.lease_seconds": str(self.lease_seconds)
+            }) as response:
+                if response.status not in (202, 204):
+                    error = f"Hub answered HTTP {response.status}"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+
+        if error is None:
+            logger.info(f"Requested WebSub subscription to {topic_url} from {hub_url}")
+            return True
+
+        self.stats["subscribe_failures"] += 1
+        logger.warning(f"WebSub subscription to {topic_url} failed: {error}")
+        self._set_state(subscription_id, "failed", error)
+        return False
+
+    def verify(
+        self,
+        db: Session,
+        subscription: WebSubSubscription,
+        mode: str,
+        topic: str,
+        lease_seconds: Optional[int] = None
+    ) -> bool:
+        """
+        Confirm or record the hub's answer to a subscription request. Returns whether to echo the challenge.
+
+        Only a request we made and the hub has not answered yet can be
+        confirmed: subscribe while one is pending (first time or renewal),
+        unsubscribe never, since we let unused subscriptions lapse.
+        """
+        if topic != subscription.topic_url:
+            return False
+        if mode in ("subscribe", "unsubscribe") and subscription.pending_mode != mode:
+            return False
+
+        now = datetime.utcnow()
+        if mode == "subscribe":
+            lease = lease_seconds or self.lease_seconds
+            subscription.state = "active"
+            subscription.lease_seconds = lease
+            subscription.expires_at = now + timedelta(seconds=lease)
+            subscription.last_error = None
+            subscription.pending_mode = None
+            # Pushes deliver new entries from now on; polling only checks the hub is still delivering
+            db.query(FeedSource).filter(FeedSource.id == subscription.feed_source_id).update(
+                {"next_fetch_at": now + timedelta(seconds=settings.WEBSUB_FALLBACK_POLL_INTERVAL)},
+                synchronize_session=False
+            )
+            self.stats["verified"] += 1
+            logger.info(f"WebSub subscription to {topic} verified for {lease}s")
+        elif mode == "denied":
+            subscription.state = "denied"
+            subscription.expires_at = None
+            subscription.pending_mode = None
+            self.stats["denied"] += 1
+            logger.warning(f"WebSub hub {subscription.hub_url} denied subscription to {topic}")
+        else:
+            return False
+        db.commit()
+        return True
+
+    def verify_signature(self, subscription: WebSubSubscription, body: bytes, signature: Optional[str]) -> bool:
+        """Check X-Hub-Signature ("method=hexdigest") against the subscription's secret."""
+        method, _, digest = (signature or "").partition("=")
+        if method not in SIGNATURE_METHODS or not digest:
+            self.stats["bad_signatures"] += 1
+            return False
+        expected = hmac.new(subscription.secret.encode("utf-8"), body, method).hexdigest()
+        if not hmac.compare_digest(expected, digest.lower()):
+            self.stats["bad_signatures"] += 1
+            return False
+        return True
+
+    async def renew_expiring(self, now: Optional[datetime] = None) -> int:
+        """Resubscribe active subscriptions nearing expiry whose source still has subscribers."""
+        if not self.enabled:
+            return 0
+        now = now or datetime.utcnow()
+        db = next(get_db())
+        try:
+            expiring = [
+                (subscription.feed_source_id, subscription.hub_url, subscription.topic_url)
+                for subscription in (
+                    db.query(WebSubSubscription)
+                    .filter(
+                        WebSubSubscription.state == "active",
+                        WebSubSubscription.expires_at <= now + timedelta(seconds=self.renew_margin),
+                        WebSubSubscription.feed_source.has(FeedSource.feeds.any(Feed.is_active == True))
+                    )
+                    .all()
+                )
+            ]
+        finally:
+            db.close()
+
+        renewed = 0
+        for source_id, hub_url, topic_url in expiring:
+            if await self.subscribe(source_id, hub_url, topic_url):
+                renewed += 1
+        return renewed
+
+    def _set_state(self, subscription_id: int, state: str, error: Optional[str] = None) -> None:
+        db = next(get_db())
+        try:
+            db.query(WebSubSubscription).filter(WebSubSubscription.id == subscription_id).update(
+                {"state": state, "last_error": error[:255] if error else None, "pending_mode": None},
+                synchronize_session=False
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error updating WebSub subscription {subscription_id}: {str(e)}")
+        finally:
+            db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, **self.stats}
+
+websub_manager = WebSubManager()
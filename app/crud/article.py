@@ -1,6 +1,9 @@
-from typing import List, Optional
+from typing import List, Optional, Set
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
+from app.core.fingerprint import canonicalize_url
 from app.crud.base import CRUDBase
 from app.models.article import Article
 from app.schemas.article import ArticleCreate, ArticleUpdate
@@ -21,6 +24,64 @@ class CRUDArticle(CRUDBase[Article, ArticleCreate, ArticleUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    async def create_async(self, db: AsyncSession, *, obj_in: ArticleCreate) -> Article:
+        db_obj = Article(
+            title=obj_in.title,
+            content=obj_in.content,
+            url=str(obj_in.url),
+            source=obj_in.source,
+            published_date=datetime.utcnow(),
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    def get_multi(
+        self, db: Session, *, skip: int = 0, limit: int = 100, collapse_duplicates: bool = False
+    ) -> List[Article]:
+        query = db.query(Article)
+        if collapse_duplicates:
+            query = self.collapse_duplicates(query)
+        return query.offset(skip).limit(limit).all()
+
+    async def get_multi_async(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, collapse_duplicates: bool = False
+    ) -> List[Article]:
+        stmt = select(Article)
+        if collapse_duplicates:
+            stmt = self.collapse_duplicates_select(stmt)
+        result = await db.execute(stmt.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    def collapse_duplicates(self, query: Query) -> Query:
+        """Keep one article per story among the rows the query already selects."""
+        # Group by the story's original so a copy still shows when its original is filtered out
+        representatives = query.with_entities(func.min(Article.id)).group_by(
+            func.coalesce(Article.duplicate_of_id, Article.id)
+        )
+        return query.filter(Article.id.in_(representatives.scalar_subquery()))
+
+    def collapse_duplicates_select(self, stmt: Select) -> Select:
+        """collapse_duplicates for a 2.0-style select(), as used with an AsyncSession."""
+        representatives = stmt.with_only_columns(func.min(Article.id)).group_by(
+            func.coalesce(Article.duplicate_of_id, Article.id)
+        )
+        return stmt.where(Article.id.in_(representatives.scalar_subquery()))
+
+    def get_known_urls(self, db: Session, *, urls: List[str]) -> Set[str]:
+        """The given URLs that are already stored, compared by canonical URL."""
+        canonical = {url: canonicalize_url(url) for url in urls if url}
+        if not canonical:
+            return set()
+        stored = {
+            row.canonical_url
+            for row in db.query(Article.canonical_url).filter(Article.canonical_url.in_(set(canonical.values())))
+        }
+        return {url for url, key in canonical.items() if key in stored}
+
     def get_by_title(self, db: Session, *, title: str) -> Optional[Article]:
         return db.query(Article).filter(Article.title == title).first()
     
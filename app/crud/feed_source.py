@@ -0,0 +1,85 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+from app.core.fingerprint import normalize_feed_url
+from app.crud.base import CRUDBase
+from app.models.feed import Feed
+from app.models.feed_source import FeedSource
+from app.schemas.feed_source import FeedSourceCreate, FeedSourceUpdate
+
+
+class CRUDFeedSource(CRUDBase[FeedSource, FeedSourceCreate, FeedSourceUpdate]):
+    def get_by_url(self, db: Session, *, url: str) -> Optional[FeedSource]:
+        return db.query(FeedSource).filter(FeedSource.url == normalize_feed_url(url)).first()
+
+    def get_or_create(self, db: Session, *, url: str, feed_type: str) -> FeedSource:
+        """Return the source for a feed URL, creating it on first subscription. Does not commit."""
+        normalized = normalize_feed_url(url)
+        source = db.query(FeedSource).filter(FeedSource.url == normalized).first()
+        if source:
+            return source
+
+        source = FeedSource(url=normalized, feed_type=feed_type)
+        try:
+            # A concurrent subscriber may create the same source first
+            with db.begin_nested():
+                db.add(source)
+        except IntegrityError:
+            source = db.query(FeedSource).filter(FeedSource.url == normalized).one()
+        return source
+
+    def get_or_create_many(self, db: Session, *, feed_types: Dict[str, str]) -> Dict[str, FeedSource]:
+        """
+        Sources for many feed URLs (mapped to their feed types) in two queries,
+        keyed by normalized URL. Does not commit.
+        """
+        wanted: Dict[str, str] = {}
+        for url, feed_type in feed_types.items():
+            wanted.setdefault(normalize_feed_url(url), feed_type)
+        if not wanted:
+            return {}
+
+        sources = {
+            source.url: source
+            for source in db.query(FeedSource).filter(FeedSource.url.in_(list(wanted)))
+        }
+        missing = [FeedSource(url=url, feed_type=feed_type) for url, feed_type in wanted.items() if url not in sources]
+        try:
+            with db.begin_nested():
+                db.add_all(missing)
+        except IntegrityError:
+            # Someone subscribed to one of them meanwhile; settle those one by one
+            for source in missing:
+                sources[source.url] = self.get_or_create(db, url=source.url, feed_type=source.feed_type)
+            return sources
+        sources.update((source.url, source) for source in missing)
+        return sources
+
+    def due_criteria(self, now: datetime) -> List[Any]:
+        """Sources with at least one active subscription whose next fetch is due."""
+        return [
+            FeedSource.feeds.any(Feed.is_active == True),
+            or_(FeedSource.next_fetch_at.is_(None), FeedSource.next_fetch_at <= now)
+        ]
+
+    def get_due(self, db: Session, *, now: datetime) -> List[FeedSource]:
+        """The due sources, with their WebSub state."""
+        return (
+            db.query(FeedSource)
+            .options(selectinload(FeedSource.websub))
+            .filter(*self.due_criteria(now))
+            .all()
+        )
+
+    def count_subscriptions(self, db: Session, *, source_ids: List[int]) -> int:
+        if not source_ids:
+            return 0
+        return (
+            db.query(Feed)
+            .filter(Feed.source_id.in_(source_ids), Feed.is_active == True)
+            .count()
+        )
+
+feed_source = CRUDFeedSource(FeedSource)
@@ -0,0 +1,170 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import and_, case, func, literal, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+from app.core.feed_ingest import _insert_for
+from app.crud.feed_source import feed_source as feed_source_crud
+from app.models.feed_source import FeedSource
+from app.models.refresh_job import PRIORITY_SCHEDULED, RefreshJob
+
+
+class CRUDRefreshJob:
+    """
+    The durable queue of due feed fetches.
+
+    A job is claimable once its run_at has passed and nobody holds it, or the
+    holder's visibility timeout has lapsed (the worker died mid-fetch).
+    Claims take row locks with SKIP LOCKED, so any number of workers can
+    drain the table at once without ever handing the same job out twice.
+    """
+
+    def enqueue_due(self, db: Session, *, now: datetime) -> int:
+        """Add a job for every due source that has none queued yet. Returns how many were added."""
+        queued = select(RefreshJob.id).where(RefreshJob.feed_source_id == FeedSource.id).exists()
+        due = (
+            select(FeedSource.id, literal(now), literal(PRIORITY_SCHEDULED), literal(0))
+            .where(*feed_source_crud.due_criteria(now))
+            .where(~queued)
+        )
+        # enqueue_source can add a job between the NOT EXISTS check and the insert; that source is queued either way
+        insert = _insert_for(db)
+        result = db.execute(
+            insert(RefreshJob)
+            .from_select(["feed_source_id", "run_at", "priority", "attempts"], due)
+            .on_conflict_do_nothing(index_elements=["feed_source_id"])
+        )
+        db.commit()
+        return result.rowcount
+
+    def enqueue_source(self, db: Session, *, source_id: int, now: datetime, priority: int) -> None:
+        """Queue one source to run now at ``priority`` or higher, raising a job that is already queued."""
+        bump = {
+            RefreshJob.priority: case((RefreshJob.priority < priority, priority), else_=RefreshJob.priority),
+            RefreshJob.run_at: case((RefreshJob.run_at > now, now), else_=RefreshJob.run_at),
+        }
+        if db.query(RefreshJob).filter(RefreshJob.feed_source_id == source_id).update(bump, synchronize_session=False):
+            db.commit()
+            return
+        try:
+            db.add(RefreshJob(feed_source_id=source_id, run_at=now, priority=priority, attempts=0))
+            db.commit()
+        except IntegrityError:
+            # The scheduler queued it in the meantime
+            db.rollback()
+            db.query(RefreshJob).filter(RefreshJob.feed_source_id == source_id).update(bump, synchronize_session=False)
+            db.commit()
+
+    def claim(
+        self,
+        db: Session,
+        *,
+        worker_id: str,
+        limit: int,
+        now: datetime,
+        visibility_timeout: int,
+        feed_source_id: Optional[int] = None
+    ) -> List[RefreshJob]:
+        """
+        Lock up to ``limit`` ready jobs for ``worker_id``, highest priority
+        first, with their sources and WebSub state loaded.
+        """
+        query = (
+            db.query(RefreshJob)
+            .filter(RefreshJob.run_at <= now)
+            .filter(or_(RefreshJob.locked_until.is_(None), RefreshJob.locked_until <= now))
+        )
+        if feed_source_id is not None:
+            query = query.filter(RefreshJob.feed_source_id == feed_source_id)
+        jobs = (
+            query
+            .order_by(RefreshJob.priority.desc(), RefreshJob.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not jobs:
+            db.rollback()
+            return []
+
+        ids = [job.id for job in jobs]
+        for job in jobs:
+            job.locked_until = now + timedelta(seconds=visibility_timeout)
+            job.locked_by = worker_id
+            # Counted on claim, so a job whose worker keeps crashing still runs out of attempts
+            job.attempts += 1
+        db.commit()
+
+        return (
+            db.query(RefreshJob)
+            .options(selectinload(RefreshJob.feed_source).selectinload(FeedSource.websub))
+            .filter(RefreshJob.id.in_(ids))
+            .order_by(RefreshJob.priority.desc(), RefreshJob.run_at)
+            .all()
+        )
+
+    def complete(self, db: Session, *, job_id: int, worker_id: str) -> bool:
+        """Drop a finished job, unless its claim expired and another worker holds it now."""
+        deleted = (
+            db.query(RefreshJob)
+            .filter(RefreshJob.id == job_id, RefreshJob.locked_by == worker_id)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return bool(deleted)
+
+    def retry(
+        self,
+        db: Session,
+        *,
+        job_id: int,
+        worker_id: str,
+        error: str,
+        now: datetime,
+        delay: int,
+        max_attempts: int
+    ) -> Optional[bool]:
+        """
+        Release a failed job for another attempt after an exponential delay.
+
+        Returns False when the job used up its attempts and was dropped, None
+        when this worker no longer holds it.
+        """
+        job = (
+            db.query(RefreshJob)
+            .filter(RefreshJob.id == job_id, RefreshJob.locked_by == worker_id)
+            .first()
+        )
+        if job is None:
+            return None
+        if job.attempts >= max_attempts:
+            db.delete(job)
+            db.commit()
+            return False
+
+        job.run_at = now + timedelta(seconds=delay * 2 ** (job.attempts - 1))
+        job.locked_until = None
+        job.locked_by = None
+        job.last_error = error[:255]
+        db.commit()
+        return True
+
+    def get_stats(self, db: Session, *, now: datetime) -> Dict[str, Any]:
+        in_flight = RefreshJob.locked_until > now
+        # Released after a failure, or left behind by a worker that died
+        retrying = and_(RefreshJob.attempts > 0, or_(RefreshJob.locked_until.is_(None), RefreshJob.locked_until <= now))
+        row = db.query(
+            func.count(RefreshJob.id),
+            func.sum(case((in_flight, 1), else_=0)),
+            func.sum(case((retrying, 1), else_=0)),
+            func.min(RefreshJob.run_at)
+        ).one()
+        queued, claimed, retrying, oldest = row
+        return {
+            "queued": queued,
+            "in_flight": claimed or 0,
+            "retrying": retrying or 0,
+            "oldest_run_at": oldest.isoformat() if oldest else None,
+        }
+
+refresh_job = CRUDRefreshJob()
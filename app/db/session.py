@@ -1,10 +1,31 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sync drivers mapped to their asyncio counterparts
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the asyncio one."""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+async_engine = create_async_engine(async_database_url(settings.DATABASE_URL), pool_pre_ping=True)
+# Loaded objects are serialized after the commit; expiring them would need IO outside the session
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Database Dependency
 def get_db():
     db = SessionLocal()
@@ -12,4 +33,8 @@ def get_db():
         yield db
     finally:
         db.close()
-        
\ No newline at end of file
+
+# Async Database Dependency, for async def routes: queries await instead of blocking the event loop
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, ForeignKey, UniqueConstraint, event, or_, select
 from datetime import datetime
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.core.fingerprint import canonicalize_url, content_fingerprint
 
 class Article(Base):
     __tablename__ = "articles"
@@ -16,7 +17,41 @@ class Article(Base):
     category = Column(String(50))
     author = Column(String(100))
     extra_data = Column(JSON)  
+    feed_source_id = Column(Integer, ForeignKey("feed_sources.id", ondelete="SET NULL"), nullable=True, index=True)
+    guid = Column(String(512), nullable=True)  # Stable entry identity within its feed source
+    canonical_url = Column(String(512), index=True)
+    fingerprint = Column(String(40), index=True)  # Hash of the normalized title
+    duplicate_of_id = Column(Integer, ForeignKey("articles.id", ondelete="SET NULL"), nullable=True, index=True)
     published_date = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    read_history = relationship("FeedHistory", back_populates="article")
\ No newline at end of file
+    read_history = relationship("FeedHistory", back_populates="article")
+    feed_source = relationship("FeedSource", back_populates="articles")
+
+    __table_args__ = (
+        UniqueConstraint('feed_source_id', 'guid', name='uq_articles_source_guid'),
+    )
+
+@event.listens_for(Article, "before_insert")
+def set_article_identity(mapper, connection, target):
+    """Fingerprint articles created through the ORM and link them to an earlier copy."""
+    if target.canonical_url is None:
+        target.canonical_url = canonicalize_url(target.url)
+    if target.fingerprint is None:
+        target.fingerprint = content_fingerprint(target.title)
+    if target.duplicate_of_id is not None:
+        return
+
+    matches = []
+    if target.canonical_url:
+        matches.append(Article.canonical_url == target.canonical_url)
+    if target.fingerprint:
+        matches.append(Article.fingerprint == target.fingerprint)
+    if not matches:
+        return
+    target.duplicate_of_id = connection.execute(
+        select(Article.id)
+        .where(or_(*matches), Article.duplicate_of_id.is_(None))
+        .order_by(Article.id)
+        .limit(1)
+    ).scalar()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, JSON  # Add JSON here
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base_class import Base
@@ -15,8 +15,10 @@ class Feed(Base):
     is_active = Column(Boolean, default=True)
     last_fetched = Column(DateTime, nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"))
+    source_id = Column(Integer, ForeignKey("feed_sources.id"), nullable=True, index=True)  # Shared fetch state
     
     user = relationship("User", back_populates="feeds")
+    source = relationship("FeedSource", back_populates="feeds")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     user_preferences = relationship("FeedPreference", back_populates="feed")
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.db.base_class import Base
+
+class FeedSource(Base):
+    """A unique feed URL, fetched once per cycle for every Feed subscribed to it."""
+    __tablename__ = "feed_sources"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(512), nullable=False, unique=True, index=True)  # Normalized feed URL
+    feed_type = Column(String(50), nullable=False)  # 'rss', 'youtube'
+    last_fetched = Column(DateTime, nullable=True)
+    etag = Column(String(255), nullable=True)  # HTTP validators for conditional GET
+    last_modified = Column(String(64), nullable=True)
+    content_hash = Column(String(32), nullable=True)  # blake2b of the last full body, for servers that ignore validators
+    seen_entries = Column(JSON, nullable=True)  # SeenIndex: guid hash -> content hash of stored entries
+    high_water_mark = Column(DateTime, nullable=True)  # Newest published date ingested
+    next_fetch_at = Column(DateTime, nullable=True, index=True)
+    unchanged_count = Column(Integer, default=0)  # Consecutive polls with nothing new
+    avg_publish_interval = Column(Float, nullable=True)  # Hours between posts
+    consecutive_failures = Column(Integer, default=0, nullable=False)  # Circuit breaker state
+    last_error = Column(String(255), nullable=True)
+    last_success_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    feeds = relationship("Feed", back_populates="source")
+    articles = relationship("Article", back_populates="feed_source", passive_deletes=True)
+    websub = relationship("WebSubSubscription", back_populates="feed_source", uselist=False, passive_deletes=True)
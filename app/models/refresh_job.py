@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.db.base_class import Base
+
+# Claimed highest first, so a user waiting on a refresh never queues behind the schedule
+PRIORITY_SCHEDULED = 0
+PRIORITY_USER = 10
+
+class RefreshJob(Base):
+    """A due fetch of one feed source, claimed by whichever worker gets to it first."""
+    __tablename__ = "refresh_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    feed_source_id = Column(
+        Integer, ForeignKey("feed_sources.id", ondelete="CASCADE"), nullable=False, unique=True, index=True
+    )
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)  # Not claimable before this
+    priority = Column(Integer, nullable=False, default=PRIORITY_SCHEDULED)
+    locked_until = Column(DateTime, nullable=True, index=True)  # Visibility timeout of the current claim
+    locked_by = Column(String(100), nullable=True)  # Worker id holding the claim
+    attempts = Column(Integer, nullable=False, default=0)  # Claims so far, including ones lost to crashes
+    last_error = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    feed_source = relationship("FeedSource")
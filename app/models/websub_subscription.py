@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.db.base_class import Base
+
+class WebSubSubscription(Base):
+    """A WebSub (PubSubHubbub) push subscription for a hub-enabled feed source."""
+    __tablename__ = "websub_subscriptions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    feed_source_id = Column(
+        Integer, ForeignKey("feed_sources.id", ondelete="CASCADE"), nullable=False, unique=True, index=True
+    )
+    hub_url = Column(String(512), nullable=False)
+    topic_url = Column(String(512), nullable=False)  # The feed's rel=self URL as the hub knows it
+    secret = Column(String(64), nullable=False)  # HMAC key for X-Hub-Signature
+    callback_token = Column(String(64), nullable=False, unique=True, index=True)  # Unguessable callback path segment
+    state = Column(String(20), nullable=False, default="pending")  # 'pending', 'active', 'denied', 'failed'
+    pending_mode = Column(String(20), nullable=True)  # The hub.mode we asked for that the hub has not yet confirmed
+    lease_seconds = Column(Integer, nullable=True)
+    expires_at = Column(DateTime, nullable=True, index=True)
+    last_push_at = Column(DateTime, nullable=True)
+    last_error = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    feed_source = relationship("FeedSource", back_populates="websub")
@@ -23,6 +23,8 @@ class ArticleUpdate(BaseModel):
 # Schema for Article in DB
 class Article(ArticleBase):
     id: int
+    feed_source_id: Optional[int] = None
+    duplicate_of_id: Optional[int] = None
     published_date: datetime
     created_at: datetime
     updated_at: datetime
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, HttpUrl
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class FeedBase(BaseModel):
     name: str
@@ -18,6 +18,9 @@ class FeedUpdate(BaseModel):
     category: Optional[str] = None
     is_active: Optional[bool] = None
 
+class FeedDiscoveryRequest(BaseModel):
+    urls: List[str]
+
 class Feed(FeedBase):
     id: int
     is_active: bool
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class FeedSourceBase(BaseModel):
+    url: str
+    feed_type: str
+
+class FeedSourceCreate(FeedSourceBase):
+    pass
+
+class FeedSourceUpdate(BaseModel):
+    feed_type: Optional[str] = None
+
+class FeedSource(FeedSourceBase):
+    id: int
+    last_fetched: Optional[datetime]
+    next_fetch_at: Optional[datetime]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
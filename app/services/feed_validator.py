@@ -1,27 +1,28 @@
 # app/services/feed_validator.py
 
 import aiohttp
-import feedparser
 from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse
 import re
 from datetime import datetime
+from app.core.feed_validator import feed_validator
+from app.core.http_client import http_client
 
 class FeedValidationError(Exception):
     """Custom exception for feed validation errors"""
     pass
 
 class FeedValidator:
-    def __init__(self):
-        self.session = None
-    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return http_client.session
+
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # The shared HTTP client outlives individual validators
+        pass
 
     async def validate_feed(self, url: str, feed_type: str = 'rss') -> Tuple[bool, Optional[str]]:
         """
@@ -56,37 +57,11 @@ class FeedValidator:
 
     async def _validate_rss_feed(self, url: str) -> Tuple[bool, Optional[str]]:
         """Validate an RSS/Atom feed."""
-        try:
-            async with self.session.get(url) as response:
-                if response.status != 200:
-                    return False, f"HTTP error: {response.status}"
-
-                content = await response.text()
-                feed = feedparser.parse(content)
-
-                # Check if it's a valid feed
-                if feed.bozo:
-                    return False, f"Invalid feed format: {feed.bozo_exception}"
-
-                # Check for required feed elements
-                if not hasattr(feed, 'feed') or not hasattr(feed, 'entries'):
-                    return False, "Missing required feed elements"
-
-                # Check for recent entries
-                if not feed.entries:
-                    return False, "Feed contains no entries"
-
-                # Validate feed structure
-                validation_result = self._validate_feed_structure(feed)
-                if not validation_result[0]:
-                    return validation_result
-
-                return True, None
-
-        except aiohttp.ClientError as e:
-            return False, f"Connection error: {str(e)}"
-        except Exception as e:
-            return False, f"Validation error: {str(e)}"
+        # One cached validation engine, shared with the API, so a URL is fetched once
+        is_valid, result = await feed_validator.validate_feed(url)
+        if not is_valid:
+            return False, f"{result['error']}: {result['details']}"
+        return self._validate_feed_structure(result)
 
     async def _validate_youtube_feed(self, url: str) -> Tuple[bool, Optional[str]]:
         """Validate a YouTube feed URL."""
@@ -98,21 +73,12 @@ class FeedValidator:
         # Construct feed URL
         feed_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
 
-        try:
-            async with self.session.get(feed_url) as response:
-                if response.status != 200:
-                    return False, "Invalid YouTube channel"
-
-                content = await response.text()
-                feed = feedparser.parse(content)
-
-                if not feed.entries:
-                    return False, "No videos found in channel feed"
-
-                return True, None
-
-        except Exception as e:
-            return False, f"YouTube feed validation error: {str(e)}"
+        is_valid, result = await feed_validator.validate_feed(feed_url)
+        if not is_valid:
+            if result.get("error") == "Empty feed":
+                return False, "No videos found in channel feed"
+            return False, "Invalid YouTube channel"
+        return True, None
 
     def _extract_youtube_channel_id(self, url: str) -> Optional[str]:
         """Extract YouTube channel ID from various URL formats."""
@@ -128,33 +94,28 @@ class FeedValidator:
                 return match.group(1)
         return None
 
-    def _validate_feed_structure(self, feed) -> Tuple[bool, Optional[str]]:
-        """Validate the structure of a parsed feed."""
-        required_feed_fields = ['title', 'link']
-        required_entry_fields = ['title', 'link', 'published']
+    def _validate_feed_structure(self, result: Dict) -> Tuple[bool, Optional[str]]:
+        """Validate the structure of a validated feed's metadata and entries."""
+        metadata = result["metadata"]
+        required_feed_fields = {'title': metadata.get("title"), 'link': metadata.get("links")}
 
         # Check feed fields
-        for field in required_feed_fields:
-            if not hasattr(feed.feed, field):
+        for field, value in required_feed_fields.items():
+            if not value:
                 return False, f"Feed missing required field: {field}"
 
-        # Check at least one entry
-        if not feed.entries:
-            return False, "Feed contains no entries"
+        # The entries stay with the worker that fetched them; the shared verdict summarizes them
+        stats = result.get("stats", {})
 
         # Check first entry fields
-        first_entry = feed.entries[0]
-        for field in required_entry_fields:
-            if not hasattr(first_entry, field):
+        first_entry = stats.get("first_entry") or {}
+        for field in ('title', 'url'):
+            if not first_entry.get(field):
                 return False, f"Feed entries missing required field: {field}"
 
         # Check if feed is too old
-        try:
-            latest_entry_date = datetime(*first_entry.published_parsed[:6])
-            if (datetime.now() - latest_entry_date).days > 365:
-                return False, "Feed appears to be inactive (no updates in over a year)"
-        except:
-            pass  # Skip date validation if parsing fails
+        latest_published = stats.get("latest_published")
+        if latest_published and (datetime.utcnow() - datetime.fromisoformat(latest_published)).days > 365:
+            return False, "Feed appears to be inactive (no updates in over a year)"
 
         return True, None
-    
\ No newline at end of file
@@ -1,27 +1,63 @@
 # /sources/base.py
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, Callable, List, Optional, Dict, Any, Set
+from contextlib import aclosing
 from datetime import datetime
+from urllib.parse import quote_plus
 import aiohttp
 import logging
 from ..models.article import Article
+from ..core.http_client import http_client
+from ..core.quota import QuotaPlanner
 
 logger = logging.getLogger(__name__)
 
+def article_entry(article: Article) -> Dict[str, Any]:
+    """Standardized entry for an unsaved Article, in the shape FeedFetcher produces"""
+    return {
+        "guid": article.url,
+        "title": article.title,
+        "content": article.content,
+        "url": article.url,
+        "published_date": article.published_date,
+        "author": article.author,
+        "source": article.source,
+        "api_source": article.api_source,
+        "category": article.category,
+        "extra_data": article.extra_data,
+    }
+
 class NewsSourceBase(ABC):
     """Base class for all news sources"""
     
     def __init__(self):
-        self.session = None
         self.source_name = "base"
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Paginated sources list their queries; paid APIs also set a daily quota
+        self.queries: List[str] = []
+        self.quota: Optional[QuotaPlanner] = None
+        # Search endpoint paged by the default page_url
+        self.base_url = ""
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return self._session or http_client.session
+
+    @session.setter
+    def session(self, session: Optional[aiohttp.ClientSession]) -> None:
+        self._session = session
+
+    @classmethod
+    def from_settings(cls) -> "NewsSourceBase":
+        """Build the source from app settings; the registry uses this to create enabled sources"""
+        return cls()
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # The shared HTTP client outlives individual sources
+        pass
 
     @abstractmethod
     async def fetch_articles(self) -> List[Article]:
@@ -33,6 +69,24 @@ class NewsSourceBase(ABC):
         """Validate the news source configuration"""
         pass
 
+    async def iter_entries(
+        self,
+        seen_urls: Optional[Callable[[List[str]], Set[str]]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield batches of standardized entries for the ingestion stage.
+
+        Every source exposes this, whatever its API looks like. The default
+        pages through each query the quota plans for and stops at stored articles.
+        """
+        plan = self.quota.plan(self.queries) if self.quota is not None else {query: 1 for query in self.queries}
+        for query, pages in plan.items():
+            if not pages:
+                continue
+            async with aclosing(self.iter_new_pages(query, pages, seen_urls)) as results:
+                async for page in results:
+                    yield [article_entry(article) for article in page]
+
     async def process_response(self, response: Dict[str, Any]) -> List[Article]:
         """Process API response into Article objects"""
         pass
@@ -46,6 +100,63 @@ class NewsSourceBase(ABC):
             logger.error(f"Error parsing date {date_str}: {e}")
             return datetime.utcnow()
 
+    def request_headers(self) -> Dict[str, str]:
+        """Headers sent with every API request"""
+        return {}
+
+    def page_url(self, query: str, page: int) -> str:
+        """URL of one page of results for a query, newest first; APIs with other parameters override it"""
+        return f"{self.base_url}?q={quote_plus(query)}&page={page}"
+
+    def has_more(self, response: Dict[str, Any], page: int) -> bool:
+        """Whether results continue past this page"""
+        return False
+
+    async def iter_pages(self, query: str, max_pages: int) -> AsyncIterator[List[Article]]:
+        """Yield one page of articles per request while results and quota last"""
+        for page in range(1, max_pages + 1):
+            if self.quota is not None and not self.quota.try_spend():
+                logger.info(f"{self.source_name} daily quota spent, stopping {query!r} at page {page}")
+                return
+            response = await self.handle_request(self.page_url(query, page), self.request_headers())
+            if not response:
+                return
+            articles = await self.process_response(response)
+            if articles:
+                yield articles
+            if not self.has_more(response, page):
+                return
+
+    async def iter_new_pages(
+        self,
+        query: str,
+        max_pages: int,
+        seen_urls: Optional[Callable[[List[str]], Set[str]]] = None
+    ) -> AsyncIterator[List[Article]]:
+        """Page through a query, yielding articles not stored yet, until a page reaches stored ones"""
+        async with aclosing(self.iter_pages(query, max_pages)) as pages:
+            async for page in pages:
+                known = seen_urls([article.url for article in page]) if seen_urls else set()
+                articles = [article for article in page if article.url not in known]
+                if articles:
+                    yield articles
+                if known:
+                    # Results are newest first, so everything after this is stored too
+                    return
+
+    async def fetch_new(
+        self,
+        query: str,
+        max_pages: int,
+        seen_urls: Optional[Callable[[List[str]], Set[str]]] = None
+    ) -> List[Article]:
+        """All new articles of one query, for callers that want a list rather than batches"""
+        articles = []
+        async with aclosing(self.iter_new_pages(query, max_pages, seen_urls)) as pages:
+            async for page in pages:
+                articles.extend(page)
+        return articles
+
     async def handle_request(self, url: str, headers: Optional[Dict] = None) -> Optional[Dict]:
         """Make HTTP request with error handling"""
         try:
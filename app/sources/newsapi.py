@@ -1,39 +1,55 @@
 # /sources/newsapi.py
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Set
 from datetime import datetime, timedelta
+from urllib.parse import quote_plus
 import logging
 from .base import NewsSourceBase
 from ..models.article import Article
 from ..core.config import settings
+from ..core.quota import QuotaPlanner
 
 logger = logging.getLogger(__name__)
 
 class NewsAPISource(NewsSourceBase):
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, queries: Optional[List[str]] = None, quota: Optional[QuotaPlanner] = None):
         super().__init__()
         self.api_key = api_key
         self.base_url = "https://newsapi.org/v2"
         self.source_name = "newsapi"
-        
-    async def fetch_articles(self, query: str = "technology") -> List[Article]:
-        """Fetch articles from NewsAPI"""
-        headers = {"X-Api-Key": self.api_key}
-        
+        self.page_size = settings.NEWSAPI_PAGE_SIZE
+        self.queries = queries or [query.strip() for query in settings.NEWSAPI_QUERIES.split(",") if query.strip()]
+        self.quota = quota or QuotaPlanner("newsapi", settings.NEWSAPI_DAILY_QUOTA, settings.NEWSAPI_MAX_PAGES)
+
+    @classmethod
+    def from_settings(cls) -> "NewsAPISource":
+        return cls(settings.NEWSAPI_KEY)
+
+    async def fetch_articles(
+        self,
+        query: str = "technology",
+        seen_urls: Optional[Callable[[List[str]], Set[str]]] = None,
+        max_pages: Optional[int] = None
+    ) -> List[Article]:
+        """Fetch articles from NewsAPI, newest first, stopping at ones already stored"""
+        return await self.fetch_new(query, max_pages or self.quota.max_pages_per_query, seen_urls)
+
+    def request_headers(self) -> Dict[str, str]:
+        return {"X-Api-Key": self.api_key}
+
+    def page_url(self, query: str, page: int) -> str:
         # Get articles from last 24 hours
         date_from = (datetime.utcnow() - timedelta(days=1)).strftime('%Y-%m-%d')
-        
-        url = (f"{self.base_url}/everything?"
-               f"q={query}&"
-               f"from={date_from}&"
-               f"sortBy=publishedAt&"
-               f"language=en")
-               
-        response = await self.handle_request(url, headers)
-        
-        if not response:
-            return []
-            
-        return await self.process_response(response)
+
+        return (f"{self.base_url}/everything?"
+                f"q={quote_plus(query)}&"
+                f"from={date_from}&"
+                f"sortBy=publishedAt&"
+                f"language=en&"
+                f"pageSize={self.page_size}&"
+                f"page={page}")
+
+    def has_more(self, response: dict, page: int) -> bool:
+        return page * self.page_size < response.get("totalResults", 0)
         
     async def validate_source(self) -> bool:
         """Validate NewsAPI configuration"""
@@ -0,0 +1,63 @@
+# app/sources/registry.py
+import importlib
+import logging
+from typing import Dict, List, Optional, Type
+
+from app.core.config import settings
+from app.sources.base import NewsSourceBase
+
+logger = logging.getLogger(__name__)
+
+# Name -> "module:Class"; modules are imported on first use, so disabled sources cost nothing
+SOURCE_PLUGINS: Dict[str, str] = {
+    "rss": "app.sources.rss:RSSFeedSource",
+    "newsapi": "app.sources.newsapi:NewsAPISource",
+    "reuters": "app.sources.reuters:ReutersSource",
+}
+
+class SourceRegistry:
+    """
+    News source plugins by name, loaded lazily.
+
+    Only the sources listed in NEWS_SOURCES are imported and created. A
+    plugin that fails to import or build is logged and skipped, so one broken
+    source never stops the others.
+    """
+
+    def __init__(self, plugins: Optional[Dict[str, str]] = None, enabled: Optional[List[str]] = None):
+        self.plugins = dict(SOURCE_PLUGINS if plugins is None else plugins)
+        if enabled is None:
+            enabled = [name.strip() for name in settings.NEWS_SOURCES.split(",") if name.strip()]
+        self.enabled = enabled
+        self._classes: Dict[str, Type[NewsSourceBase]] = {}
+
+    def register(self, name: str, path: str) -> None:
+        """Add or replace a plugin, given as "module:Class"."""
+        self.plugins[name] = path
+        self._classes.pop(name, None)
+
+    def load(self, name: str) -> Type[NewsSourceBase]:
+        """Import a plugin's class, raising KeyError for unknown names."""
+        if name not in self._classes:
+            module_name, _, class_name = self.plugins[name].partition(":")
+            source_class = getattr(importlib.import_module(module_name), class_name)
+            if not issubclass(source_class, NewsSourceBase):
+                raise TypeError(f"Source plugin {name} is not a NewsSourceBase")
+            self._classes[name] = source_class
+        return self._classes[name]
+
+    def create(self, name: str) -> Optional[NewsSourceBase]:
+        try:
+            return self.load(name).from_settings()
+        except Exception as e:
+            logger.error(f"Error loading news source {name}: {str(e)}")
+            return None
+
+    def get_stats(self) -> Dict[str, List[str]]:
+        return {
+            "available": sorted(self.plugins),
+            "enabled": self.enabled,
+            "loaded": sorted(self._classes)
+        }
+
+source_registry = SourceRegistry()
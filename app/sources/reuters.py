@@ -1,34 +1,53 @@
 # /sources/reuters.py
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Set
 from datetime import datetime, timedelta
+from urllib.parse import quote_plus
 import logging
 from .base import NewsSourceBase
 from ..models.article import Article
 from ..core.config import settings
+from ..core.quota import QuotaPlanner
 
 logger = logging.getLogger(__name__)
 
 class ReutersSource(NewsSourceBase):
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, queries: Optional[List[str]] = None, quota: Optional[QuotaPlanner] = None):
         super().__init__()
         self.api_key = api_key
         self.base_url = "http://api.reuters.com/v2"
         self.source_name = "reuters"
+        self.page_size = settings.REUTERS_PAGE_SIZE
+        # An empty query reads the unfiltered latest news
+        self.queries = queries or [query.strip() for query in settings.REUTERS_QUERIES.split(",") if query.strip()] or [""]
+        self.quota = quota or QuotaPlanner("reuters", settings.REUTERS_DAILY_QUOTA, settings.REUTERS_MAX_PAGES)
         
-    async def fetch_articles(self) -> List[Article]:
-        """Fetch articles from Reuters API"""
-        headers = {
+    @classmethod
+    def from_settings(cls) -> "ReutersSource":
+        return cls(settings.REUTERS_API_KEY)
+
+    async def fetch_articles(
+        self,
+        query: str = "",
+        seen_urls: Optional[Callable[[List[str]], Set[str]]] = None,
+        max_pages: Optional[int] = None
+    ) -> List[Article]:
+        """Fetch articles from Reuters API, newest first, stopping at ones already stored"""
+        return await self.fetch_new(query, max_pages or self.quota.max_pages_per_query, seen_urls)
+
+    def request_headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Accept": "application/json"
         }
-        
-        url = f"{self.base_url}/latest-news"
-        response = await self.handle_request(url, headers)
-        
-        if not response:
-            return []
-            
-        return await self.process_response(response)
+
+    def page_url(self, query: str, page: int) -> str:
+        url = f"{self.base_url}/latest-news?limit={self.page_size}&page={page}"
+        if query:
+            url += f"&q={quote_plus(query)}"
+        return url
+
+    def has_more(self, response: dict, page: int) -> bool:
+        return len(response.get("results", [])) >= self.page_size
         
     async def validate_source(self) -> bool:
         """Validate Reuters API configuration"""
@@ -1,15 +1,25 @@
 # app/sources/rss.py
+import asyncio
+import time
 from datetime import datetime
-from typing import List, Optional
-import feedparser
-import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
 from app.models.article import Article
+from app.core.config import settings
+from app.core.feed_fetcher import FeedFetchError
+from app.core.host_limiter import host_limiter
+from app.core.parse_executor import feed_headers, parse_executor
+from app.sources.base import NewsSourceBase, article_entry
 
 import logging
 logger = logging.getLogger(__name__)
 
-class RSSFeedSource:
+class RSSFeedSource(NewsSourceBase):
     def __init__(self):
+        super().__init__()
+        self.source_name = "rss"
+        self.host_limiter = host_limiter
+        # Per-feed timings of the most recent fetch, keyed like Article.source
+        self.timings: Dict[str, Dict[str, Any]] = {}
         self.tech_feeds = {
             "django": {
                 "url": "https://www.djangoproject.com/rss/weblog/",
@@ -36,6 +46,33 @@ class RSSFeedSource:
             }
         }
 
+    async def validate_source(self) -> bool:
+        """Configured feeds need no credentials"""
+        return bool(self.tech_feeds or self.video_feeds["youtube"])
+
+    def _fetches(self) -> List[Awaitable[List[Article]]]:
+        return [
+            *(self.fetch_articles(name) for name in self.tech_feeds),
+            *(self.fetch_videos(channel) for channel in self.video_feeds["youtube"])
+        ]
+
+    async def iter_entries(
+        self,
+        seen_urls: Optional[Callable[[List[str]], Set[str]]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield each feed's entries as soon as that feed is fetched; every feed is fetched concurrently."""
+        for fetch in asyncio.as_completed(self._fetches()):
+            articles = await fetch
+            known = seen_urls([article.url for article in articles]) if seen_urls and articles else set()
+            entries = [article_entry(article) for article in articles if article.url not in known]
+            if entries:
+                yield entries
+
+    async def fetch_all(self) -> List[Article]:
+        """Fetch every tech and video feed concurrently and merge the results."""
+        results = await asyncio.gather(*self._fetches())
+        return [article for articles in results for article in articles]
+
     async def fetch_articles(self, source_name: str) -> List[Article]:
         """Fetch articles from RSS feed"""
         try:
@@ -44,16 +81,18 @@ class RSSFeedSource:
                 logger.error(f"Unknown RSS source: {source_name}")
                 return []
 
-            feed = feedparser.parse(feed_info["url"])
-            if feed.bozo:
-                logger.error(f"Invalid RSS feed for {source_name}: {feed.bozo_exception}")
+            feed = await self._fetch_feed(source_name, feed_info["url"])
+            if feed is None:
+                return []
+            if feed["bozo"]:
+                logger.error(f"Invalid RSS feed for {source_name}: {feed['bozo_exception']}")
                 return []
 
             articles = []
-            for entry in feed.entries:
+            for entry in feed["entries"]:
                 try:
                     # Handle different feed formats
-                    content = entry.get('content', [{}])[0].get('value', '')
+                    content = entry.get('content', '')
                     if not content:
                         content = entry.get('summary', '')
 
@@ -67,10 +106,10 @@ class RSSFeedSource:
                         category=feed_info["type"],
                         author=entry.get('author', ''),
                         published_date=self._parse_date(entry.get('published', '')),
-                        metadata=json.dumps({
+                        extra_data={
                             'tags': entry.get('tags', []),
                             'media': self._extract_media(entry)
-                        })
+                        }
                     )
                     articles.append(article)
                 except Exception as e:
@@ -87,10 +126,12 @@ class RSSFeedSource:
         if not feed_url:
             return []
 
-        feed = feedparser.parse(feed_url)
+        feed = await self._fetch_feed(f"youtube_{channel}", feed_url)
+        if feed is None:
+            return []
         videos = []
 
-        for entry in feed.entries:
+        for entry in feed["entries"]:
             # Extract video ID from URL
             video_id = entry.get('yt_videoid', '')
             
@@ -104,16 +145,59 @@ class RSSFeedSource:
                 category='video',
                 author=entry.get('author', ''),
                 published_date=self._parse_date(entry.get('published', '')),
-                metadata=json.dumps({
+                extra_data={
                     'thumbnail': f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg",
                     'duration': entry.get('media_duration', ''),
                     'views': entry.get('media_statistics', {}).get('views', 0)
-                })
+                }
             )
             videos.append(video)
 
         return videos
     
+    async def _fetch_feed(self, name: str, url: str) -> Optional[Dict[str, Any]]:
+        """Download a feed on the event loop and parse it off-loop, recording how long each step took."""
+        timing = {"url": url, "status": None, "bytes": 0, "fetch_ms": 0.0, "parse_ms": 0.0, "entries": 0, "error": None}
+        self.timings[name] = timing
+        started = time.perf_counter()
+        try:
+            async with self.host_limiter.slot(url), self.session.get(url) as response:
+                timing["status"] = response.status
+                if response.status != 200:
+                    raise FeedFetchError(f"HTTP {response.status}")
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(settings.FEED_STREAM_CHUNK_SIZE):
+                    body.extend(chunk)
+                    if len(body) > settings.FEED_MAX_BYTES:
+                        raise FeedFetchError(f"Feed exceeds {settings.FEED_MAX_BYTES} bytes")
+                headers = feed_headers(response)
+            timing["bytes"] = len(body)
+            timing["fetch_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+            parse_started = time.perf_counter()
+            feed = await parse_executor.parse(bytes(body), headers)
+            timing["parse_ms"] = round((time.perf_counter() - parse_started) * 1000, 1)
+            timing["entries"] = len(feed["entries"])
+            return feed
+        except Exception as e:
+            timing["error"] = str(e) or type(e).__name__
+            logger.error(f"Error fetching RSS feed {name}: {timing['error']}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Timings of the last fetch of each feed, slowest first."""
+        feeds = sorted(
+            ({"source": name, **timing} for name, timing in self.timings.items()),
+            key=lambda item: item["fetch_ms"] + item["parse_ms"],
+            reverse=True
+        )
+        return {
+            "feeds": feeds,
+            "errors": sum(1 for item in feeds if item["error"]),
+            "total_fetch_ms": round(sum(item["fetch_ms"] for item in feeds), 1),
+            "total_parse_ms": round(sum(item["parse_ms"] for item in feeds), 1)
+        }
+
     def _parse_date(self, date_str: str) -> datetime:
         try:
             return datetime.strptime(date_str, "%a, %d %b %Y %H:%M:%S %z")
@@ -123,7 +207,7 @@ class RSSFeedSource:
     def _extract_media(self, entry) -> dict:
         media = {}
         if 'media_content' in entry:
-            media['content'] = entry.media_content
+            media['content'] = entry['media_content']
         if 'media_thumbnail' in entry:
-            media['thumbnail'] = entry.media_thumbnail
+            media['thumbnail'] = entry['media_thumbnail']
         return media
\ No newline at end of file
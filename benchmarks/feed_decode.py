@@ -0,0 +1,133 @@
+# benchmarks/feed_decode.py
+"""
+Per-feed CPU time of parsing decoded text versus raw bytes.
+
+The old path decoded every body with response.text() (the Content-Type
+charset, else UTF-8) and handed feedparser a str, which it re-encodes and
+sniffs again. The new path hands feedparser the raw bytes plus Content-Type.
+
+Real feeds are downloaded once (through the shared client, so with gzip/br)
+and then parsed repeatedly offline, so network time is not counted:
+
+    python -m benchmarks.feed_decode --urls feeds.txt --repeat 20
+    python -m benchmarks.feed_decode --corpus saved_feeds/ --repeat 20
+
+feeds.txt holds one feed URL per line. A corpus directory holds saved bodies;
+an optional "<name>.content-type" file next to a body gives its header.
+Without either, a small synthetic corpus in several encodings is used.
+
+Needs the usual app environment (DATABASE_URL, SECRET_KEY, REDISHOST) because
+it imports app settings.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from app.core.http_client import http_client
+from app.core.parse_executor import feed_headers, parse_feed
+
+Feed = Tuple[str, bytes, Dict[str, str]]
+
+def decode_like_text(body: bytes, headers: Dict[str, str]) -> str:
+    """What aiohttp's response.text() returned: the declared charset, else UTF-8."""
+    content_type = headers.get("content-type", "")
+    charset = "utf-8"
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset" and value:
+            charset = value.strip('"')
+    try:
+        return body.decode(charset, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+def synthetic_corpus() -> List[Feed]:
+    feeds = []
+    for encoding, content_type in (
+        ("utf-8", "application/rss+xml; charset=utf-8"),
+        ("utf-8", "application/rss+xml"),
+        ("iso-8859-1", "text/xml"),
+        ("windows-1252", "application/xml; charset=windows-1252"),
+    ):
+        items = "".join(
+            f"<item><title>Café item {i}</title><link>http://example.com/{i}</link>"
+            f"<description>{'Déjà vu, naïve façade. ' * 30}</description>"
+            f"<pubDate>Mon, 01 Jan 2024 12:00:00 GMT</pubDate></item>"
+            for i in range(300)
+        )
+        document = (
+            f'<?xml version="1.0" encoding="{encoding}"?>'
+            f"<rss version=\"2.0\"><channel><title>Bench</title>{items}</channel></rss>"
+        )
+        feeds.append((f"synthetic-{encoding}-{content_type.split(';')[0]}", document.encode(encoding), {"content-type": content_type}))
+    return feeds
+
+def load_corpus(directory: Path) -> List[Feed]:
+    feeds = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix == ".content-type" or not path.is_file():
+            continue
+        header = path.with_name(path.name + ".content-type")
+        headers = {"content-type": header.read_text().strip()} if header.exists() else {}
+        feeds.append((path.name, path.read_bytes(), headers))
+    return feeds
+
+async def download(urls: List[str]) -> List[Feed]:
+    async def one(url: str):
+        try:
+            async with http_client.session.get(url) as response:
+                if response.status == 200:
+                    return url, await response.read(), feed_headers(response)
+                print(f"skipping {url}: HTTP {response.status}")
+        except Exception as e:
+            print(f"skipping {url}: {e}")
+        return None
+
+    try:
+        return [feed for feed in await asyncio.gather(*(one(url) for url in urls)) if feed]
+    finally:
+        await http_client.close()
+
+def cpu_ms(function, repeat: int) -> float:
+    """Median CPU time of one call, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        function()
+        samples.append((time.process_time() - started) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=Path, help="file with one feed URL per line")
+    parser.add_argument("--corpus", type=Path, help="directory of saved feed bodies")
+    parser.add_argument("--repeat", type=int, default=10, help="parses per feed and path")
+    args = parser.parse_args()
+
+    if args.urls:
+        urls = [line.strip() for line in args.urls.read_text().splitlines() if line.strip()]
+        feeds = asyncio.run(download(urls))
+    elif args.corpus:
+        feeds = load_corpus(args.corpus)
+    else:
+        feeds = synthetic_corpus()
+
+    totals = {"text": 0.0, "bytes": 0.0}
+    print(f"{'feed':60} {'KiB':>7} {'text ms':>9} {'bytes ms':>9} {'entries':>8}")
+    for name, body, headers in feeds:
+        text_ms = cpu_ms(lambda: parse_feed(decode_like_text(body, headers)), args.repeat)
+        bytes_ms = cpu_ms(lambda: parse_feed(body, headers), args.repeat)
+        entries = len(parse_feed(body, headers)["entries"])
+        totals["text"] += text_ms
+        totals["bytes"] += bytes_ms
+        print(f"{name[:60]:60} {len(body) / 1024:7.0f} {text_ms:9.2f} {bytes_ms:9.2f} {entries:8}")
+
+    if feeds:
+        saved = 100 * (1 - totals["bytes"] / totals["text"]) if totals["text"] else 0.0
+        print(f"\n{len(feeds)} feeds: text {totals['text']:.1f} ms, bytes {totals['bytes']:.1f} ms ({saved:.1f}% less CPU)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/parse_latency.py
+"""
+API latency while large feeds are being parsed.
+
+Serves a trivial endpoint in-process and hammers it while several large feeds
+are parsed at the same time, once with feedparser on the event loop (the old
+behaviour) and once through each ParseExecutor mode.
+
+    python -m benchmarks.parse_latency --entries 5000 --parses 8
+
+Needs the usual app environment (DATABASE_URL, SECRET_KEY, REDISHOST) because
+it imports app settings.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import feedparser
+import httpx
+from fastapi import FastAPI
+
+from app.core.parse_executor import ParseExecutor
+
+def build_feed(entries: int) -> str:
+    items = "".join(
+        f"<item><title>Item {i}</title><link>http://example.com/{i}</link>"
+        f"<description>{'Lorem ipsum dolor sit amet. ' * 20}</description>"
+        f"<pubDate>Mon, 01 Jan 2024 12:00:00 GMT</pubDate></item>"
+        for i in range(entries)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Bench</title>{items}</channel></rss>'
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+async def measure(mode: str, content: str, parses: int) -> dict:
+    app = build_app()
+    latencies = []
+    executor = None if mode == "inline" else ParseExecutor(mode=mode, timeout=600)
+
+    async def parse_one():
+        if executor is None:
+            feedparser.parse(content)
+        else:
+            await executor.parse(content)
+
+    async def probe(window: dict):
+        # Requests are due on a fixed schedule; latency counts from the due time,
+        # so requests that queued up behind a blocked event loop are included
+        interval = 0.01
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            due = time.perf_counter()
+            while window["end"] is None or due < window["end"]:
+                await asyncio.sleep(max(due - time.perf_counter(), 0))
+                await client.get("/ping")
+                latencies.append((time.perf_counter() - due) * 1000)
+                due += interval
+
+    if executor is not None:
+        # Warm the pool so worker start-up is not counted
+        await executor.parse(build_feed(1))
+
+    window = {"end": None}
+    prober = asyncio.create_task(probe(window))
+    await asyncio.sleep(0.1)
+    started = time.perf_counter()
+    await asyncio.gather(*(parse_one() for _ in range(parses)))
+    elapsed = time.perf_counter() - started
+    window["end"] = time.perf_counter()
+    await prober
+
+    if executor is not None:
+        executor.shutdown()
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "parse_wall_s": round(elapsed, 2),
+        "requests": len(latencies),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        "max_ms": round(latencies[-1], 1),
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=5000, help="entries per synthetic feed")
+    parser.add_argument("--parses", type=int, default=8, help="concurrent parses")
+    args = parser.parse_args()
+
+    content = build_feed(args.entries)
+    print(f"feed size: {len(content) / 1024:.0f} KiB, concurrent parses: {args.parses}")
+    for mode in ("inline", "thread", "process"):
+        print(await measure(mode, content, args.parses))
+
+if __name__ == "__main__":
+    asyncio.run(main())
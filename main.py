@@ -6,8 +6,8 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any, Optional
 import math
 import logging
@@ -19,6 +19,8 @@ from app.core.middleware import RateLimitMiddleware
 from app.core.background_tasks import background_task_manager, BackgroundTasks
 from app.core.notification_manager import NotificationManager
 from app.core.feed_fetcher import FeedFetcher
+from app.core.parse_executor import parse_executor
+from app.core.http_client import http_client
 from app.core.middleware import AuthenticationMiddleware
 
 # Import error handling and versioning
@@ -30,7 +32,8 @@ from app.models.user import User
 from app.models.feed import Feed
 from app.models.article import Article
 from app.core.deps import get_current_user
-from app.db.session import get_db
+from app.crud.article import article as article_crud
+from app.db.session import async_engine, get_async_db
 
 # Import routers
 from app.api.v1.endpoints import auth, articles, admin, feed
@@ -150,6 +153,7 @@ app.include_router(api_router, prefix="/api/v1")
 async def startup_event():
     """Start background tasks when the application starts."""
     try:
+        await http_client.start()
         background_tasks = BackgroundTasks()
         await background_task_manager.start(background_tasks)
         logger.info("Background tasks started successfully")
@@ -163,6 +167,9 @@ async def shutdown_event():
     """Stop background tasks when the application shuts down."""
     try:
         await background_task_manager.stop()
+        await http_client.close()
+        parse_executor.shutdown()
+        await async_engine.dispose()
         logger.info("Background tasks stopped successfully")
     except Exception as e:
         logger.error(f"Error stopping background tasks: {e}")
@@ -198,11 +205,11 @@ async def articles_view(request: Request):
 @app.get("/feeds")
 async def feeds_view(
     request: Request, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Feed management dashboard view."""
-    feeds = db.query(Feed).filter(Feed.user_id == current_user.id).all()
+    feeds = (await db.scalars(select(Feed).where(Feed.user_id == current_user.id))).all()
     return templates.TemplateResponse(
         "feeds.html",
         {
@@ -214,56 +221,53 @@ async def feeds_view(
 @app.get("/reader")
 async def reader_view(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1),
     content_type: str = Query('all', regex='^(all|videos|articles)$'),
     category: str = Query('all'),
     search: str = Query(''),
+    collapse_duplicates: bool = Query(False),
     items_per_page: int = 12
 ):
     """Content reader view with support for articles and videos."""
-    # Get user's feeds
-    user_feeds = db.query(Feed).filter(Feed.user_id == current_user.id).all()
-    feed_ids = [feed.id for feed in user_feeds]
+    # Get user's feeds; their articles are stored once per shared feed source
+    user_feeds = (await db.scalars(select(Feed).where(Feed.user_id == current_user.id))).all()
+    if category != 'all':
+        source_ids = [feed.source_id for feed in user_feeds if feed.category == category]
+    else:
+        source_ids = [feed.source_id for feed in user_feeds]
     
     # Build content query
-    query = db.query(Article).filter(Article.feed_id.in_(feed_ids))
+    query = select(Article).where(Article.feed_source_id.in_(source_ids))
     
     # Apply filters
     if content_type == 'videos':
-        query = query.filter(Article.api_source == 'youtube')
+        query = query.where(Article.api_source == 'youtube')
     elif content_type == 'articles':
-        query = query.filter(Article.api_source != 'youtube')
-    
-    if category != 'all':
-        query = query.filter(Article.category == category)
+        query = query.where(Article.api_source != 'youtube')
     
     if search:
         search_filter = or_(
             Article.title.ilike(f"%{search}%"),
             Article.content.ilike(f"%{search}%")
         )
-        query = query.filter(search_filter)
+        query = query.where(search_filter)
+
+    if collapse_duplicates:
+        query = article_crud.collapse_duplicates_select(query)
     
     # Get total count for pagination
-    total_items = query.count()
+    total_items = await db.scalar(select(func.count()).select_from(query.subquery()))
     total_pages = math.ceil(total_items / items_per_page)
     
     # Apply pagination
     offset = (page - 1) * items_per_page
     query = query.order_by(Article.published_date.desc())
-    items = query.offset(offset).limit(items_per_page).all()
+    items = (await db.scalars(query.offset(offset).limit(items_per_page))).all()
     
-    # Get unique categories for filter dropdown
-    categories = (
-        db.query(Article.category)
-        .filter(Article.feed_id.in_(feed_ids))
-        .distinct()
-        .filter(Article.category.isnot(None))
-        .all()
-    )
-    categories = [cat[0] for cat in categories]
+    # Get unique categories for filter dropdown; categories belong to the user's subscriptions
+    categories = sorted({feed.category for feed in user_feeds if feed.category})
     
     return templates.TemplateResponse(
         "reader.html",
@@ -276,7 +280,8 @@ async def reader_view(
             "total_items": total_items,
             "content_type": content_type,
             "current_category": category,
-            "search_query": search
+            "search_query": search,
+            "collapse_duplicates": collapse_duplicates
         }
     )
 
@@ -21,13 +21,26 @@ load_dotenv(os.path.join(project_root, '.env.test'))
 
 # Now we can import app modules
 import asyncio
+import time
 from typing import AsyncGenerator
-from sqlalchemy.orm import Session
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
-from app.core.background_tasks import background_task_manager
+from app.core.background_tasks import BackgroundTaskManager, background_task_manager
 from app.core.cache import CacheManager
+from app.core.feed_scheduler import FeedScheduler
+from app.core.host_limiter import HostLimiter
+from app.core.leader import RELEASE_SCRIPT, RENEW_SCRIPT
+from app.core.parse_executor import ParseExecutor
 from main import app
+from app.db.base import Base
 from app.db.session import get_db
+from app.models.article import Article
+from app.models.feed import Feed
+from app.models.feed_source import FeedSource
+from app.models.user import User
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -122,3 +135,193 @@ def mock_redis(monkeypatch):
     
     monkeypatch.setattr("redis.Redis", lambda *args, **kwargs: MockRedis())
     return MockRedis()
+
+# Stand-ins for the network and Redis, shared by the feed pipeline tests
+
+class FakeContent:
+    def __init__(self, body, chunk_size):
+        self._body = body
+        self._chunk_size = chunk_size
+        self.chunks_read = 0
+
+    async def iter_chunked(self, n):
+        size = self._chunk_size or n
+        while self._body:
+            chunk, self._body = self._body[:size], self._body[size:]
+            self.chunks_read += 1
+            yield chunk
+
+class FakeResponse:
+    def __init__(self, status, body=b"", headers=None, chunk_size=None, url="http://example.com/feed"):
+        self.status = status
+        self.url = url
+        self._body = body
+        self.headers = headers or {}
+        self.content = FakeContent(body, chunk_size)
+
+    async def read(self):
+        return self._body
+
+    async def text(self):
+        return self._body.decode("utf-8")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append({"url": url, "headers": headers or {}})
+        return self.responses.pop(0)
+
+class Site:
+    """Serves HEAD and GET by URL after a per-URL delay, recording requests and cancellations."""
+
+    def __init__(self, routes, delays=None):
+        self.routes = routes
+        self.delays = delays or {}
+        self.requests = []
+        self.cancelled = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _request(self, method, url, headers):
+        site = self
+        self.requests.append((method, url, headers or {}))
+
+        class Request:
+            async def __aenter__(self):
+                site.in_flight += 1
+                site.peak_in_flight = max(site.peak_in_flight, site.in_flight)
+                try:
+                    await asyncio.sleep(site.delays.get(url, 0))
+                except asyncio.CancelledError:
+                    site.in_flight -= 1
+                    site.cancelled.append(url)
+                    raise
+                route = site.routes.get((method, url)) or site.routes.get(url)
+                return route() if route else FakeResponse(404, url=url)
+
+            async def __aexit__(self, *exc):
+                site.in_flight -= 1
+                return False
+
+        return Request()
+
+    def head(self, url, allow_redirects=False, timeout=None):
+        return self._request("HEAD", url, None)
+
+    def get(self, url, headers=None, timeout=None):
+        return self._request("GET", url, headers)
+
+class FakeRedis:
+    """Just enough of redis-py for the lease: SET NX PX, PTTL and the two holder-only scripts."""
+
+    def __init__(self):
+        self.values = {}
+        self.expires = {}
+
+    def _alive(self, key):
+        if key in self.expires and self.expires[key] <= time.time():
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.values
+
+    def get(self, key):
+        return self.values[key].encode() if self._alive(key) else None
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and self._alive(key):
+            return None
+        self.values[key] = value
+        self.expires[key] = time.time() + px / 1000
+        return True
+
+    def pttl(self, key):
+        return int((self.expires[key] - time.time()) * 1000) if self._alive(key) else -2
+
+    def eval(self, script, numkeys, key, value, *args):
+        if not self._alive(key) or self.values[key] != value:
+            return 0
+        if script == RENEW_SCRIPT:
+            self.expires[key] = time.time() + int(args[0]) / 1000
+        elif script == RELEASE_SCRIPT:
+            del self.values[key], self.expires[key]
+        return 1
+
+    def expire_now(self, key):
+        self.expires[key] = time.time()
+
+def build_rss(entries):
+    items = "".join(
+        f"<item><guid>urn:{i}</guid><title>Item {i}</title><link>http://example.com/{i}</link>"
+        f"<description>Body {i}</description><pubDate>Mon, 01 Jan 2024 12:00:00 GMT</pubDate></item>"
+        for i in range(entries)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Big</title>{items}</channel></rss>'.encode()
+
+@pytest.fixture
+def sessions():
+    """An in-memory database with one user, wired into every module that opens its own sessions."""
+    # One shared connection, so code run in a threadpool sees the same in-memory database
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    def get_test_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    db = SessionLocal()
+    db.add(User(email="reader@example.com", hashed_password="x"))
+    db.commit()
+    db.close()
+    with patch("app.core.background_tasks.get_db", get_test_db), \
+            patch("app.core.websub.get_db", get_test_db), \
+            patch("app.core.feed_fetcher.parse_executor", ParseExecutor(mode="thread", max_workers=1)):
+        SessionLocal.get_db = get_test_db
+        yield SessionLocal
+    engine.dispose()
+
+@pytest.fixture
+def manager(monkeypatch):
+    """A BackgroundTaskManager around the shared feed_fetcher, whose limiter and session are restored afterwards."""
+    manager = BackgroundTaskManager()
+    manager.scheduler = FeedScheduler(min_interval=300, jitter=0, circuit_threshold=3, circuit_open_interval=6 * 3600)
+    monkeypatch.setattr(manager.feed_fetcher, "host_limiter", HostLimiter(rate=1000, burst=100, max_concurrency=10))
+    # Tests swap in fake sessions; put the real one back when they are done
+    monkeypatch.setattr(manager.feed_fetcher, "session", manager.feed_fetcher.session)
+    return manager
+
+def add_source(Session, url="http://example.com/feed", **values):
+    db = Session()
+    source = FeedSource(url=url, feed_type="rss", **values)
+    db.add(source)
+    db.commit()
+    for i in range(2):
+        db.add(Feed(name=f"Feed {i}", url=source.url, feed_type="rss", user_id=1, source_id=source.id))
+    db.commit()
+    db.refresh(source)
+    source.websub  # get_due loads it eagerly
+    db.expunge(source)
+    db.close()
+    return source
+
+def reload(Session, source_id):
+    db = Session()
+    source = db.get(FeedSource, source_id)
+    source.websub
+    feeds = db.query(Feed).filter(Feed.source_id == source_id).all()
+    articles = db.query(Article).filter(Article.feed_source_id == source_id).count()
+    db.expunge_all()
+    db.close()
+    return source, feeds, articles
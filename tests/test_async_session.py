@@ -0,0 +1,108 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.api.v1.endpoints import articles, feed
+from app.core.security import create_access_token
+from app.crud.article import article
+from app.db.base import Base
+from app.db.session import async_database_url, get_async_db
+from app.models.article import Article
+from app.models.feed import Feed
+from app.models.user import User
+from app.schemas.article import ArticleCreate, ArticleUpdate
+
+
+@pytest.fixture
+async def async_sessions():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    async with Session() as db:
+        db.add(User(email="reader@example.com", hashed_password="x"))
+        await db.commit()
+    yield Session
+    await engine.dispose()
+
+
+def test_async_database_url_swaps_drivers():
+    assert async_database_url("postgresql://u:p@db:5432/news") == "postgresql+asyncpg://u:p@db:5432/news"
+    assert async_database_url("postgresql+psycopg2://u:p@db/news") == "postgresql+asyncpg://u:p@db/news"
+    assert async_database_url("sqlite:///./news.db") == "sqlite+aiosqlite:///./news.db"
+    assert async_database_url("postgresql+asyncpg://u:p@db/news") == "postgresql+asyncpg://u:p@db/news"
+
+
+@pytest.mark.asyncio
+async def test_async_crud_round_trip(async_sessions):
+    async with async_sessions() as db:
+        created = await article.create_async(db, obj_in=ArticleCreate(
+            title="First", content="Body", url="http://example.com/1", source="test"
+        ))
+        updated = await article.update_async(db, db_obj=created, obj_in=ArticleUpdate(title="Renamed"))
+        assert updated.title == "Renamed"
+
+    async with async_sessions() as db:
+        assert (await article.get_async(db, id=created.id)).title == "Renamed"
+        assert [a.id for a in await article.get_multi_async(db)] == [created.id]
+        await article.remove_async(db, id=created.id)
+        assert await article.get_async(db, id=created.id) is None
+
+
+@pytest.mark.asyncio
+async def test_get_multi_async_collapses_duplicates(async_sessions):
+    async with async_sessions() as db:
+        original = Article(title="Story", content="x", url="http://a.example.com/story", source="a")
+        db.add(original)
+        await db.flush()
+        db.add(Article(
+            title="Story", content="x", url="http://b.example.com/story", source="b", duplicate_of_id=original.id
+        ))
+        db.add(Article(title="Other", content="y", url="http://a.example.com/other", source="a"))
+        await db.commit()
+
+        assert len(await article.get_multi_async(db)) == 3
+        collapsed = await article.get_multi_async(db, collapse_duplicates=True)
+        assert sorted(a.title for a in collapsed) == ["Other", "Story"]
+
+
+@pytest.mark.asyncio
+async def test_routes_read_through_the_async_session(async_sessions):
+    async with async_sessions() as db:
+        db.add(Feed(name="Python", url="http://example.com/python", feed_type="rss", user_id=1))
+        hello = Article(title="Hello", content="x", url="http://example.com/hello", source="test")
+        db.add(hello)
+        await db.flush()
+        db.add(Article(
+            title="Hello", content="x", url="http://mirror.example.com/hello", source="mirror", duplicate_of_id=hello.id
+        ))
+        await db.commit()
+
+    async def get_test_db():
+        async with async_sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(articles.router)
+    app.include_router(feed.router)
+    app.dependency_overrides[get_async_db] = get_test_db
+    headers = {"Authorization": f"Bearer {create_access_token(1)}", "X-API-Version": "1.0"}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        feeds = await client.get("/feeds", headers=headers)
+        listed = await client.get("/articles", headers=headers)
+        collapsed = await client.get(
+            "/articles", params={"collapse_duplicates": "true"}, headers={**headers, "X-API-Version": "2.0"}
+        )
+        anonymous = await client.get("/feeds")
+
+    assert feeds.status_code == 200
+    assert [f["name"] for f in feeds.json()] == ["Python"]
+    assert listed.status_code == 200
+    assert [a["source"] for a in listed.json()["data"]] == ["test", "mirror"]
+    assert collapsed.status_code == 200
+    assert [a["source"] for a in collapsed.json()["data"]] == ["test"]
+    assert anonymous.status_code == 401
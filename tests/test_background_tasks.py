@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from tests.conftest import FakeResponse, FakeSession, add_source, build_rss, reload
+
+
+@pytest.mark.asyncio
+async def test_fetch_fans_out_to_every_subscription(sessions, manager):
+    source = add_source(sessions)
+    manager.feed_fetcher.session = FakeSession([FakeResponse(200, build_rss(30), chunk_size=2048)])
+
+    counts = await manager._process_feed_updates(source)
+
+    source, feeds, articles = reload(sessions, source.id)
+    assert counts["inserted"] == 30
+    assert articles == 30
+    assert all(feed.last_fetched == source.last_fetched for feed in feeds)
+    assert source.last_success_at is not None
+
+
+@pytest.mark.asyncio
+async def test_identical_body_skips_parsing_and_writes(sessions, manager):
+    """A server that ignores conditional GET and resends the same feed costs only the download."""
+    source = add_source(sessions)
+    body = build_rss(5)
+    manager.feed_fetcher.session = FakeSession([FakeResponse(200, body), FakeResponse(200, body), FakeResponse(200, build_rss(6))])
+
+    await manager._process_feed_updates(source)
+    source, _, _ = reload(sessions, source.id)
+    assert source.content_hash is not None
+
+    with patch.object(manager, "_save_entries", wraps=manager._save_entries) as save_entries:
+        counts = await manager._process_feed_updates(source)
+    assert counts["unchanged"] == 1
+    save_entries.assert_not_called()
+    source, _, _ = reload(sessions, source.id)
+    assert source.unchanged_count == 1
+
+    counts = await manager._process_feed_updates(source)
+    assert counts["unchanged"] == 0
+    assert counts["inserted"] == 1
+    assert reload(sessions, source.id)[2] == 6
+
+
+@pytest.mark.asyncio
+async def test_only_new_or_changed_entries_reach_the_database(sessions, manager):
+    source = add_source(sessions)
+    edited = build_rss(3).replace(b"Body 1", b"Body 1, updated")
+    manager.feed_fetcher.session = FakeSession([FakeResponse(200, build_rss(3)), FakeResponse(200, edited + b" ")])
+
+    await manager._process_feed_updates(source)
+    source, _, _ = reload(sessions, source.id)
+    assert len(source.seen_entries) == 3
+    assert source.high_water_mark == datetime(2024, 1, 1, 12, 0)
+
+    with patch.object(manager, "_save_entries", wraps=manager._save_entries) as save_entries:
+        counts = await manager._process_feed_updates(source)
+    assert counts["seen"] == 2
+    assert [entry["url"] for call in save_entries.call_args_list for entry in call.args[1]] == ["http://example.com/1"]
+    assert reload(sessions, source.id)[2] == 3
+
+
+@pytest.mark.asyncio
+async def test_failures_back_off_open_the_circuit_and_recover(sessions, manager):
+    source = add_source(sessions)
+    manager.feed_fetcher.session = FakeSession([FakeResponse(500) for _ in range(3)] + [FakeResponse(200, build_rss(2))])
+    now = datetime.utcnow()
+
+    for expected_wait in (300, 600, 6 * 3600):
+        assert await manager._process_feed_updates(source) == {"errors": 1}
+        source, _, _ = reload(sessions, source.id)
+        assert source.last_error == "HTTP 500"
+        assert abs((source.next_fetch_at - now).total_seconds() - expected_wait) < 60
+    assert source.consecutive_failures == 3
+
+    await manager._process_feed_updates(source)
+    source, feeds, _ = reload(sessions, source.id)
+    assert source.consecutive_failures == 0
+    assert source.last_error is None
+    assert all(feed.is_active for feed in feeds)
+
+
+@pytest.mark.asyncio
+async def test_long_dead_feeds_are_deactivated(sessions, manager):
+    """Once the circuit is open and the feed has not worked for the dead period, subscriptions switch off."""
+    source = add_source(
+        sessions,
+        consecutive_failures=2,
+        last_success_at=datetime.utcnow() - timedelta(days=30)
+    )
+    manager.feed_fetcher.session = FakeSession([FakeResponse(404)])
+
+    counts = await manager._process_feed_updates(source)
+
+    _, feeds, _ = reload(sessions, source.id)
+    assert counts == {"errors": 1, "deactivated": 2}
+    assert not any(feed.is_active for feed in feeds)
+
+
+@pytest.mark.asyncio
+async def test_timeouts_count_as_failures(sessions, manager):
+    source = add_source(sessions)
+    assert manager._fetch_timed_out(source) == {"errors": 1}
+    source, _, _ = reload(sessions, source.id)
+    assert source.consecutive_failures == 1
+    assert source.last_error.startswith("Timed out")
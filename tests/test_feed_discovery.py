@@ -0,0 +1,94 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.core.feed_validator import FeedValidator
+from app.core.host_limiter import HostLimiter
+from tests.conftest import FakeResponse, Site, build_rss
+
+
+def serving(site):
+    return patch.object(FeedValidator, "session", site)
+
+
+def build_validator(max_concurrency=10):
+    validator = FeedValidator()
+    validator.host_limiter = HostLimiter(rate=1000, burst=100, max_concurrency=max_concurrency)
+    return validator
+
+
+@pytest.mark.asyncio
+async def test_first_probe_to_find_a_feed_wins():
+    xml = {"Content-Type": "application/rss+xml"}
+    site = Site(
+        {
+            "http://example.com/feed": lambda: FakeResponse(200, headers=xml),
+            "http://example.com/rss.xml": lambda: FakeResponse(200, headers=xml),
+        },
+        delays={"http://example.com/feed": 5},
+    )
+    with serving(site):
+        feed_url = await asyncio.wait_for(build_validator().discover_feed_url("http://example.com/"), 1)
+
+    assert feed_url == "http://example.com/rss.xml"
+    assert site.cancelled == ["http://example.com/feed"]
+
+
+@pytest.mark.asyncio
+async def test_page_link_beats_a_faster_path_probe():
+    html = b'<html><head><link rel="alternate" type="application/rss+xml" href="/news.rss"></head></html>'
+    site = Site({
+        "http://example.com/": lambda: FakeResponse(200, html, {"Content-Type": "text/html"}, url="http://example.com/"),
+        "http://example.com/feed": lambda: FakeResponse(200, headers={"Content-Type": "application/rss+xml"}),
+    }, delays={"http://example.com/": 0.2})
+    with serving(site):
+        assert await build_validator().discover_feed_url("http://example.com/") == "http://example.com/news.rss"
+    # The page named its feed, so no path was probed
+    assert [url for _, url, _ in site.requests] == ["http://example.com/"]
+
+
+@pytest.mark.asyncio
+async def test_probes_respect_the_host_limits_and_exact_media_types():
+    # XHTML pages are XML but not feeds; every probe answers with one
+    xhtml = {"Content-Type": "application/xhtml+xml; charset=utf-8"}
+    page = b"<html>" + b"<p>filler</p>" * 100 + b'<link rel="alternate" type="application/rss+xml" href="/late.rss"></html>'
+    routes = {f"http://example.com{path}": (lambda: FakeResponse(200, b"<html/>", xhtml)) for path in FeedValidator().common_feed_paths}
+    routes["http://example.com/"] = lambda: FakeResponse(200, page, xhtml, chunk_size=256)
+    site = Site(routes, delays={url: 0.01 for url in routes})
+
+    with serving(site), patch("app.core.feed_validator.settings.FEED_MAX_BYTES", 512):
+        assert await build_validator(max_concurrency=2).discover_feed_url("http://example.com/") is None
+
+    # The link past FEED_MAX_BYTES was never read, and no more than two requests hit the host at once
+    assert site.peak_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_page_links_and_ranged_sniffing():
+    html = b'<html><head><link type="application/atom+xml" rel="alternate" href="blog/atom"></head></html>'
+    site = Site({
+        "http://example.com/blog/": lambda: FakeResponse(200, html, {"Content-Type": "text/html"}, url="http://example.com/blog/"),
+    })
+    with serving(site):
+        assert await build_validator().discover_feed_url("http://example.com/blog/") == "http://example.com/blog/blog/atom"
+
+    # HEAD is refused and the feed is served as text/plain: the first bytes give it away
+    site = Site({
+        ("HEAD", "http://example.com/index.xml"): lambda: FakeResponse(405),
+        ("GET", "http://example.com/index.xml"): lambda: FakeResponse(206, build_rss(50), {"Content-Type": "text/plain"}, chunk_size=256),
+    })
+    with serving(site):
+        assert await build_validator().discover_feed_url("http://example.com/") == "http://example.com/index.xml"
+    ranged = [headers for method, url, headers in site.requests if url == "http://example.com/index.xml" and method == "GET"]
+    assert ranged == [{"Range": "bytes=0-1023"}]
+
+
+@pytest.mark.asyncio
+async def test_bulk_discovery_reports_every_site():
+    # Generic XML is only a feed once its first bytes say so
+    site = Site({"http://a.example.com/feed": lambda: FakeResponse(200, build_rss(1), {"Content-Type": "text/xml"})})
+    with serving(site):
+        found = await build_validator().discover_feed_urls(["http://a.example.com", "http://b.example.com", "http://a.example.com"])
+
+    assert found == {"http://a.example.com": "http://a.example.com/feed", "http://b.example.com": None}
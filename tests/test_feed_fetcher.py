@@ -4,7 +4,9 @@ import aiohttp
 import feedparser
 from datetime import datetime, timezone
 from app.core.feed_fetcher import FeedFetcher
+from app.core.parse_executor import ParseExecutor
 from app.core.cache import CacheManager
+from tests.conftest import FakeResponse, FakeSession, build_rss
 
 # Mock RSS feed data
 MOCK_RSS_FEED = """<?xml version="1.0" encoding="UTF-8"?>
@@ -123,4 +125,134 @@ async def test_extract_media(feed_fetcher):
     assert "content" in media
     assert "thumbnail" in media
     assert media["content"] == entry.media_content
-    assert media["thumbnail"] == entry.media_thumbnail
\ No newline at end of file
+    assert media["thumbnail"] == entry.media_thumbnail
+
+@pytest.fixture
+def thread_parse_executor():
+    with patch("app.core.feed_fetcher.parse_executor", ParseExecutor(mode="thread", max_workers=1)) as executor:
+        yield executor
+        executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_conditional_fetch_sends_validators_and_skips_parse_on_304(thread_parse_executor):
+    """A 304 returns no entries and counts the previous body size as saved."""
+    fetcher = FeedFetcher()
+    body = MOCK_RSS_FEED.encode("utf-8")
+    session = FakeSession([
+        FakeResponse(200, body, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 12:00:00 GMT"}),
+        FakeResponse(304, headers={"ETag": '"v1"'}),
+    ])
+
+    first = await fetcher._fetch_with_session(session, "http://example.com/feed")
+    assert first.status == 200
+    assert len(first.entries) == 1
+    assert first.etag == '"v1"'
+
+    with patch.object(thread_parse_executor, "parse") as mock_parse:
+        second = await fetcher._fetch_with_session(
+            session, "http://example.com/feed", etag=first.etag, last_modified=first.last_modified
+        )
+        mock_parse.assert_not_called()
+
+    assert second.not_modified
+    assert second.entries == []
+    assert session.requests[1]["headers"] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 12:00:00 GMT",
+    }
+
+    stats = fetcher.get_stats()
+    assert stats["requests"] == 2
+    assert stats["not_modified"] == 1
+    assert stats["bytes_saved"] == len(body)
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_entries_before_the_body_is_finished(thread_parse_executor):
+    """Entries come out chunk by chunk and parsing stops at max_entries."""
+    fetcher = FeedFetcher()
+    response = FakeResponse(200, build_rss(1000), chunk_size=512)
+    session = FakeSession([response])
+
+    entries, chunks_read = [], []
+    async with fetcher._stream_with_session(session, "http://example.com/feed") as stream:
+        async for entry in stream.entries(max_entries=5):
+            entries.append(entry)
+            chunks_read.append(response.content.chunks_read)
+
+    assert [entry["guid"] for entry in entries] == [f"urn:{i}" for i in range(5)]
+    assert entries[0]["source"] == "Big"
+    assert entries[0]["published_date"] == datetime(2024, 1, 1, 12, 0)
+    assert chunks_read[-1] < 5
+
+@pytest.mark.asyncio
+async def test_stream_hashes_the_whole_body_past_max_entries(thread_parse_executor):
+    """Stopping at max_entries still hashes the rest, so the next refresh can tell it is unchanged."""
+    fetcher = FeedFetcher()
+    body = build_rss(1000)
+    session = FakeSession([FakeResponse(200, body, chunk_size=512), FakeResponse(200, body, chunk_size=700)])
+
+    async with fetcher._stream_with_session(session, "http://example.com/feed") as first:
+        assert len([entry async for entry in first.entries(max_entries=5)]) == 5
+    assert first.bytes_read == len(body)
+    assert first.content_hash is not None
+
+    async with fetcher._stream_with_session(
+        session, "http://example.com/feed", content_hash=first.content_hash
+    ) as second:
+        assert [entry async for entry in second.entries(max_entries=5)] == []
+    assert second.unchanged
+
+@pytest.mark.asyncio
+async def test_stream_stops_at_byte_cap(thread_parse_executor):
+    fetcher = FeedFetcher()
+    body = build_rss(200)
+    session = FakeSession([FakeResponse(200, body, chunk_size=1024)])
+
+    with patch("app.core.feed_fetcher.settings.FEED_MAX_BYTES", 4096):
+        async with fetcher._stream_with_session(session, "http://example.com/feed") as stream:
+            entries = [entry async for entry in stream.entries()]
+
+    assert stream.truncated
+    assert stream.bytes_read <= 4096
+    assert 0 < len(entries) < 200
+    assert fetcher.get_stats()["truncated"] == 1
+
+    # The hash covers exactly the first FEED_MAX_BYTES, however the body was chunked
+    session = FakeSession([FakeResponse(200, body, chunk_size=1000)])
+    with patch("app.core.feed_fetcher.settings.FEED_MAX_BYTES", 4096):
+        async with fetcher._stream_with_session(
+            session, "http://example.com/feed", content_hash=stream.content_hash
+        ) as again:
+            assert [entry async for entry in again.entries()] == []
+    assert stream.content_hash is not None
+    assert again.unchanged
+
+@pytest.mark.asyncio
+async def test_stream_falls_back_to_feedparser_for_malformed_xml(thread_parse_executor):
+    """Feeds that are not well-formed XML still parse, without repeating streamed entries."""
+    body = build_rss(3).replace(b"<title>Item 2</title>", b"<title>Item&nbsp;2</title>")
+    fetcher = FeedFetcher()
+    session = FakeSession([FakeResponse(200, body, chunk_size=64)])
+
+    result = await fetcher._fetch_with_session(session, "http://example.com/feed")
+    assert [entry["guid"] for entry in result.entries] == ["urn:0", "urn:1", "urn:2"]
+
+HOSTILE_RSS = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>Hostile</title>
+<item><guid>urn:x</guid><link>http://example.com/x</link>
+<title><![CDATA[Hi <img src=x onerror=alert(1)><script>alert(2)</script>]]></title>
+<description><![CDATA[<img src=x onerror=alert(1)><script>alert(2)</script>hi <b>bold</b> &amp; more]]></description>
+</item></channel></rss>"""
+
+@pytest.mark.asyncio
+async def test_streamed_and_feedparser_entries_are_sanitized_alike(thread_parse_executor):
+    """The streaming parser skips feedparser's sanitizer, so _standardize applies it to both paths."""
+    fetcher = FeedFetcher()
+    session = FakeSession([FakeResponse(200, HOSTILE_RSS, chunk_size=64)])
+    async with fetcher._stream_with_session(session, "http://example.com/feed") as stream:
+        streamed = [entry async for entry in stream.entries()]
+    parsed = fetcher.parse_entries(await thread_parse_executor.parse(HOSTILE_RSS))
+
+    assert [(e["title"], e["content"]) for e in streamed] == [(e["title"], e["content"]) for e in parsed]
+    assert streamed[0]["title"] == 'Hi <img src="x" />'
+    assert streamed[0]["content"] == '<img src="x" />hi <b>bold</b> &amp; more'
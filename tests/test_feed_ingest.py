@@ -0,0 +1,132 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.article import Article
+from app.models.feed import Feed
+from app.models.feed_source import FeedSource
+from app.models.user import User
+from app.core.feed_ingest import ArticleIngestor, entry_guid
+from app.core.fingerprint import canonicalize_url, content_fingerprint
+from app.crud.article import article as article_crud
+from app.crud.feed_source import feed_source as feed_source_crud
+
+
+@pytest.fixture
+def sqlite_db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="reader@example.com", hashed_password="x")
+    session.add(user)
+    session.commit()
+    yield session
+    session.close()
+
+
+def make_entry(n, title=None):
+    return {
+        "guid": f"urn:entry:{n}",
+        "title": title or f"Entry {n}",
+        "content": f"Body {n}",
+        "url": f"http://example.com/{n}",
+        "published_date": datetime(2024, 1, n),
+        "author": "Author",
+        "source": "Example",
+    }
+
+
+def test_entry_guid_falls_back_to_link_then_hash():
+    assert entry_guid({"guid": "urn:1", "url": "http://x"}) == "urn:1"
+    assert entry_guid({"guid": "", "url": "http://x"}) == "http://x"
+    assert len(entry_guid({"title": "t"})) == 40
+
+
+def test_upsert_counts_inserted_updated_and_skipped(sqlite_db):
+    """Re-ingesting a feed only rewrites entries whose content changed."""
+    source = FeedSource(url="http://example.com/feed", feed_type="rss")
+    sqlite_db.add(source)
+    sqlite_db.commit()
+    ingestor = ArticleIngestor()
+
+    first = ingestor.upsert(sqlite_db, source, [make_entry(1), make_entry(2)])
+    sqlite_db.commit()
+    assert first == {"inserted": 2, "updated": 0, "skipped": 0, "duplicates": 0}
+
+    second = ingestor.upsert(sqlite_db, source, [make_entry(1, "Edited"), make_entry(2), make_entry(3)])
+    sqlite_db.commit()
+    assert second == {"inserted": 1, "updated": 1, "skipped": 1, "duplicates": 0}
+
+    titles = {a.guid: a.title for a in sqlite_db.query(Article).filter(Article.feed_source_id == source.id)}
+    assert titles == {"urn:entry:1": "Edited", "urn:entry:2": "Entry 2", "urn:entry:3": "Entry 3"}
+
+
+def test_canonicalize_url_drops_tracking_and_cosmetic_differences():
+    assert canonicalize_url("HTTP://www.Example.com:80/news/story/?utm_source=rss&b=2&a=1#top") == \
+        "https://example.com/news/story?a=1&b=2"
+    assert canonicalize_url("https://example.com/news/story?fbclid=abc") == "https://example.com/news/story"
+    assert canonicalize_url("https://example.com:8443/x") == "https://example.com:8443/x"
+
+
+def test_content_fingerprint_ignores_case_punctuation_and_accents():
+    assert content_fingerprint("Café opens in Berlin today!") == content_fingerprint("cafe opens in  berlin today")
+    assert content_fingerprint("Weekly update") is None
+
+
+def test_duplicates_across_feeds_and_sources_are_linked(sqlite_db):
+    """A story seen through a second feed source or an API points at the first copy."""
+    first_source = FeedSource(url="http://one.example.com/feed", feed_type="rss")
+    second_source = FeedSource(url="http://two.example.com/feed", feed_type="rss")
+    sqlite_db.add_all([first_source, second_source])
+    sqlite_db.commit()
+    ingestor = ArticleIngestor()
+
+    story = make_entry(1, "Python 4 released with a brand new parser")
+    ingestor.upsert(sqlite_db, first_source, [story])
+    sqlite_db.commit()
+    original = sqlite_db.query(Article).filter(Article.feed_source_id == first_source.id).one()
+
+    copy = dict(story, guid="other-guid", url="https://www.example.com/1?utm_medium=feed")
+    counts = ingestor.upsert(sqlite_db, second_source, [copy, make_entry(2)])
+    sqlite_db.commit()
+    assert counts["duplicates"] == 1
+
+    # Articles created through the ORM are fingerprinted on insert
+    api_copy = Article(
+        title="Python 4 Released: With a Brand-New Parser", content="", url="https://news.example.org/py4",
+        source="NewsAPI", api_source="newsapi"
+    )
+    sqlite_db.add(api_copy)
+    sqlite_db.commit()
+    assert api_copy.duplicate_of_id == original.id
+
+    collapsed = article_crud.collapse_duplicates(sqlite_db.query(Article)).all()
+    assert sorted(a.id for a in collapsed) == sorted(
+        a.id for a in sqlite_db.query(Article).filter(Article.duplicate_of_id.is_(None))
+    )
+
+    # Collapsing stays within the visible rows: the second feed alone still shows its copy
+    visible = sqlite_db.query(Article).filter(Article.feed_source_id == second_source.id)
+    assert article_crud.collapse_duplicates(visible).count() == 2
+
+
+def test_subscriptions_to_the_same_url_share_one_source(sqlite_db):
+    """Feeds whose URLs differ only cosmetically are fetched through one source."""
+    first = feed_source_crud.get_or_create(sqlite_db, url="HTTP://Example.com:80/feed#top", feed_type="rss")
+    second = feed_source_crud.get_or_create(sqlite_db, url="http://example.com/feed", feed_type="rss")
+    other = feed_source_crud.get_or_create(sqlite_db, url="http://example.com/feed?tag=python", feed_type="rss")
+    sqlite_db.add_all([
+        Feed(name="Mine", url="http://example.com/feed", feed_type="rss", user_id=1, source_id=first.id),
+        Feed(name="Yours", url="HTTP://Example.com:80/feed#top", feed_type="rss", user_id=1, source_id=second.id),
+        Feed(name="Tagged", url="http://example.com/feed?tag=python", feed_type="rss", user_id=1, source_id=other.id,
+             is_active=False),
+    ])
+    sqlite_db.commit()
+
+    assert first.id == second.id
+    assert other.id != first.id
+    due = feed_source_crud.get_due(sqlite_db, now=datetime.utcnow())
+    assert [source.url for source in due] == ["http://example.com/feed"]
+    assert feed_source_crud.count_subscriptions(sqlite_db, source_ids=[first.id, other.id]) == 2
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+from app.core.feed_scheduler import FeedScheduler, estimate_publish_interval
+
+
+def make_scheduler(**kwargs):
+    options = dict(min_interval=300, max_interval=86400, default_interval=900, jitter=0)
+    options.update(kwargs)
+    return FeedScheduler(**options)
+
+
+def test_estimate_publish_interval():
+    """Average gap is reported in hours regardless of input order."""
+    now = datetime(2024, 1, 1, 12, 0)
+    dates = [now - timedelta(hours=4), now, now - timedelta(hours=2), None]
+    assert estimate_publish_interval(dates) == 2.0
+    assert estimate_publish_interval([now]) is None
+
+
+def test_busy_feeds_poll_more_often_than_daily_blogs():
+    """Poll interval follows the publish cadence within the configured bounds."""
+    scheduler = make_scheduler()
+    assert scheduler.poll_interval(0.1) == 300          # news wire: clamped to min
+    assert scheduler.poll_interval(24) == 6 * 3600      # daily blog: four polls a day
+    assert scheduler.poll_interval(None) == 900         # unknown cadence: default
+    assert scheduler.poll_interval(24 * 30) == 86400    # dormant blog: clamped to max
+
+
+def test_unchanged_streak_backs_off():
+    """Each poll without news doubles the wait, up to the max interval."""
+    scheduler = make_scheduler()
+    assert scheduler.poll_interval(None, unchanged_count=1) == 1800
+    assert scheduler.poll_interval(None, unchanged_count=3) == 7200
+    assert scheduler.poll_interval(None, unchanged_count=50) == 57600
+
+
+def test_next_fetch_at_is_jittered_within_bounds():
+    """Jitter spreads due times around the computed interval."""
+    scheduler = make_scheduler(jitter=0.1)
+    now = datetime(2024, 1, 1)
+    due_times = {scheduler.next_fetch_at(None, 0, now) for _ in range(20)}
+    assert len(due_times) > 1
+    for due in due_times:
+        assert timedelta(seconds=810) <= due - now <= timedelta(seconds=990)
+
+
+def test_failing_feeds_back_off_exponentially_until_the_circuit_opens():
+    scheduler = make_scheduler(circuit_threshold=4, circuit_open_interval=6 * 3600)
+    assert [scheduler.retry_interval(n) for n in (1, 2, 3)] == [300, 600, 1200]
+    assert not scheduler.circuit_open(3)
+    assert scheduler.circuit_open(4)
+    assert scheduler.retry_interval(4) == 6 * 3600
+    assert scheduler.retry_interval(40) == 6 * 3600
@@ -0,0 +1,130 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1.endpoints import feed
+from app.core.deps import get_current_user
+from app.core.feed_validator import FeedValidator
+from app.core.host_limiter import HostLimiter
+from app.core.parse_executor import ParseExecutor
+from app.services.feed_validator import FeedValidator as FeedCheck
+from app.db.session import get_db
+from app.models.feed import Feed
+from app.models.user import User
+from tests.conftest import FakeResponse, FakeSession, add_source, build_rss, reload
+
+
+@pytest.fixture
+def validator():
+    executor = ParseExecutor(mode="thread", max_workers=1)
+    with patch("app.core.feed_validator.cache", SimpleNamespace(client=None)), \
+            patch("app.core.feed_validator.parse_executor", executor):
+        validator = FeedValidator()
+        validator.host_limiter = HostLimiter(rate=1000, burst=100, max_concurrency=10)
+        yield validator
+    executor.shutdown()
+
+
+def serving(*responses):
+    return patch.object(FeedValidator, "session", FakeSession(responses))
+
+
+@pytest.mark.asyncio
+async def test_verdicts_are_cached_per_normalized_url(validator):
+    rss = {"Content-Type": "application/rss+xml"}
+    with serving(FakeResponse(200, build_rss(3), rss), FakeResponse(404)):
+        first = await validator.validate_feed("http://example.com/feed")
+        second = await validator.validate_feed("HTTP://Example.com:80/feed#latest")
+        assert first == second
+        assert first[0] and first[1]["stats"]["total_entries"] == 3
+
+        # Invalid feeds are remembered too, so a retry loop does not hammer the site
+        missing = await validator.validate_feed("http://example.com/missing")
+        assert await validator.validate_feed("http://example.com/missing") == missing
+        assert not missing[0]
+        assert len(FeedValidator.session.requests) == 2
+    assert validator.cache.get_stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_validating_fetch_seeds_the_first_articles(validator, sessions, manager):
+    source = add_source(sessions)
+    with serving(FakeResponse(200, build_rss(3), {"Content-Type": "application/rss+xml"})):
+        assert (await validator.validate_feed(source.url))[0]
+
+    entries = validator.cache.take_entries(source.url)
+    assert validator.cache.take_entries(source.url) is None
+    counts = manager.seed_source(source, entries)
+
+    source, feeds, articles = reload(sessions, source.id)
+    assert counts["inserted"] == 3
+    assert articles == 3
+    assert len(source.seen_entries) == 3
+    assert source.next_fetch_at > datetime.utcnow()
+    assert all(feed.last_fetched == source.last_fetched for feed in feeds)
+
+
+@pytest.mark.asyncio
+async def test_adding_a_feed_validates_creates_and_seeds_it(validator, sessions, manager):
+    app = FastAPI()
+    app.include_router(feed.router)
+    app.dependency_overrides[get_db] = sessions.get_db
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="reader@example.com")
+    rss = {"Content-Type": "application/rss+xml"}
+
+    transport = httpx.ASGITransport(app=app)
+    with serving(FakeResponse(200, build_rss(3), rss), FakeResponse(200, build_rss(2), rss)), \
+            patch.object(feed, "feed_validator", validator), \
+            patch.object(feed, "background_task_manager", manager):
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            created = await client.post("/feeds", json={
+                "name": "Example", "url": "http://example.com/feed", "feed_type": "rss", "category": "Tech"
+            })
+            moved = await client.put(f"/feeds/{created.json()['id']}", json={"url": "http://example.com/other"})
+        assert len(FeedValidator.session.requests) == 2
+
+    assert created.status_code == 200, created.text
+    assert created.json()["feed_type"] == "rss"
+    assert moved.status_code == 200, moved.text
+    assert moved.json()["url"] == "http://example.com/other"
+
+
+    # The POST's validating fetch became the new source's first articles, with no second fetch
+    source, _, articles = reload(sessions, 1)
+    assert source.url == "http://example.com/feed"
+    assert articles == 3
+    assert source.last_fetched is not None
+    db = sessions()
+    assert db.query(Feed).one().source_id != source.id
+    db.close()
+
+
+class SharedRedis(dict):
+    """The verdict store every worker reads."""
+
+    def setex(self, key, ttl, value):
+        self[key] = value
+
+
+@pytest.mark.asyncio
+async def test_entry_checks_agree_on_every_worker():
+    """Only the fetching worker holds the entries; the others judge the feed from the shared verdict."""
+    redis = SharedRedis()
+    executor = ParseExecutor(mode="thread", max_workers=1)
+    stale = build_rss(3).replace(b"<title>Big</title>", b"<title>Big</title><link>http://example.com/</link>")
+
+    verdicts = []
+    with patch("app.core.feed_validator.cache", SimpleNamespace(client=redis)), \
+            patch("app.core.feed_validator.parse_executor", executor), \
+            serving(FakeResponse(200, stale, {"Content-Type": "application/rss+xml"})):
+        for worker in (FeedValidator(), FeedValidator()):
+            with patch("app.services.feed_validator.feed_validator", worker):
+                verdicts.append(await FeedCheck().validate_feed("http://example.com/feed"))
+        assert len(FeedValidator.session.requests) == 1
+    executor.shutdown()
+
+    assert verdicts == [(False, "Feed appears to be inactive (no updates in over a year)")] * 2
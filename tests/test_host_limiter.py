@@ -0,0 +1,79 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.feed_fetcher import FeedFetcher
+from app.core.host_limiter import HostLimiter, HostThrottled
+from tests.conftest import FakeResponse, FakeSession
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_requests_per_host():
+    """After the burst, requests to one host are paced at the configured rate; other hosts are not."""
+    limiter = HostLimiter(rate=20, burst=2, max_concurrency=10, max_wait=5)
+    started = time.monotonic()
+
+    async def hit(url):
+        async with limiter.slot(url):
+            return time.monotonic() - started
+
+    times = await asyncio.gather(*(hit("http://busy.example.com/feed") for _ in range(6)), hit("http://quiet.example.com/"))
+
+    assert max(times[:6]) >= (6 - 2) / 20 * 0.9
+    assert times[6] < 0.05
+    stats = {host["host"]: host for host in limiter.get_stats()["hosts"]}
+    assert stats["busy.example.com"]["requests"] == 6
+    assert stats["busy.example.com"]["wait_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_per_host():
+    limiter = HostLimiter(rate=1000, burst=100, max_concurrency=2, max_wait=5)
+
+    async def hold():
+        async with limiter.slot("http://example.com/feed"):
+            await asyncio.sleep(0.02)
+
+    await asyncio.gather(*(hold() for _ in range(8)))
+    assert limiter.get_stats()["hosts"][0]["peak_in_flight"] == 2
+
+
+@pytest.mark.asyncio
+async def test_long_waits_are_deferred_instead_of_blocking():
+    limiter = HostLimiter(rate=1, burst=1, max_concurrency=10, max_wait=0.5)
+    async with limiter.slot("http://example.com/a"):
+        pass
+
+    with pytest.raises(HostThrottled) as excinfo:
+        async with limiter.slot("http://example.com/b"):
+            pass
+    assert excinfo.value.reason == "rate"
+    assert excinfo.value.retry_at > datetime.utcnow()
+
+
+@pytest.mark.asyncio
+async def test_retry_after_blocks_the_host():
+    """A 429 with Retry-After pauses every fetch to that host until it has passed."""
+    fetcher = FeedFetcher()
+    fetcher.host_limiter = HostLimiter(rate=100, burst=10, max_concurrency=4, max_wait=5)
+    session = FakeSession([FakeResponse(429, headers={"Retry-After": "120"})])
+
+    with pytest.raises(HostThrottled) as excinfo:
+        async with fetcher._stream_with_session(session, "http://example.com/feed"):
+            pass
+    retry_at = excinfo.value.retry_at
+    assert timedelta(seconds=110) < retry_at - datetime.utcnow() <= timedelta(seconds=120)
+
+    # The next fetch to the same host is refused without a request
+    with pytest.raises(HostThrottled):
+        async with fetcher._stream_with_session(session, "http://example.com/other-feed"):
+            pass
+    assert len(session.requests) == 1
+
+    host = fetcher.host_limiter.get_stats()["hosts"][0]
+    assert host["throttled_responses"] == 1
+    assert host["deferred"] == 1
+    assert host["blocked_until"] is not None
+    assert fetcher.host_limiter._retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 1.0
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.core.leader import LeaderElector
+from tests.conftest import FakeRedis
+
+
+@pytest.fixture
+def redis():
+    client = FakeRedis()
+    with patch("app.core.leader.cache", SimpleNamespace(client=client)):
+        yield client
+
+
+def test_only_one_worker_leads_and_the_leader_renews(redis):
+    first, second = LeaderElector("refresh", ttl=30), LeaderElector("refresh", ttl=30)
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    assert first.try_acquire()  # renewal keeps the same lease
+    assert not second.try_acquire()
+
+    status = second.status()
+    assert status["backend"] == "redis"
+    assert status["leader"] == first.worker_id
+    assert status["is_leader"] is False
+    assert 0 <= status["lease_age_seconds"] < 5
+    assert 25 < status["lease_expires_in_seconds"] <= 30
+
+
+def test_leadership_fails_over_when_the_lease_expires(redis):
+    """A leader that stops renewing (crashed worker) is replaced once its lease lapses."""
+    first, second = LeaderElector("refresh", ttl=30), LeaderElector("refresh", ttl=30)
+    assert first.try_acquire()
+
+    redis.expire_now("leader:refresh")
+    assert second.try_acquire()
+    assert second.status()["leader"] == second.worker_id
+
+    # The old leader notices on its next renewal and steps down
+    assert not first.try_acquire()
+    assert not first.is_leader
+
+
+def test_release_hands_the_lease_back(redis):
+    first, second = LeaderElector("refresh", ttl=30), LeaderElector("refresh", ttl=30)
+    assert first.try_acquire()
+    first.release()
+    assert second.try_acquire()
@@ -0,0 +1,137 @@
+from datetime import datetime
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from app.core.quota import QuotaPlanner
+from app.sources.base import NewsSourceBase
+from app.sources.newsapi import NewsAPISource
+
+
+@pytest.fixture(autouse=True)
+def local_quota():
+    with patch("app.core.quota.cache", Mock(client=None)):
+        yield
+
+
+class JSONResponse:
+    def __init__(self, payload):
+        self.status = 200
+        self.payload = payload
+
+    async def json(self):
+        return self.payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class NewsAPISession:
+    """Serves /everything pages of 2 articles each, newest first, for 3 pages per query."""
+
+    def __init__(self, total=6):
+        self.total = total
+        self.requests = []
+
+    def get(self, url, headers=None):
+        params = parse_qs(urlsplit(url).query)
+        query, page = params["q"][0], int(params["page"][0])
+        self.requests.append((query, page))
+        articles = [
+            {"title": f"{query} {n}", "url": f"http://news.example.com/{query}/{n}", "publishedAt": "2024-01-01T00:00:00Z"}
+            for n in range((page - 1) * 2, min(page * 2, self.total))
+        ]
+        return JSONResponse({"status": "ok", "totalResults": self.total, "articles": articles})
+
+
+@pytest.fixture
+def newsapi():
+    session = NewsAPISession()
+    source = NewsAPISource("key", queries=["python", "rust"], quota=QuotaPlanner("test", 24, 3))
+    source.page_size = 2
+    with patch("app.sources.base.http_client", Mock(session=session)):
+        yield source, session
+
+
+def test_plan_releases_budget_hourly_and_spreads_it_across_queries():
+    quota = QuotaPlanner("plan", daily_quota=48, max_pages_per_query=5)
+
+    assert quota.plan(["a", "b", "c"], now=datetime(2024, 1, 1, 0, 30)) == {"a": 1, "b": 1, "c": 0}
+    assert quota.plan(["a", "b", "c"], now=datetime(2024, 1, 1, 23, 0)) == {"a": 5, "b": 5, "c": 5}
+
+    now = datetime(2024, 1, 1, 1, 0)
+    for _ in range(3):
+        assert quota.try_spend(now)
+    assert quota.plan(["a", "b"], now=now) == {"a": 1, "b": 0}
+
+
+def test_default_page_url_pages_the_search_endpoint():
+    class SearchSource(NewsSourceBase):
+        async def fetch_articles(self):
+            return []
+
+        async def validate_source(self):
+            return True
+
+    source = SearchSource()
+    source.base_url = "https://api.example.com/search"
+    assert source.page_url("rust & go", 2) == "https://api.example.com/search?q=rust+%26+go&page=2"
+
+
+def test_quota_refuses_requests_once_spent():
+    quota = QuotaPlanner("spent", daily_quota=2, max_pages_per_query=1)
+    assert quota.try_spend() and quota.try_spend()
+    assert not quota.try_spend()
+    assert quota.remaining() == 0
+
+
+@pytest.mark.asyncio
+async def test_pages_until_results_end(newsapi):
+    source, session = newsapi
+
+    articles = await source.fetch_articles("python", max_pages=5)
+
+    assert [article.title for article in articles] == [f"python {n}" for n in range(6)]
+    assert session.requests == [("python", 1), ("python", 2), ("python", 3)]
+
+
+@pytest.mark.asyncio
+async def test_stops_at_the_first_page_with_stored_articles(newsapi):
+    source, session = newsapi
+    stored = {"http://news.example.com/python/3"}
+
+    articles = await source.fetch_articles("python", seen_urls=lambda urls: stored & set(urls), max_pages=5)
+
+    assert [article.title for article in articles] == ["python 0", "python 1", "python 2"]
+    assert session.requests == [("python", 1), ("python", 2)]
+
+
+@pytest.mark.asyncio
+async def test_ingestion_batches_stay_within_the_quota(newsapi):
+    source, session = newsapi
+    source.quota = QuotaPlanner("tight", daily_quota=3, max_pages_per_query=3)
+
+    with patch("app.core.quota.datetime", Mock(utcnow=Mock(return_value=datetime(2024, 1, 1, 23, 0)))):
+        batches = [batch async for batch in source.iter_entries()]
+
+    assert len(session.requests) == 3
+    assert sorted(session.requests) == [("python", 1), ("python", 2), ("rust", 1)]
+    assert sum(len(batch) for batch in batches) == 6
+
+
+@pytest.mark.asyncio
+async def test_ingestion_batches_stop_at_stored_articles(newsapi):
+    source, session = newsapi
+    stored = {"http://news.example.com/python/3", "http://news.example.com/rust/0"}
+
+    with patch("app.core.quota.datetime", Mock(utcnow=Mock(return_value=datetime(2024, 1, 1, 23, 0)))):
+        batches = [batch async for batch in source.iter_entries(seen_urls=lambda urls: stored & set(urls))]
+
+    assert [[entry["title"] for entry in batch] for batch in batches] == [
+        ["python 0", "python 1"], ["python 2"], ["rust 1"]
+    ]
+    assert session.requests == [("python", 1), ("python", 2), ("rust", 1)]
@@ -0,0 +1,120 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.api.v1.endpoints.opml import _import_progress
+from app.core.feed_validator import FeedValidator, feed_validator
+from app.core.host_limiter import HostLimiter
+from app.core.opml import OPMLError, iter_opml, parse_opml
+from app.core.parse_executor import ParseExecutor
+from app.models.article import Article
+from app.models.feed import Feed
+from tests.conftest import FakeResponse, Site, build_rss
+
+OPML = b"""<?xml version="1.0"?>
+<opml version="1.0">
+  <head><title>Exported</title></head>
+  <body>
+    <outline text="Tech">
+      <outline text="Python" type="rss" xmlUrl="http://example.com/python"/>
+      <outline text="Rust" type="rss" xmlUrl="http://example.com/rust"/>
+      <outline text="Python again" type="rss" xmlUrl="HTTP://Example.com/python#top"/>
+    </outline>
+    <outline title="Gone" type="rss" xmlUrl="http://example.com/gone"/>
+  </body>
+</opml>"""
+
+
+def test_parse_flattens_categories_and_drops_repeats():
+    assert parse_opml(OPML) == [
+        {"url": "http://example.com/python", "title": "Python", "html_url": None, "category": "Tech"},
+        {"url": "http://example.com/rust", "title": "Rust", "html_url": None, "category": "Tech"},
+        {"url": "http://example.com/gone", "title": "Gone", "html_url": None, "category": None},
+    ]
+    with pytest.raises(OPMLError):
+        parse_opml(b"<html><body/></html>")
+
+
+def test_export_round_trips():
+    feeds = [
+        SimpleNamespace(name="Loose & free", url="http://example.com/a?x=1&y=2", category=None),
+        SimpleNamespace(name="Python", url="http://example.com/python", category="Tech"),
+        SimpleNamespace(name="Rust", url="http://example.com/rust", category="Tech"),
+    ]
+
+    document = "".join(iter_opml(feeds)).encode("utf-8")
+
+    assert [(o["title"], o["url"], o["category"]) for o in parse_opml(document)] == [
+        (feed.name, feed.url, feed.category) for feed in feeds
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_validates_streams_and_inserts_in_one_write(sessions):
+    rss = {"Content-Type": "application/rss+xml"}
+    site = Site({
+        "http://example.com/python": lambda: FakeResponse(200, build_rss(2), rss),
+        "http://example.com/rust": lambda: FakeResponse(200, build_rss(3), rss),
+    })
+    long_url = "http://example.com/" + "x" * 500
+    outlines = parse_opml(OPML) + [{"url": long_url, "title": "Long", "html_url": None, "category": None}]
+    executor = ParseExecutor(mode="thread", max_workers=2)
+
+    def get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    with patch.object(FeedValidator, "session", site), \
+            patch("app.core.feed_validator.cache", SimpleNamespace(client=None)), \
+            patch("app.core.feed_validator.parse_executor", executor), \
+            patch("app.api.v1.endpoints.opml.get_db", get_db):
+        lines = [json.loads(line) async for line in _import_progress(1, len(outlines), outlines)]
+    executor.shutdown()
+
+    assert lines[0] == {"total": 4, "already_subscribed": 0}
+    assert sorted((line["url"], line["valid"]) for line in lines[1:-1]) == [
+        ("http://example.com/gone", False), ("http://example.com/python", True),
+        ("http://example.com/rust", True), (long_url, False),
+    ]
+    assert lines[1] == {"url": long_url, "valid": False, "error": "URL is longer than 512 characters"}
+    assert long_url not in {url for _, url, _ in site.requests}
+    assert lines[-1] == {"done": True, "imported": 2, "invalid": 2}
+
+    db = sessions()
+    feeds = db.query(Feed).order_by(Feed.url).all()
+    assert [(feed.name, feed.category) for feed in feeds] == [("Python", "Tech"), ("Rust", "Tech")]
+    assert all(feed.source_id and feed.last_fetched for feed in feeds)
+    # The validating fetches seeded the first articles
+    assert db.query(Article).count() == 5
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_import_validation_respects_host_limits_and_the_byte_cap(sessions, monkeypatch):
+    rss = {"Content-Type": "application/rss+xml"}
+    urls = [f"http://blog.example.com/{name}/feed" for name in "abcdef"]
+    routes = {url: (lambda: FakeResponse(200, build_rss(2), rss)) for url in urls}
+    routes["http://blog.example.com/huge/feed"] = lambda: FakeResponse(200, build_rss(100), rss)
+    site = Site(routes, delays={url: 0.05 for url in routes})
+    outlines = [{"url": url, "title": None, "html_url": None, "category": None} for url in routes]
+    executor = ParseExecutor(mode="thread", max_workers=2)
+    monkeypatch.setattr(feed_validator, "host_limiter", HostLimiter(rate=1000, burst=100, max_concurrency=2))
+
+    with patch.object(FeedValidator, "session", site), \
+            patch("app.core.feed_validator.cache", SimpleNamespace(client=None)), \
+            patch("app.core.feed_validator.parse_executor", executor), \
+            patch("app.core.feed_validator.settings.FEED_MAX_BYTES", 4096), \
+            patch("app.api.v1.endpoints.opml.get_db", sessions.get_db):
+        lines = [json.loads(line) async for line in _import_progress(1, len(outlines), outlines)]
+    executor.shutdown()
+
+    # FEED_IMPORT_CONCURRENCY would allow ten at once; the host allows two
+    assert site.peak_in_flight == 2
+    results = {line["url"]: line for line in lines[1:-1]}
+    assert results["http://blog.example.com/huge/feed"]["error"] == "Feed too large"
+    assert lines[-1] == {"done": True, "imported": 6, "invalid": 1}
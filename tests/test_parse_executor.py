@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from app.core.parse_executor import ParseExecutor, feed_headers, parse_feed
+
+ATOM_FEED = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+    <title>Atom Feed</title>
+    <link href="http://example.com/"/>
+    <link rel="hub" href="https://hub.example.com/"/>
+    <updated>2024-01-02T12:00:00Z</updated>
+    <entry>
+        <id>urn:uuid:1</id>
+        <title>First</title>
+        <link href="http://example.com/1"/>
+        <updated>2024-01-02T12:00:00Z</updated>
+        <summary>Summary one</summary>
+    </entry>
+</feed>
+"""
+
+
+def test_parse_feed_returns_compact_dicts():
+    """Parsed output is plain data with only the fields the app reads."""
+    parsed = parse_feed(ATOM_FEED)
+
+    assert parsed["bozo"] is False
+    assert parsed["version"].startswith("atom")
+    assert parsed["feed"]["title"] == "Atom Feed"
+    assert "https://hub.example.com/" in [link["href"] for link in parsed["feed"]["links"] if link["rel"] == "hub"]
+
+    entry = parsed["entries"][0]
+    assert entry["id"] == "urn:uuid:1"
+    assert entry["link"] == "http://example.com/1"
+    assert entry["summary"] == "Summary one"
+    assert entry["updated_parsed"][:3] == [2024, 1, 2]
+    assert "media_content" not in entry
+
+
+@pytest.mark.asyncio
+async def test_process_pool_parse_matches_inline():
+    """The process pool returns the same result as an inline parse."""
+    executor = ParseExecutor(mode="process", max_workers=1, timeout=60)
+    try:
+        assert await executor.parse(ATOM_FEED) == parse_feed(ATOM_FEED)
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_parse_timeout():
+    """A parse that overruns the per-parse timeout raises TimeoutError."""
+    executor = ParseExecutor(mode="thread", max_workers=1, timeout=0.000001)
+    huge = ATOM_FEED.replace("</feed>", "<entry><title>x</title></entry>" * 20000 + "</feed>")
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.parse(huge)
+    finally:
+        executor.shutdown()
+
+
+def test_raw_bytes_keep_the_encoding_declared_in_the_document():
+    """Bytes plus Content-Type let feedparser honour the XML declaration that text decoding ignored."""
+    body = ATOM_FEED.replace('encoding="utf-8"', 'encoding="iso-8859-1"').replace("First", "Café").encode("iso-8859-1")
+
+    class Response:
+        headers = {"Content-Type": "application/atom+xml"}
+        url = "http://example.com/feed"
+
+    headers = feed_headers(Response())
+    assert headers == {"content-type": "application/atom+xml", "content-location": "http://example.com/feed"}
+    assert parse_feed(body, headers)["entries"][0]["title"] == "Café"
@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+from app.core.refresh_engine import RefreshEngine
+
+
+@pytest.mark.asyncio
+async def test_run_cycle_bounds_concurrency():
+    """No more than the configured number of handlers run at once."""
+    engine = RefreshEngine(workers=3, fetch_timeout=5)
+    in_flight = 0
+    peak = 0
+
+    async def handler(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    stats = await engine.run_cycle(range(12), handler)
+
+    assert peak == 3
+    assert stats["feeds"] == 12
+    assert stats["succeeded"] == 12
+    assert stats["workers"] == 3
+
+
+@pytest.mark.asyncio
+async def test_slow_feed_does_not_hold_back_the_rest():
+    """A feed that exceeds the timeout is counted and the others still finish."""
+    engine = RefreshEngine(workers=2, fetch_timeout=0.05)
+    done = []
+
+    async def handler(item):
+        if item == "slow":
+            await asyncio.sleep(10)
+        done.append(item)
+
+    stats = await engine.run_cycle(["slow", "a", "b", "c"], handler)
+
+    assert sorted(done) == ["a", "b", "c"]
+    assert stats["timed_out"] == 1
+    assert stats["succeeded"] == 3
+    assert stats["p95_latency_ms"] >= stats["p50_latency_ms"]
+
+
+@pytest.mark.asyncio
+async def test_handler_counters_are_summed():
+    """Counter dicts returned by the handler are aggregated into the stats."""
+    engine = RefreshEngine(workers=2, fetch_timeout=5)
+
+    async def handler(item):
+        if item == "boom":
+            raise RuntimeError("boom")
+        return {"not_modified": 1}
+
+    stats = await engine.run_cycle(["a", "b", "boom"], handler)
+
+    assert stats["not_modified"] == 2
+    assert stats["failed"] == 1
@@ -0,0 +1,212 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from app.core.single_flight import SingleFlight
+from app.core.refresh_engine import RefreshEngine
+from app.crud.refresh_job import refresh_job as refresh_job_crud
+from app.models.refresh_job import PRIORITY_USER, RefreshJob
+from tests.conftest import FakeRedis, FakeResponse, FakeSession, Site, add_source, build_rss, reload
+
+
+class FakeResultRedis(FakeRedis):
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+        self.expires[key] = time.time() + ttl
+
+    def exists(self, key):
+        return int(self._alive(key))
+
+
+@pytest.fixture(autouse=True)
+def local_single_flight():
+    with patch("app.core.single_flight.cache", SimpleNamespace(client=None)):
+        yield
+
+
+def test_due_sources_are_queued_once(sessions):
+    source = add_source(sessions)
+    add_source(sessions, url="http://example.com/later", next_fetch_at=datetime.utcnow() + timedelta(hours=1))
+    db = sessions()
+
+    assert refresh_job_crud.enqueue_due(db, now=datetime.utcnow()) == 1
+    assert refresh_job_crud.enqueue_due(db, now=datetime.utcnow()) == 0
+    assert [job.feed_source_id for job in db.query(RefreshJob)] == [source.id]
+    db.close()
+
+
+def test_enqueue_due_skips_jobs_queued_concurrently(sessions):
+    """enqueue_source may commit between the NOT EXISTS check and the insert; the tick must not abort."""
+    add_source(sessions)
+    db = sessions()
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        assert refresh_job_crud.enqueue_due(db, now=datetime.utcnow()) == 1
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    db.close()
+
+    inserts = [statement for statement in statements if statement.startswith("INSERT INTO refresh_jobs")]
+    assert len(inserts) == 1
+    assert "ON CONFLICT (feed_source_id) DO NOTHING" in inserts[0]
+
+
+def test_claims_are_exclusive_until_the_visibility_timeout(sessions):
+    for i in range(3):
+        add_source(sessions, url=f"http://example.com/{i}")
+    db = sessions()
+    now = datetime.utcnow()
+    refresh_job_crud.enqueue_due(db, now=now)
+
+    first = refresh_job_crud.claim(db, worker_id="a", limit=2, now=now, visibility_timeout=60)
+    second = refresh_job_crud.claim(db, worker_id="b", limit=2, now=now, visibility_timeout=60)
+    assert len(first) == 2 and len(second) == 1
+    assert not {job.id for job in first} & {job.id for job in second}
+    assert all(job.feed_source.url for job in first)
+
+    # Worker "a" died: its jobs come back once the claim lapses, with the attempt counted
+    later = now + timedelta(seconds=61)
+    reclaimed = refresh_job_crud.claim(db, worker_id="c", limit=5, now=later, visibility_timeout=60)
+    assert sorted(job.id for job in reclaimed) == sorted(job.id for job in first + second)
+    assert all(job.attempts == 2 for job in reclaimed)
+    assert not refresh_job_crud.complete(db, job_id=first[0].id, worker_id="a")
+    assert refresh_job_crud.complete(db, job_id=first[0].id, worker_id="c")
+    db.close()
+
+
+def test_failed_jobs_back_off_then_give_up(sessions):
+    add_source(sessions)
+    db = sessions()
+    now = datetime.utcnow()
+    refresh_job_crud.enqueue_due(db, now=now)
+
+    for attempt, delay in ((1, 60), (2, 120)):
+        job, = refresh_job_crud.claim(db, worker_id="a", limit=1, now=now, visibility_timeout=60)
+        assert job.attempts == attempt
+        assert refresh_job_crud.retry(db, job_id=job.id, worker_id="a", error="boom", now=now, delay=60, max_attempts=3)
+        job = db.get(RefreshJob, job.id)
+        assert job.run_at == now + timedelta(seconds=delay)
+        assert job.locked_by is None
+        now = job.run_at
+
+    job, = refresh_job_crud.claim(db, worker_id="a", limit=1, now=now, visibility_timeout=60)
+    assert refresh_job_crud.retry(db, job_id=job.id, worker_id="a", error="boom", now=now, delay=60, max_attempts=3) is False
+    assert db.query(RefreshJob).count() == 0
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_workers_drain_the_queue(sessions, manager):
+    source = add_source(sessions)
+    manager.feed_fetcher.session = FakeSession([FakeResponse(200, build_rss(3))])
+    db = sessions()
+    refresh_job_crud.enqueue_due(db, now=datetime.utcnow())
+    db.close()
+
+    stats = await manager.process_due_jobs()
+
+    assert stats["succeeded"] == 1
+    assert stats["inserted"] == 3
+    assert stats["subscriptions"] == 2
+    source, _, articles = reload(sessions, source.id)
+    assert articles == 3
+    assert source.next_fetch_at > datetime.utcnow()
+    assert manager.get_queue_stats()["queued"] == 0
+    assert await manager.process_due_jobs() is None
+
+
+@pytest.mark.asyncio
+async def test_free_workers_claim_the_next_job_without_waiting_for_a_slow_one(sessions, manager, monkeypatch):
+    slow = add_source(sessions, url="http://slow.example.com/feed")
+    fast = [add_source(sessions, url=f"http://fast.example.com/{i}") for i in range(4)]
+    routes = {source.url: (lambda: FakeResponse(200, build_rss(1))) for source in [slow, *fast]}
+    manager.feed_fetcher.session = Site(routes, delays={slow.url: 0.5})
+    manager.refresh_engine = RefreshEngine(workers=2, fetch_timeout=5)
+    db = sessions()
+    refresh_job_crud.enqueue_due(db, now=datetime.utcnow())
+    db.close()
+
+    finished = []
+    finish_job = manager._finish_job
+    monkeypatch.setattr(manager, "_finish_job", lambda job: (finished.append(job.feed_source.url), finish_job(job)))
+    stats = await manager.process_due_jobs()
+
+    assert stats["succeeded"] == 5
+    # The second worker ran all four fast feeds while the first was still on the slow one
+    assert finished[-1] == slow.url
+    assert manager.get_queue_stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_crashing_fetch_is_released_for_retry(sessions, manager):
+    add_source(sessions)
+    db = sessions()
+    refresh_job_crud.enqueue_due(db, now=datetime.utcnow())
+    db.close()
+
+    with patch.object(manager, "_process_feed_updates", side_effect=RuntimeError("boom")):
+        stats = await manager.process_due_jobs()
+
+    assert stats["failed"] == 1
+    queue = manager.get_queue_stats()
+    assert queue["queued"] == 1 and queue["retrying"] == 1 and queue["in_flight"] == 0
+    db = sessions()
+    assert db.query(RefreshJob).one().last_error == "boom"
+    db.close()
+
+
+def test_user_refreshes_jump_the_queue(sessions):
+    sources = [add_source(sessions, url=f"http://example.com/{i}") for i in range(3)]
+    db = sessions()
+    now = datetime.utcnow()
+    refresh_job_crud.enqueue_due(db, now=now - timedelta(minutes=1))
+
+    refresh_job_crud.enqueue_source(db, source_id=sources[2].id, now=now, priority=PRIORITY_USER)
+
+    job, = refresh_job_crud.claim(db, worker_id="a", limit=1, now=now, visibility_timeout=60)
+    assert job.feed_source_id == sources[2].id
+    assert job.priority == PRIORITY_USER
+    assert db.query(RefreshJob).count() == 3
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_fetch(sessions, manager):
+    source = add_source(sessions)
+    manager.feed_fetcher.session = FakeSession([FakeResponse(200, build_rss(3))])
+
+    first, second = await asyncio.gather(manager.refresh_now(source.id), manager.refresh_now(source.id))
+
+    assert first == second
+    assert first["inserted"] == 3
+    assert len(manager.feed_fetcher.session.requests) == 1
+    assert manager.refresh_flight.get_stats()["runs"] == 1
+    assert manager.get_queue_stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_workers_share_a_fetch_through_redis():
+    """Two workers (two SingleFlights) asking for the same key run it once."""
+    redis = FakeResultRedis()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return {"inserted": 3}
+
+    with patch("app.core.single_flight.cache", SimpleNamespace(client=redis)):
+        first = SingleFlight("refresh", lock_ttl=5, poll_interval=0.01)
+        second = SingleFlight("refresh", lock_ttl=5, poll_interval=0.01)
+        results = await asyncio.gather(first.run(1, fetch), second.run(1, fetch))
+
+    assert results == [{"inserted": 3}, {"inserted": 3}]
+    assert len(calls) == 1
+    assert second.get_stats()["shared_remote"] == 1
@@ -0,0 +1,81 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.core.host_limiter import HostLimiter
+from app.core.parse_executor import ParseExecutor
+from app.sources.rss import RSSFeedSource
+from tests.conftest import FakeResponse, build_rss
+
+
+class SlowSession:
+    """Answers each URL after a delay, tracking how many requests overlap."""
+
+    def __init__(self, bodies, delay=0.05):
+        self.bodies = bodies
+        self.delay = delay
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def get(self, url, headers=None):
+        session = self
+
+        class Request:
+            async def __aenter__(self):
+                session.in_flight += 1
+                session.peak_in_flight = max(session.peak_in_flight, session.in_flight)
+                await asyncio.sleep(session.delay)
+                session.in_flight -= 1
+                body = session.bodies.get(url)
+                if body is None:
+                    return FakeResponse(500)
+                return FakeResponse(200, body, headers={"Content-Type": "application/rss+xml"})
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Request()
+
+
+@pytest.fixture
+def thread_parse_executor():
+    with patch("app.sources.rss.parse_executor", ParseExecutor(mode="thread", max_workers=2)) as executor:
+        yield executor
+        executor.shutdown()
+
+
+@pytest.fixture
+def rss_source(thread_parse_executor):
+    source = RSSFeedSource()
+    source.host_limiter = HostLimiter(rate=1000, burst=100, max_concurrency=10)
+    return source
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_fetches_every_feed_concurrently(rss_source):
+    urls = [info["url"] for info in rss_source.tech_feeds.values()] + list(rss_source.video_feeds["youtube"].values())
+    rss_source.session = SlowSession({url: build_rss(2) for url in urls})
+
+    articles = await rss_source.fetch_all()
+
+    assert len(articles) == 2 * len(urls)
+    assert rss_source.session.peak_in_flight == len(urls)
+    stats = rss_source.get_stats()
+    assert len(stats["feeds"]) == len(urls)
+    assert stats["errors"] == 0
+    assert all(feed["entries"] == 2 and feed["fetch_ms"] > 0 for feed in stats["feeds"])
+
+
+@pytest.mark.asyncio
+async def test_failing_feed_is_reported_without_losing_the_others(rss_source):
+    broken = rss_source.tech_feeds["django"]["url"]
+    urls = [info["url"] for info in rss_source.tech_feeds.values() if info["url"] != broken]
+    rss_source.session = SlowSession({url: build_rss(1) for url in urls}, delay=0)
+
+    articles = await rss_source.fetch_all()
+
+    assert len(articles) == len(urls)
+    assert rss_source.timings["django"]["error"] == "HTTP 500"
+    assert rss_source.timings["youtube_ai"]["error"] == "HTTP 500"
+    assert rss_source.get_stats()["errors"] == 1 + len(rss_source.video_feeds["youtube"])
@@ -0,0 +1,68 @@
+import sys
+from datetime import datetime
+
+import pytest
+
+from app.models.article import Article
+from app.sources.base import NewsSourceBase
+from app.sources.registry import SourceRegistry
+
+
+class FakeSource(NewsSourceBase):
+    """Two pages of API results, newest first."""
+
+    def __init__(self):
+        super().__init__()
+        self.source_name = "fake"
+        self.queries = ["all"]
+
+    async def fetch_articles(self):
+        return []
+
+    async def validate_source(self):
+        return True
+
+    async def iter_pages(self, query, max_pages):
+        for page in range(2):
+            yield [
+                Article(
+                    title=f"Story {n}", content="", url=f"http://news.example.com/{n}", source="Fake",
+                    api_source="fake", category="tech", published_date=datetime(2024, 1, 1), extra_data={"n": n}
+                )
+                for n in range(page * 3, page * 3 + 3)
+            ]
+
+
+def test_plugins_are_imported_only_when_loaded():
+    sys.modules.pop("app.sources.reuters", None)
+    registry = SourceRegistry(enabled=["reuters"])
+    assert "app.sources.reuters" not in sys.modules
+
+    assert registry.load("reuters").__name__ == "ReutersSource"
+    assert "app.sources.reuters" in sys.modules
+    assert registry.get_stats()["loaded"] == ["reuters"]
+
+
+def test_broken_or_unknown_plugins_are_skipped():
+    registry = SourceRegistry(plugins={"broken": "app.sources.missing:Source"}, enabled=["broken", "unknown"])
+    assert registry.create("broken") is None
+    assert registry.create("unknown") is None
+
+
+@pytest.mark.asyncio
+async def test_plugin_entries_go_through_batched_ingestion(sessions, manager):
+    manager.sources = SourceRegistry(plugins={"fake": "tests.test_source_registry:FakeSource"}, enabled=["fake"])
+
+    first = await manager.ingest_sources()
+    assert first == {"fake": {"inserted": 6, "updated": 0, "skipped": 0, "duplicates": 0}}
+
+    # Already stored stories stop the second run at its first page
+    assert await manager.ingest_sources() == {"fake": {}}
+
+    db = sessions()
+    articles = db.query(Article).order_by(Article.id).all()
+    assert len(articles) == 6
+    assert {article.api_source for article in articles} == {"fake"}
+    assert articles[0].extra_data == {"n": 0}
+    assert articles[0].feed_source.url == "source://fake/"
+    db.close()
@@ -0,0 +1,176 @@
+import hashlib
+import hmac
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from urllib.parse import urlsplit
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import websub
+from app.db.session import get_db
+from app.core.websub import WebSubManager
+from app.models.websub_subscription import WebSubSubscription
+from tests.conftest import FakeResponse, FakeSession, add_source, reload
+
+HUB = "http://hub.example.com/"
+TOPIC = "http://example.com/feed.xml"
+
+
+def build_hub_rss(start, count):
+    items = "".join(
+        f"<item><guid>urn:{i}</guid><title>Item {i}</title><link>http://example.com/{i}</link>"
+        f"<description>Body {i}</description><pubDate>Mon, 01 Jan 2024 12:00:00 GMT</pubDate></item>"
+        for i in range(start, start + count)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+        f'<title>Pushed</title><atom:link rel="hub" href="{HUB}"/><atom:link rel="self" href="{TOPIC}"/>'
+        f"{items}</channel></rss>"
+    ).encode()
+
+
+class StandInHub:
+    """Accepts subscription requests the way a WebSub hub does, and remembers them."""
+
+    def __init__(self):
+        self.requests = []
+
+    def post(self, url, data=None):
+        self.requests.append({"url": url, **data})
+        return FakeResponse(202)
+
+
+@pytest.fixture
+def hub():
+    return StandInHub()
+
+
+@pytest.fixture
+def manager(manager, hub):
+    manager.websub = WebSubManager(callback_base_url="http://reader.example.com")
+    manager.websub.session = hub
+    return manager
+
+
+@pytest.fixture
+def client(sessions, manager):
+    app = FastAPI()
+    app.include_router(websub.router, prefix="/api/v1/websub")
+    app.dependency_overrides[get_db] = sessions.get_db
+    with patch.object(websub, "background_task_manager", manager), \
+            patch.object(websub, "websub_manager", manager.websub):
+        yield TestClient(app)
+
+
+def sign(secret, body):
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+async def request_subscription(sessions, manager, hub):
+    """Poll once so the hub link is discovered and a subscription is requested."""
+    source = add_source(sessions)
+    manager.feed_fetcher.session = FakeSession([FakeResponse(200, build_hub_rss(0, 2))])
+    counts = await manager._process_feed_updates(source)
+    assert counts["inserted"] == 2
+    assert counts["websub_requested"] == 1
+    return source, hub.requests[0]
+
+
+async def subscribe_by_polling(sessions, manager, hub, client):
+    """Request a subscription, then play the hub's verification of intent."""
+    source, request = await request_subscription(sessions, manager, hub)
+    callback = urlsplit(request["hub.callback"]).path
+    response = client.get(callback, params={
+        "hub.mode": "subscribe", "hub.topic": request["hub.topic"],
+        "hub.challenge": "abc123", "hub.lease_seconds": "3600"
+    })
+    assert response.status_code == 200
+    assert response.text == "abc123"
+    return source, request, callback
+
+
+@pytest.mark.asyncio
+async def test_verified_subscription_moves_polling_to_a_daily_safety_net(sessions, manager, hub, client):
+    source, request, _ = await subscribe_by_polling(sessions, manager, hub, client)
+
+    assert request["url"] == HUB
+    assert request["hub.topic"] == TOPIC
+    assert request["hub.mode"] == "subscribe"
+
+    source, _, _ = reload(sessions, source.id)
+    db = sessions()
+    subscription = db.query(WebSubSubscription).one()
+    assert subscription.state == "active"
+    assert subscription.expires_at > datetime.utcnow() + timedelta(minutes=59)
+    assert source.next_fetch_at > datetime.utcnow() + timedelta(hours=23)
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_verification_for_another_topic_is_refused(sessions, manager, hub, client):
+    await subscribe_by_polling(sessions, manager, hub, client)
+    callback = urlsplit(hub.requests[0]["hub.callback"]).path
+
+    response = client.get(callback, params={
+        "hub.mode": "subscribe", "hub.topic": "http://evil.example.com/feed", "hub.challenge": "x"
+    })
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_verification_needs_the_callback_token(sessions, manager, hub, client):
+    source, request = await request_subscription(sessions, manager, hub)
+    db = sessions()
+    subscription = db.query(WebSubSubscription).one()
+    db.close()
+    assert urlsplit(request["hub.callback"]).path == f"/api/v1/websub/callback/{subscription.callback_token}"
+
+    params = {"hub.mode": "subscribe", "hub.topic": TOPIC, "hub.challenge": "x"}
+    for guess in (str(subscription.id), subscription.callback_token[:-1] + "A"):
+        assert client.get(f"/api/v1/websub/callback/{guess}", params=params).status_code == 404
+
+    db = sessions()
+    assert db.query(WebSubSubscription).one().state == "pending"
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_verification_we_did_not_ask_for_is_refused(sessions, manager, hub, client):
+    source, _, callback = await subscribe_by_polling(sessions, manager, hub, client)
+    next_fetch_at = reload(sessions, source.id)[0].next_fetch_at
+
+    # Replaying a confirmation for an already answered request must not push polling out again
+    with patch("app.core.websub.settings.WEBSUB_FALLBACK_POLL_INTERVAL", 30 * 86400):
+        replay = client.get(callback, params={"hub.mode": "subscribe", "hub.topic": TOPIC, "hub.challenge": "x"})
+    unsubscribe = client.get(callback, params={"hub.mode": "unsubscribe", "hub.topic": TOPIC, "hub.challenge": "x"})
+
+    assert replay.status_code == 404
+    assert unsubscribe.status_code == 404
+    assert reload(sessions, source.id)[0].next_fetch_at == next_fetch_at
+    db = sessions()
+    assert db.query(WebSubSubscription).one().state == "active"
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_signed_push_is_ingested_and_forged_push_is_ignored(sessions, manager, hub, client):
+    source, request, callback = await subscribe_by_polling(sessions, manager, hub, client)
+
+    body = build_hub_rss(2, 3)
+    response = client.post(callback, content=body, headers={"X-Hub-Signature": sign(request["hub.secret"], body)})
+    assert response.status_code == 202
+    assert response.json()["inserted"] == 3
+    assert reload(sessions, source.id)[2] == 5
+
+    forged = build_hub_rss(10, 1)
+    response = client.post(callback, content=forged, headers={"X-Hub-Signature": sign("guess", forged)})
+    assert response.status_code == 202
+    assert response.json() == {"status": "ignored"}
+    assert reload(sessions, source.id)[2] == 5
+
+
+def test_push_to_unknown_subscription_is_gone(client):
+    response = client.post("/api/v1/websub/callback/99", content=b"<rss/>")
+    assert response.status_code == 410